@@ -15,17 +15,73 @@ class Settings(BaseSettings):
     IPFS_PORT: int = 5001
     PINATA_API_KEY: Optional[str] = None
     PINATA_SECRET_KEY: Optional[str] = None
+    IPFS_PIN_MEDIA: bool = True  # 업로드한 미디어를 백그라운드 작업으로 IPFS에 고정
+    IPFS_PIN_MAX_ATTEMPTS: int = 8  # 핀 작업 최대 시도 횟수 (게이트웨이 장애 대비)
+    
+    # IPFS Pin Reconciliation
+    PIN_RECONCILE_INTERVAL: int = 0  # 주기 실행 간격 (초, 0이면 스크립트로만 실행)
+    PIN_RECONCILE_BATCH_SIZE: int = 500  # 한 번에 검사할 행 수
+    PIN_CONCURRENCY: int = 4  # 동시 재고정 요청 수
+    PIN_UNPIN_ORPHANS: bool = False  # DB에서 참조하지 않는 핀 해제 여부
+    PIN_ORPHAN_GRACE_SECONDS: int = 86400  # 고아 핀을 해제하기 전 유예 시간 (초)
+    
+    # 서버 시작
+    STARTUP_TIMEOUT: float = 10.0  # 시작 시 DB/IPFS/Web3 초기화를 기다리는 최대 시간 (초, 늦은 연결은 백그라운드에서 계속)
+    READY_CHECK_TIMEOUT: float = 2.0  # GET /ready에서 준비되지 않은 DB를 다시 확인할 때 기다리는 최대 시간 (초)
     
     # Web3
     WEB3_PROVIDER_URL: str = "http://localhost:8545"
     NFT_CONTRACT_ADDRESS: Optional[str] = None
+    TOKEN_INDEX_CACHE_SIZE: int = 10000  # 토큰 → 레시피 조회를 기억할 최대 토큰 수 (LRU)
+    NFT_CONTRACT_VARIANT: str = "standard"  # 배포한 컨트랙트 (standard: RecipeNFT, compact: RecipeNFTCompact)
     PRIVATE_KEY: Optional[str] = None
+    CHAIN_BLOCK_TIME: float = 12.0  # 블록 간격 (초), 민팅 계정 상태/수수료를 이 시간 동안 재사용
+    CHAIN_ID: Optional[int] = None  # 체인 ID (없으면 노드에서 한 번 조회, 바우처 서명에는 필수)
+    MINTER_PRIVATE_KEYS: str = ""  # 민팅 서명자 풀 키 (쉼표 구분, 비어 있으면 PRIVATE_KEY 하나, 컨트랙트에 setMinter로 등록)
+    SIGNER_MIN_BALANCE_ETH: float = 0.05  # 서명자 잔액이 이보다 낮으면 충전 경고
+    VOUCHER_SIGNER_KEY: Optional[str] = None  # 지연 민팅 바우처 서명 키 (없으면 PRIVATE_KEY, 컨트랙트의 voucherSigner와 같아야 함)
+    VOUCHER_TTL_SECONDS: int = 86400  # 바우처 유효 기간 (초, 지나면 redeem 불가, 복구 작업이 redeem 여부를 확인하고 레시피 점유 해제)
+    
+    # Gas / Fees
+    GAS_FEE_HISTORY_BLOCKS: int = 10  # eth_feeHistory로 샘플링할 최근 블록 수
+    GAS_PRIORITY_FEE_PERCENTILE: float = 50  # 블록별 우선 수수료 백분위수
+    GAS_MIN_PRIORITY_FEE_GWEI: float = 0.1
+    GAS_BASE_FEE_MULTIPLIER: float = 2.0  # maxFeePerGas = 다음 블록 기본 수수료 x 배수 + 우선 수수료
+    GAS_MAX_FEE_GWEI: Optional[float] = None  # 수수료 상한 (없으면 제한 없음)
+    GAS_LIMIT_MULTIPLIER: float = 1.2  # 가스 추정치 대비 가스 한도 여유
+    GAS_ESTIMATE_TTL: int = 3600  # 함수별 가스 추정치 재사용 시간 (초)
+    TX_RECEIPT_TIMEOUT: int = 120  # 영수증 대기 최대 시간 (초)
+    TX_RECEIPT_POLL_INTERVAL: float = 0.5  # 영수증 감시기의 새 블록 확인 주기 (초)
+    RECEIPT_CONFIRMATIONS: int = 1  # 민팅 완료로 볼 확인 블록 수 (1이면 포함 즉시)
+    RECEIPT_MAX_BLOCKS_PER_POLL: int = 32  # 한 번에 훑을 최대 블록 수 (넘으면 대기 중 트랜잭션을 직접 조회)
+    TX_REPLACE_AFTER: int = 30  # 이 시간 안에 포함되지 않으면 수수료를 올려 교체 (초, 0이면 교체 안 함)
+    TX_REPLACE_BUMP_PERCENT: int = 15  # 교체 시 수수료 인상률 (노드 최소 요구치 10%)
+    TX_MAX_REPLACEMENTS: int = 3
+    MINT_RECOVERY_INTERVAL: int = 60  # 끝나지 않은 민팅 시도 검사 주기 (초, 0이면 시작 시 한 번만)
+    MINT_RECOVERY_GRACE: int = 300  # 이 시간 동안 갱신되지 않은 시도만 복구 (TX_RECEIPT_TIMEOUT보다 길게)
+    MINT_RECOVERY_BATCH_SIZE: int = 100  # 한 번에 검사할 시도 수
+    HOLDINGS_INDEX_INTERVAL: int = 15  # Transfer 이벤트로 보유 토큰 테이블을 갱신하는 주기 (초, 0이면 끔)
+    HOLDINGS_START_BLOCK: int = 0  # 인덱싱 시작 블록 (컨트랙트 배포 블록으로 설정하면 처음 따라잡기가 빠름)
+    HOLDINGS_MAX_BLOCK_RANGE: int = 2000  # eth_getLogs 한 번에 조회할 최대 블록 수
     
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = True
     
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: str = ""  # 모듈별 레벨 (예: "app.services.web3=DEBUG,sqlalchemy.engine=INFO")
+    LOG_FORMAT: str = "json"  # json, text
+    SQL_ECHO: bool = False  # 모든 SQL 문 출력 (DEBUG와 별개)
+    
+    # Tracing (OpenTelemetry)
+    OTEL_ENABLED: bool = False
+    OTEL_SERVICE_NAME: str = "recipe-nft-backend"
+    OTEL_EXPORTER: str = "otlp"  # otlp, file, console
+    OTEL_EXPORTER_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    OTEL_TRACE_FILE: str = "traces.jsonl"  # OTEL_EXPORTER=file일 때 스팬 기록 파일
+    
     # CORS
     ALLOWED_ORIGINS: str = "http://localhost:5173,http://localhost:3000"
     
@@ -33,6 +89,43 @@ class Settings(BaseSettings):
     UPLOAD_DIR: str = "uploads"
     MAX_UPLOAD_SIZE: int = 50 * 1024 * 1024  # 50MB
     
+    # Media Storage
+    STORAGE_BACKEND: str = "local"  # local, s3
+    S3_BUCKET: Optional[str] = None
+    S3_ENDPOINT_URL: Optional[str] = None  # MinIO 등 S3 호환 서버 주소
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_MULTIPART_THRESHOLD: int = 8 * 1024 * 1024  # 이 크기를 넘으면 멀티파트 업로드
+    S3_MULTIPART_CHUNKSIZE: int = 8 * 1024 * 1024
+    S3_MAX_CONCURRENCY: int = 8  # 병렬 파트 전송 수
+    S3_PRESIGN_EXPIRES: int = 3600  # presigned URL 유효 시간 (초)
+    
+    # Photo Renditions
+    RENDITION_SIZES: str = "thumb:320,card:640,large:1280"  # 이름:긴 변 픽셀
+    RENDITION_FORMATS: str = "webp,jpeg"
+    RENDITION_WORKERS: int = 2  # 이미지 변환 프로세스 수
+    METADATA_IMAGE_VARIANT: str = "large_jpeg"  # NFT 메타데이터 image에 사용할 렌디션
+    
+    # Media Jobs (렌디션/동영상 처리 백그라운드 작업)
+    MEDIA_WORKERS: int = 2  # 동시에 실행할 작업 수
+    MEDIA_JOB_POLL_INTERVAL: float = 5.0  # 대기 작업 확인 주기 (초)
+    MEDIA_JOB_LEASE_SECONDS: int = 1800  # 실행 중 작업 임대 시간 (처리 중에는 1/3마다 연장, 워커가 죽어 연장이 끊기면 다른 워커가 재시도)
+    MEDIA_JOB_MAX_ATTEMPTS: int = 3
+    MEDIA_JOB_BACKOFF_SECONDS: int = 30  # 첫 재시도 대기 시간 (실패할 때마다 2배)
+    MEDIA_JOB_BACKOFF_MAX_SECONDS: int = 3600
+    FFMPEG_PATH: str = "ffmpeg"
+    FFPROBE_PATH: str = "ffprobe"
+    FFMPEG_THREADS: int = 2  # 작업당 ffmpeg 스레드 수
+    VIDEO_TRANSCODE: bool = False  # 스트리밍용 mp4(faststart) 변환 여부
+    VIDEO_JOB_TIMEOUT: int = 1800  # ffmpeg 실행 제한 시간 (초)
+    
+    # Bulk Import
+    IMPORT_BATCH_SIZE: int = 1000  # 한 번에 삽입할 레시피 수
+    IMPORT_MAX_ERRORS: int = 1000  # 응답에 포함할 최대 오류 줄 수
+    IMPORT_MAX_LINE_BYTES: int = 1024 * 1024  # 한 줄(레시피 하나)의 최대 크기, 넘으면 413
+    EXPORT_BATCH_SIZE: int = 1000  # 서버 사이드 커서에서 한 번에 가져올 행 수
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
@@ -7,7 +7,7 @@ from app.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
-    echo=settings.DEBUG
+    echo=settings.SQL_ECHO
 )
 
 # 세션 로컬 생성
@@ -16,6 +16,12 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base 클래스
 Base = declarative_base()
 
+def ping() -> bool:
+    """DB 연결 확인 (서버 시작 시 준비 상태 검사, 연결 풀도 미리 채움)"""
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return True
+
 # 데이터베이스 세션 의존성
 def get_db():
     db = SessionLocal()
@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+import atexit
+import json
+import logging
+import queue
+import sys
+from app.config import settings
+
+# LogRecord 기본 속성 (extra로 넘긴 필드만 골라내기 위함)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listener: Optional[QueueListener] = None
+
+class JsonFormatter(logging.Formatter):
+    """한 줄에 하나의 JSON 객체로 로그 출력"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+class _AsyncQueueHandler(QueueHandler):
+    """
+    호출 스레드에서는 메시지 조립만 하고 포맷/출력은 리스너 스레드에 맡기는 핸들러
+
+    기본 QueueHandler.prepare는 포매터 전체를 호출 스레드에서 실행하므로 재정의합니다.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # 트레이스백은 프레임이 바뀌기 전에 문자열로 만들어 둠
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+def parse_levels(value: str) -> Dict[str, str]:
+    """"app.services.web3=DEBUG,sqlalchemy.engine=INFO" 형식을 {로거: 레벨}로 변환"""
+    levels = {}
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+def setup_logging() -> None:
+    """
+    루트 로거를 큐 기반 비동기 핸들러로 구성
+
+    요청 스레드는 큐에 레코드를 넣기만 하고, 별도 리스너 스레드가 stdout에 씁니다.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JsonFormatter())
+    else:
+        stream.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root = logging.getLogger()
+    root.handlers = [_AsyncQueueHandler(log_queue)]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in parse_levels(settings.LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+def shutdown_logging() -> None:
+    """큐에 남은 로그를 모두 쓰고 리스너 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,184 @@
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Iterator
+import time
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.tracing import start_span
+
+# 외부 호출(RPC/IPFS/민팅 단계)은 초 단위로 길어질 수 있어 버킷을 넓게 잡음
+SLOW_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds",
+    "SQL 문 실행 시간",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+RPC_LATENCY = Histogram(
+    "web3_rpc_duration_seconds",
+    "JSON-RPC 요청 시간",
+    ["method", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+IPFS_LATENCY = Histogram(
+    "ipfs_request_duration_seconds",
+    "IPFS/Pinata 요청 시간",
+    ["operation", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+MINT_STAGE_LATENCY = Histogram(
+    "mint_stage_duration_seconds",
+    "민팅 단계별 소요 시간 (metadata, pin, sign, broadcast, receipt, extract)",
+    ["stage", "outcome"],
+    buckets=SLOW_BUCKETS,
+)
+TOKEN_ID_FALLBACKS = Counter(
+    "token_id_fallback_total",
+    "Transfer 이벤트로 토큰 ID를 찾지 못해 사용한 대체 방법 횟수",
+    ["method"],
+)
+TX_REPLACEMENTS = Counter(
+    "tx_replacement_total",
+    "영수증 지연으로 수수료를 올려 다시 보낸 트랜잭션 수",
+)
+STARTUP_SECONDS = Gauge(
+    "server_startup_seconds",
+    "서버 시작 시 외부 서비스 초기화를 기다린 시간 (STARTUP_TIMEOUT 이하)",
+)
+SERVICE_INIT_SECONDS = Gauge(
+    "service_init_seconds",
+    "서비스별 초기화(연결) 시간",
+    ["service"],
+)
+SIGNER_BALANCE = Gauge(
+    "signer_balance_eth",
+    "민팅 서명자 잔액 (마지막 조회 기준)",
+    ["address"],
+)
+SIGNER_IN_FLIGHT = Gauge(
+    "signer_in_flight_mints",
+    "서명자별 진행 중 민팅 수",
+    ["address"],
+)
+SIGNER_LOW_BALANCE = Counter(
+    "signer_low_balance_total",
+    "서명자 잔액이 SIGNER_MIN_BALANCE_ETH 아래로 내려간 횟수 (충전 필요 알림)",
+    ["address"],
+)
+
+class PrometheusMiddleware:
+    """
+    라우트 템플릿(/api/recipes/{recipe_id}) 단위로 요청 시간을 기록하는 ASGI 미들웨어
+
+    경로 값을 그대로 라벨로 쓰면 시계열이 무한히 늘어나므로 매칭된 라우트 경로를 사용합니다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code),
+            ).observe(time.perf_counter() - started)
+
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus 수집용 /metrics"""
+    # media_type으로 넘기면 charset이 한 번 더 붙으므로 헤더로 지정
+    return Response(generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+def instrument_engine(engine: Engine) -> None:
+    """SQLAlchemy 커서 이벤트로 쿼리 실행 시간 기록"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+        DB_QUERY_LATENCY.labels(operation=operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _error(context):
+        # 실패한 쿼리는 after 이벤트가 오지 않으므로 시작 시각만 정리
+        stack = context.connection.info.get("query_started") if context.connection else None
+        if stack:
+            stack.pop()
+
+def rpc_metrics_middleware(make_request: Callable, w3) -> Callable:
+    """JSON-RPC 메서드별 지연 시간을 기록하는 web3 미들웨어"""
+
+    def middleware(method, params):
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            response = make_request(method, params)
+            if "error" not in response:
+                outcome = "ok"
+            return response
+        finally:
+            RPC_LATENCY.labels(method=method, outcome=outcome).observe(time.perf_counter() - started)
+
+    return middleware
+
+def observe_ipfs(operation: str) -> Callable:
+    """IPFS 요청 시간 기록 데코레이터 (None/False 반환은 실패로 집계)"""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            outcome = "error"
+            try:
+                with start_span(f"ipfs {operation}"):
+                    result = func(*args, **kwargs)
+                if result is not None and result is not False:
+                    outcome = "ok"
+                return result
+            finally:
+                IPFS_LATENCY.labels(operation=operation, outcome=outcome).observe(time.perf_counter() - started)
+        return wrapper
+
+    return decorator
+
+@contextmanager
+def mint_stage(stage: str) -> Iterator[None]:
+    """민팅 단계 소요 시간 기록 (트레이싱이 켜져 있으면 같은 이름의 스팬도 생성)"""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span(f"mint.{stage}"):
+            yield
+        outcome = "ok"
+    finally:
+        MINT_STAGE_LATENCY.labels(stage=stage, outcome=outcome).observe(time.perf_counter() - started)
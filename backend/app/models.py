@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Numeric, Boolean
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, JSON, Numeric, Boolean, Float, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -22,16 +22,20 @@ class Recipe(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    token_id = Column(Integer, unique=True, index=True, nullable=True)  # NFT 토큰 ID
+    token_id = Column(Integer, index=True, nullable=True)  # NFT 토큰 ID (체인/컨트랙트마다 유일)
     recipe_name = Column(String(255), nullable=False, index=True)
     ingredients = Column(JSON, nullable=False)  # 재료 배열
     cooking_tools = Column(JSON, nullable=False)  # 조리 도구 배열
     cooking_steps = Column(JSON, nullable=False)  # 조리 과정 배열
     machine_instructions = Column(JSON, nullable=True)  # 기계 작동 과정
     ipfs_hash = Column(String(255), nullable=True, index=True)  # 메타데이터 IPFS 해시
+    token_metadata = Column(JSON, nullable=True)  # 민팅 시 IPFS에 올린 ERC-721 메타데이터 원본
     contract_address = Column(String(42), nullable=True)  # 스마트 컨트랙트 주소
+    chain_id = Column(Integer, nullable=True)  # 민팅한 체인 ID
     transaction_hash = Column(String(66), nullable=True, index=True)  # 민팅 트랜잭션 해시
     is_minted = Column(Boolean, default=False, nullable=False)
+    mint_state = Column(String(20), nullable=True)  # minting: 민팅 요청이 점유 중, voucher: 바우처 발급됨 (NULL이면 점유 없음)
+    mint_claimed_at = Column(DateTime(timezone=True), nullable=True)  # 점유 시각 (중단된 점유 정리용)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -41,6 +45,17 @@ class Recipe(Base):
     ownership_transfers = relationship("OwnershipTransfer", back_populates="recipe")
     validations = relationship("RecipeValidation", back_populates="recipe")
     monetization_links = relationship("MonetizationLink", back_populates="recipe")
+    mint_attempts = relationship("MintAttempt", back_populates="recipe", cascade="all, delete-orphan")
+
+    # 컨트랙트를 다시 배포하거나 여러 체인에 배포해도 토큰 ID가 겹치지 않도록 (체인, 컨트랙트)별로 유일
+    # NULL은 서로 다른 값으로 취급되므로 chain_id가 비어 있는 이전 레시피는 컨트랙트별로 따로 유일하게 유지
+    __table_args__ = (
+        Index("uq_recipes_chain_contract_token", "chain_id", "contract_address", "token_id", unique=True),
+        Index(
+            "uq_recipes_legacy_contract_token", text("lower(contract_address)"), "token_id", unique=True,
+            postgresql_where=text("chain_id IS NULL"), sqlite_where=text("chain_id IS NULL"),
+        ),
+    )
 
 class RecipeMedia(Base):
     __tablename__ = "recipe_media"
@@ -48,14 +63,101 @@ class RecipeMedia(Base):
     id = Column(Integer, primary_key=True, index=True)
     recipe_id = Column(Integer, ForeignKey("recipes.id"), nullable=False)
     media_type = Column(String(20), nullable=False)  # photo, video
+    variant = Column(String(20), default="original", nullable=False)  # original, thumb_webp, large_jpeg 등
+    parent_id = Column(Integer, ForeignKey("recipe_media.id", ondelete="CASCADE"), nullable=True, index=True)  # 원본 미디어 ID
     ipfs_hash = Column(String(255), nullable=True, index=True)
     file_path = Column(String(500), nullable=True)
     file_name = Column(String(255), nullable=True)
     file_size = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # 파일 SHA-256 (ETag)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    duration_seconds = Column(Float, nullable=True)  # 동영상 길이 (ffprobe)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
     recipe = relationship("Recipe", back_populates="media")
+    parent = relationship("RecipeMedia", remote_side=[id], back_populates="variants")
+    variants = relationship("RecipeMedia", back_populates="parent", cascade="all, delete-orphan")
+    jobs = relationship("MediaJob", back_populates="media", cascade="all, delete-orphan")
+
+class MediaJob(Base):
+    __tablename__ = "media_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    media_id = Column(Integer, ForeignKey("recipe_media.id", ondelete="CASCADE"), nullable=False, index=True)
+    kind = Column(String(30), nullable=False)  # photo_renditions, video_processing, ipfs_pin
+    status = Column(String(20), default="pending", nullable=False, index=True)  # pending, running, done, failed
+    attempts = Column(Integer, default=0, nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # 실행 임대 만료 시각 (프로세스 종료 시 재시도)
+    run_after = Column(DateTime(timezone=True), nullable=True)  # 실패 후 재시도 가능 시각 (지수 백오프)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationships
+    media = relationship("RecipeMedia", back_populates="jobs")
+
+class MintAttempt(Base):
+    __tablename__ = "mint_attempts"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False, index=True)
+    # metadata_built, pinned, signed, broadcast, confirmed, finalized, failed (지연 민팅: voucher_issued, expired)
+    status = Column(String(20), default="metadata_built", nullable=False, index=True)
+    to_address = Column(String(42), nullable=False)  # 민팅 대상 지갑
+    contract_address = Column(String(42), nullable=True)
+    token_metadata = Column(JSON, nullable=True)  # 업로드할(또는 업로드한) ERC-721 메타데이터
+    ipfs_hash = Column(String(255), nullable=True)
+    signer_address = Column(String(42), nullable=True)  # 서명한 민팅 계정 (nonce는 계정별)
+    nonce = Column(Integer, nullable=True)  # 서명한 트랜잭션의 nonce
+    transaction_hash = Column(String(66), nullable=True, index=True)  # 마지막으로 서명한 트랜잭션 (교체 시 갱신)
+    transaction_hashes = Column(JSON, nullable=True)  # 같은 nonce로 서명한 모든 트랜잭션 해시 (교체 포함)
+    token_id = Column(Integer, nullable=True)
+    block_number = Column(Integer, nullable=True)
+    voucher_signature = Column(String(132), nullable=True)  # 지연 민팅 EIP-712 바우처 서명
+    voucher_deadline = Column(BigInteger, nullable=True)  # 바우처 만료 시각 (유닉스 초, 서명에 포함)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    recipe = relationship("Recipe", back_populates="mint_attempts")
+
+class TokenHolding(Base):
+    __tablename__ = "token_holdings"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(Integer, nullable=False)
+    contract_address = Column(String(42), nullable=False)  # 체크섬 주소
+    token_id = Column(Integer, nullable=False)
+    owner_address = Column(String(42), nullable=False)  # 현재 보유자 (체크섬 주소)
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="SET NULL"), nullable=True)
+    # 마지막으로 반영한 Transfer 위치 (log_index -1: 민팅 직후 서버가 먼저 기록)
+    block_number = Column(Integer, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    recipe = relationship("Recipe")
+
+    __table_args__ = (
+        Index("uq_token_holdings_token", "chain_id", "contract_address", "token_id", unique=True),
+        Index("ix_token_holdings_owner_id", "owner_address", "id"),  # 보유 토큰 커서 페이지
+    )
+
+class IndexerCursor(Base):
+    __tablename__ = "indexer_cursors"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    chain_id = Column(Integer, nullable=False)
+    contract_address = Column(String(42), nullable=False)
+    block_number = Column(Integer, nullable=False)  # Transfer 이벤트 반영을 끝낸 마지막 블록
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("uq_indexer_cursors_contract", "chain_id", "contract_address", unique=True),
+    )
 
 class OwnershipTransfer(Base):
     __tablename__ = "ownership_transfers"
@@ -100,3 +202,15 @@ class MonetizationLink(Base):
     # Relationships
     recipe = relationship("Recipe", back_populates="monetization_links")
 
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(255), unique=True, index=True, nullable=False)  # Idempotency-Key 헤더 값
+    request_hash = Column(String(64), nullable=False)  # 요청 본문 + 지갑 주소 SHA-256
+    recipe_id = Column(Integer, ForeignKey("recipes.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships
+    recipe = relationship("Recipe")
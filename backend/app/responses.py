@@ -0,0 +1,111 @@
+from typing import Mapping, Optional, Tuple
+import hashlib
+import anyio
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+CHUNK_SIZE = 256 * 1024
+
+class RangeNotSatisfiable(Exception):
+    """Range 헤더가 파일 범위를 벗어남 (416)"""
+
+def file_sha256(path: str) -> str:
+    """파일 내용의 SHA-256 (강한 ETag 용)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    단일 `bytes=` Range 헤더를 (start, end) 포함 구간으로 변환
+
+    헤더가 없거나, 형식이 잘못되었거나, 여러 구간을 요청한 경우 None(전체 응답)을 반환합니다.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_str, _, end_str = header[len("bytes="):].strip().partition("-")
+    try:
+        if not start_str:
+            # bytes=-N: 마지막 N 바이트
+            length = int(end_str)
+            if length <= 0:
+                raise RangeNotSatisfiable()
+            return max(size - length, 0), size - 1
+        start = int(start_str)
+        end = int(end_str) if end_str else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+class RangeFileResponse(Response):
+    """
+    파일의 일부(또는 전체)를 전송하는 응답
+
+    ASGI 서버가 `http.response.zerocopysend` 확장을 지원하면 파일 디스크립터를 넘겨
+    커널 sendfile로 전송하고, 그렇지 않으면 작업 스레드에서 CHUNK_SIZE씩 읽어 보냅니다.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int,
+        end: int,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ):
+        self.path = path
+        self.start = start
+        self.end = end
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = background
+        self.init_headers(headers)
+        self.headers["content-length"] = str(max(end - start + 1, 0))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        length = self.end - self.start + 1
+        if scope["method"] == "HEAD" or length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": self.start,
+                    "count": length,
+                    "more_body": False,
+                })
+        else:
+            await self._send_chunks(send)
+        if self.background is not None:
+            await self.background()
+
+    async def _send_chunks(self, send: Send) -> None:
+        # 파일 읽기(페이지 폴트 포함)는 작업 스레드에서 실행해 이벤트 루프를 막지 않음
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break  # 전송 중 파일이 줄어듦
+                remaining -= len(chunk)
+                await send({
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": remaining > 0,
+                })
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
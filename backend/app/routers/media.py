@@ -1,85 +1,175 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import RedirectResponse
+from typing import List, Optional
+import hashlib
+import mimetypes
 import os
-import shutil
+import uuid
 from pathlib import Path
 from app.database import get_db
 from app import models, schemas
 from app.config import settings
+from app.responses import RangeFileResponse, RangeNotSatisfiable, file_sha256, parse_range
+from app.services.media_jobs import media_job_worker
+from app.services.pinning import enqueue_pin
+from app.services.storage import storage
 
 router = APIRouter(prefix="/media", tags=["media"])
 
-# 업로드 디렉토리 생성
-UPLOAD_DIR = Path(settings.UPLOAD_DIR)
-UPLOAD_DIR.mkdir(exist_ok=True)
+ALLOWED_EXTENSIONS = {
+    "photo": [".jpg", ".jpeg", ".png", ".gif", ".webp"],
+    "video": [".mp4", ".mov", ".avi", ".webm"]
+}
 
-@router.post("/upload/{recipe_id}", response_model=schemas.MediaResponse, status_code=status.HTTP_201_CREATED)
-async def upload_media(
-    recipe_id: int,
-    file: UploadFile = File(...),
-    media_type: str = "photo",  # photo or video
-    db: Session = Depends(get_db)
-):
-    """미디어 파일 업로드"""
-    # 레시피 확인
+def _get_recipe_or_404(db: Session, recipe_id: int) -> models.Recipe:
     recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
     if not recipe:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Recipe not found"
         )
-    
-    # 미디어 타입 검증
-    if media_type not in ["photo", "video"]:
+    return recipe
+
+def _validate_media(media_type: str, file_name: str, file_size: int):
+    """미디어 타입, 파일 크기, 확장자 검증"""
+    if media_type not in ALLOWED_EXTENSIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="media_type must be 'photo' or 'video'"
         )
-    
-    # 파일 크기 검증
-    file_content = await file.read()
-    file_size = len(file_content)
     if file_size > settings.MAX_UPLOAD_SIZE:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"File size exceeds maximum allowed size of {settings.MAX_UPLOAD_SIZE} bytes"
         )
-    
-    # 파일 확장자 검증
-    file_ext = Path(file.filename).suffix.lower()
-    allowed_extensions = {
-        "photo": [".jpg", ".jpeg", ".png", ".gif", ".webp"],
-        "video": [".mp4", ".mov", ".avi", ".webm"]
-    }
-    if file_ext not in allowed_extensions.get(media_type, []):
+    if Path(file_name).suffix.lower() not in ALLOWED_EXTENSIONS[media_type]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid file extension for {media_type}"
         )
-    
-    # 파일 저장
-    recipe_dir = UPLOAD_DIR / str(recipe_id)
-    recipe_dir.mkdir(exist_ok=True)
-    
-    file_path = recipe_dir / file.filename
-    with open(file_path, "wb") as buffer:
-        buffer.write(file_content)
-    
-    # DB에 저장
+
+def _new_media_key(recipe_id: int, file_name: str) -> str:
+    """같은 이름의 파일이 기존 미디어를 덮어쓰지 않도록 고유 접두어를 붙인 저장 키 (ETag가 내용과 일치하도록)"""
+    return storage.key_for(recipe_id, f"{uuid.uuid4().hex[:12]}_{Path(file_name).name}")
+
+def _hash_upload(fileobj) -> tuple:
+    """업로드 임시 파일을 한 번 훑어 크기와 SHA-256 계산 (메모리에 전체를 올리지 않음)"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: fileobj.read(1024 * 1024), b""):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return size, digest.hexdigest()
+
+def _create_media(db: Session, recipe_id: int, media_type: str, key: str, file_name: str,
+                  file_size: int, content_hash: Optional[str]) -> models.RecipeMedia:
+    """미디어 행과 후처리 작업을 한 트랜잭션으로 저장"""
     db_media = models.RecipeMedia(
         recipe_id=recipe_id,
         media_type=media_type,
-        file_path=str(file_path),
-        file_name=file.filename,
-        file_size=file_size
+        file_path=key,
+        file_name=file_name,
+        file_size=file_size,
+        content_hash=content_hash
     )
     db.add(db_media)
+    # 작업 행을 미디어 행과 같은 트랜잭션에 저장하여 재시작 후에도 처리되도록 함
+    job_kind = "photo_renditions" if media_type == "photo" else "video_processing"
+    media_job_worker.enqueue(db, db_media, job_kind)
+    enqueue_pin(db, db_media)
     db.commit()
     db.refresh(db_media)
-    
+    media_job_worker.wake()
     return db_media
 
+@router.post("/upload/{recipe_id}", response_model=schemas.MediaResponse, status_code=status.HTTP_201_CREATED)
+async def upload_media(
+    recipe_id: int,
+    file: UploadFile = File(...),
+    media_type: str = "photo",  # photo or video
+    db: Session = Depends(get_db)
+):
+    """미디어 파일 업로드 (렌디션/동영상 처리는 백그라운드 작업으로 등록)"""
+    _get_recipe_or_404(db, recipe_id)
+    
+    # 크기/해시 계산 후 검증
+    file_size, content_hash = await run_in_threadpool(_hash_upload, file.file)
+    _validate_media(media_type, file.filename, file_size)
+    
+    # 파일 저장 (S3는 멀티파트 병렬 업로드)
+    key = _new_media_key(recipe_id, file.filename)
+    await run_in_threadpool(storage.save, key, file.file)
+    
+    return _create_media(db, recipe_id, media_type, key, file.filename, file_size, content_hash)
+
+@router.post("/uploads/{recipe_id}", response_model=schemas.DirectUploadResponse)
+async def create_direct_upload(
+    recipe_id: int,
+    upload: schemas.DirectUploadRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    클라이언트 직접 업로드 시작 (S3 저장소 전용)
+    
+    S3_MULTIPART_THRESHOLD 이하이면 단일 PUT URL, 그보다 크면 파트별 PUT URL을 발급합니다.
+    업로드 후 `/uploads/{recipe_id}/complete`를 호출해야 미디어로 등록됩니다.
+    """
+    _get_recipe_or_404(db, recipe_id)
+    _validate_media(upload.media_type, upload.file_name, upload.file_size)
+    if not storage.supports_direct_upload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Direct upload is not supported by the {settings.STORAGE_BACKEND} storage backend"
+        )
+    
+    key = _new_media_key(recipe_id, upload.file_name)
+    return await run_in_threadpool(storage.create_direct_upload, key, upload.file_size, upload.content_type)
+
+@router.post("/uploads/{recipe_id}/complete", response_model=schemas.MediaResponse, status_code=status.HTTP_201_CREATED)
+async def complete_direct_upload(
+    recipe_id: int,
+    upload: schemas.DirectUploadComplete,
+    db: Session = Depends(get_db)
+):
+    """클라이언트 직접 업로드 완료 처리 및 미디어 등록"""
+    _get_recipe_or_404(db, recipe_id)
+    if not storage.supports_direct_upload:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Direct upload is not supported by the {settings.STORAGE_BACKEND} storage backend"
+        )
+    if not upload.key.startswith(storage.key_for(recipe_id, "")):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload key does not belong to this recipe"
+        )
+    
+    try:
+        await run_in_threadpool(
+            storage.complete_direct_upload,
+            upload.key,
+            upload.upload_id,
+            [part.model_dump() for part in upload.parts]
+        )
+        file_size = await run_in_threadpool(storage.size, upload.key)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Upload not found or incomplete: {str(e)}"
+        )
+    
+    try:
+        _validate_media(upload.media_type, upload.file_name, file_size)
+    except HTTPException:
+        await run_in_threadpool(storage.delete, upload.key)
+        raise
+    
+    # 내용 해시는 파일을 내려받지 않으므로 비워 둠 (다운로드는 저장소가 직접 처리)
+    return _create_media(db, recipe_id, upload.media_type, upload.key, upload.file_name, file_size, None)
+
 @router.get("/{media_id}", response_model=schemas.MediaResponse)
 async def get_media(media_id: int, db: Session = Depends(get_db)):
     """미디어 조회"""
@@ -91,6 +181,84 @@ async def get_media(media_id: int, db: Session = Depends(get_db)):
         )
     return media
 
+def _etag_matches(header: str, etag: str) -> bool:
+    """If-None-Match / If-Range 헤더가 현재 ETag와 일치하는지 확인"""
+    candidates = [value.strip() for value in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+@router.api_route("/{media_id}/content", methods=["GET", "HEAD"])
+async def get_media_content(media_id: int, request: Request, db: Session = Depends(get_db)):
+    """
+    미디어 파일 다운로드
+    
+    Range 요청(부분 전송), 내용 해시 기반 강한 ETag, If-None-Match/If-Range를 지원합니다.
+    """
+    media = db.query(models.RecipeMedia).filter(models.RecipeMedia.id == media_id).first()
+    if not media:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Media not found"
+        )
+    
+    # 원격 저장소(S3)는 presigned URL로 넘겨 Range/ETag 처리를 저장소가 직접 하도록 함
+    file_path = storage.local_file(media.file_path) if media.file_path else None
+    if media.file_path and not file_path:
+        url = storage.presigned_get_url(media.file_path)
+        if url:
+            return RedirectResponse(url, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+    if not file_path:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Media file not found"
+        )
+    
+    # 해시가 없는 기존 행은 최초 요청 시 계산하여 저장
+    if not media.content_hash:
+        media.content_hash = await run_in_threadpool(file_sha256, file_path)
+        db.commit()
+    
+    etag = f'"{media.content_hash}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "public, max-age=86400",
+    }
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    file_size = os.path.getsize(file_path)
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and if_range and not _etag_matches(if_range, etag):
+        # 클라이언트가 가진 버전과 다르면 전체를 다시 보냄
+        range_header = None
+    
+    try:
+        byte_range = parse_range(range_header, file_size)
+    except RangeNotSatisfiable:
+        return Response(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={**headers, "Content-Range": f"bytes */{file_size}"}
+        )
+    
+    if byte_range is None:
+        return RangeFileResponse(file_path, 0, file_size - 1, headers=headers, media_type=media_type)
+    
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+    return RangeFileResponse(
+        file_path,
+        start,
+        end,
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        headers=headers,
+        media_type=media_type
+    )
+
 @router.delete("/{media_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_media(media_id: int, db: Session = Depends(get_db)):
     """미디어 삭제"""
@@ -101,9 +269,10 @@ async def delete_media(media_id: int, db: Session = Depends(get_db)):
             detail="Media not found"
         )
     
-    # 파일 삭제
-    if media.file_path and os.path.exists(media.file_path):
-        os.remove(media.file_path)
+    # 파일 삭제 (렌디션 포함)
+    for item in [media, *media.variants]:
+        if item.file_path:
+            await run_in_threadpool(storage.delete, item.file_path)
     
     db.delete(media)
     db.commit()
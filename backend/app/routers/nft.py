@@ -1,60 +1,49 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional, Tuple
 from app.database import get_db
 from app import models, schemas
 from app.services.ipfs import ipfs_service
+from app.services.metadata import create_recipe_metadata
 from app.services.web3 import web3_service
+from app.services.storage import storage
+from app.services.pinning import is_placeholder_cid, make_placeholder_cid, pin_reconciler
+from app.services.mint_attempts import MintJournal, claim_recipe, finalize_attempt, issued_voucher, release_recipe
+from app.services.mint_attempts import release_expired_voucher, voucher_expired
+from app.services.token_index import token_index
+from app.services.transfers import find_redemption
+from app.services.vouchers import voucher_signer
 from app.config import settings
+from app.metrics import mint_stage
 import json
+import logging
+import time
 
-router = APIRouter(prefix="/nft", tags=["nft"])
+logger = logging.getLogger(__name__)
 
-def create_recipe_metadata(recipe: models.Recipe) -> dict:
-    """레시피를 NFT 메타데이터 형식으로 변환"""
-    # ERC-721 Metadata 표준 형식
-    metadata = {
-        "name": recipe.recipe_name,
-        "description": f"Recipe NFT: {recipe.recipe_name}",
-        "image": "",  # 대표 이미지 IPFS 해시 (추후 추가)
-        "attributes": [
-            {
-                "trait_type": "Ingredients Count",
-                "value": len(recipe.ingredients)
-            },
-            {
-                "trait_type": "Cooking Steps",
-                "value": len(recipe.cooking_steps)
-            },
-            {
-                "trait_type": "Tools Count",
-                "value": len(recipe.cooking_tools)
-            }
-        ],
-        "properties": {
-            "ingredients": recipe.ingredients,
-            "cooking_tools": recipe.cooking_tools,
-            "cooking_steps": recipe.cooking_steps,
-            "machine_instructions": recipe.machine_instructions or []
-        }
-    }
-    return metadata
+router = APIRouter(prefix="/nft", tags=["nft"])
 
-@router.post("/mint/{recipe_id}", response_model=schemas.RecipeResponse)
-async def mint_recipe_nft(
-    recipe_id: int,
-    wallet_address: str = Query(..., description="지갑 주소 (민팅 대상)"),
-    db: Session = Depends(get_db)
-):
+def select_metadata_image(recipe: models.Recipe) -> Optional[models.RecipeMedia]:
     """
-    레시피를 NFT로 민팅
-    
-    1. 레시피 메타데이터 생성
-    2. IPFS에 메타데이터 업로드
-    3. 스마트 컨트랙트를 통해 NFT 민팅
-    4. DB에 토큰 ID 및 IPFS 해시 저장
+    메타데이터 대표 이미지로 쓸 렌디션 선택 (가장 먼저 올린 사진 기준)
+
+    백그라운드 핀 작업으로 이미 CID가 있는 후보를 우선하여 민팅 중 IPFS 업로드를 피합니다.
     """
-    # 레시피 조회
+    photos = sorted(
+        (m for m in recipe.media if m.media_type == "photo"),
+        key=lambda m: m.id
+    )
+    # 렌디션이 아직 없으면 원본 사진 사용
+    candidates = [m for m in photos if m.variant == settings.METADATA_IMAGE_VARIANT]
+    candidates += [m for m in photos if m.variant == "original"]
+    for media in candidates:
+        if media.ipfs_hash and not is_placeholder_cid(media.ipfs_hash):
+            return media
+    return candidates[0] if candidates else None
+
+def _get_owned_recipe(db: Session, recipe_id: int, wallet_address: str) -> models.Recipe:
+    """민팅 대상 레시피 조회 및 소유자 확인"""
     recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
     if not recipe:
         raise HTTPException(
@@ -62,40 +51,153 @@ async def mint_recipe_nft(
             detail="Recipe not found"
         )
     
-    # 소유자 확인
     user = db.query(models.User).filter(models.User.wallet_address == wallet_address).first()
     if not user or recipe.user_id != user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to mint this recipe"
         )
-    
-    # 이미 민팅된 레시피인지 확인
+    return recipe
+
+def _claim_or_raise(db: Session, recipe: models.Recipe) -> None:
+    """레시피 점유 (동시 요청 중 하나만 성공)"""
     if recipe.is_minted:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Recipe already minted"
         )
+    if not claim_recipe(db, recipe.id):
+        db.refresh(recipe)
+        if recipe.is_minted:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Recipe already minted"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Mint already in progress for this recipe"
+        )
+
+async def _prepare_metadata(db: Session, recipe: models.Recipe) -> Tuple[dict, Optional[int], Optional[str]]:
+    """
+    1. 메타데이터 생성 (대표 이미지는 보통 핀 작업으로 CID가 이미 있음, 없을 때만 직접 업로드)
     
-    # 1. 메타데이터 생성
-    metadata = create_recipe_metadata(recipe)
+    실패하면 레시피 점유를 풉니다.
     
-    # 2. IPFS에 메타데이터 업로드
-    ipfs_hash = ipfs_service.upload_json(metadata)
-    if not ipfs_hash:
-        # IPFS가 연결되지 않은 경우 임시 해시 사용 (개발/테스트 환경)
-        import hashlib
-        import time
-        temp_hash = hashlib.md5(f"{recipe_id}_{time.time()}".encode()).hexdigest()
-        ipfs_hash = f"Qm{temp_hash[:40]}"  # IPFS 해시 형식으로 임시 생성
-        print(f"Warning: IPFS not available, using temporary hash: {ipfs_hash}")
+    Returns:
+        (메타데이터, 대표 이미지 미디어 ID, 직접 업로드한 이미지 CID)
+    """
+    try:
+        with mint_stage("metadata"):
+            image_media = select_metadata_image(recipe)
+            image_id, image_cid, image_path = (
+                (image_media.id, image_media.ipfs_hash, image_media.file_path) if image_media else (None, None, None)
+            )
+            metadata = create_recipe_metadata(recipe)
+            # 읽기 트랜잭션을 끝내 IPFS/체인 대기 동안 연결을 풀에 돌려줌
+            db.commit()
+            uploaded_image_cid = None
+            if not image_cid and image_path:
+                uploaded_image_cid = image_cid = await run_in_threadpool(_upload_image, image_path)
+            if image_cid:
+                metadata["image"] = f"ipfs://{image_cid}"
+    except Exception:
+        release_recipe(db, recipe.id)
+        db.commit()
+        raise
+    return metadata, image_id, uploaded_image_cid
+
+def _save_uploaded_image(db: Session, image_id: Optional[int], image_cid: Optional[str]) -> None:
+    """민팅 중 직접 업로드한 대표 이미지 CID 저장 (커밋은 호출자가 수행)"""
+    if image_cid:
+        media = db.get(models.RecipeMedia, image_id)
+        if media and not media.ipfs_hash:
+            media.ipfs_hash = image_cid
+
+def _upload_image(image_path: str) -> Optional[str]:
+    with storage.local_path(image_path) as local_path:
+        return ipfs_service.upload_file(local_path)
+
+def _pin_metadata(recipe_id: int, metadata: dict, journal: MintJournal) -> str:
+    """2. IPFS에 메타데이터 업로드"""
+    with mint_stage("pin"):
+        ipfs_hash = ipfs_service.upload_json(metadata)
+        if not ipfs_hash:
+            # IPFS가 연결되지 않은 경우 임시 해시 사용 (개발/테스트 환경)
+            # 핀 정합성 검사(pin_reconciler)가 이 해시를 찾아 메타데이터를 다시 업로드함
+            import time
+            ipfs_hash = make_placeholder_cid(f"{recipe_id}_{time.time()}")
+            logger.warning("IPFS not available, using temporary hash: %s", ipfs_hash)
+        journal.pinned(ipfs_hash)
+    return ipfs_hash
+
+@router.post("/mint/{recipe_id}", response_model=schemas.RecipeResponse)
+async def mint_recipe_nft(
+    recipe_id: int,
+    wallet_address: str = Query(..., description="지갑 주소 (민팅 대상)"),
+    db: Session = Depends(get_db)
+):
+    """
+    레시피를 NFT로 민팅
+    
+    1. 레시피 메타데이터 생성
+    2. IPFS에 메타데이터 업로드
+    3. 스마트 컨트랙트를 통해 NFT 민팅
+    4. DB에 토큰 ID 및 IPFS 해시 저장
+    
+    레시피를 먼저 점유해 같은 레시피의 동시 요청은 바로 409로 거절합니다.
+    IPFS/체인 대기는 스레드풀에서 실행하며 그동안 DB 연결을 잡지 않습니다.
+    각 단계는 mint_attempts에 기록되며, 전송 후 중단된 민팅은 복구 작업이 체인 상태로 마무리합니다.
+    """
+    recipe = _get_owned_recipe(db, recipe_id, wallet_address)
+    _claim_or_raise(db, recipe)
+    metadata, image_id, uploaded_image_cid = await _prepare_metadata(db, recipe)
+    
+    # 2~3. IPFS 업로드와 민팅 (실패 시 점유 해제는 민팅 시도 기록이 처리)
+    ipfs_hash, token_id, attempt_id = await run_in_threadpool(_mint_recipe, recipe_id, wallet_address, metadata)
+    
+    # 4. DB 업데이트 (레시피와 민팅 시도를 한 트랜잭션으로 반영)
+    _save_uploaded_image(db, image_id, uploaded_image_cid)
+    attempt = db.get(models.MintAttempt, attempt_id)
+    attempt.token_id = token_id
+    recipe = finalize_attempt(attempt)
+    
+    db.commit()
+    db.refresh(recipe)
+    
+    return recipe
+
+def _mint_recipe(recipe_id: int, wallet_address: str, metadata: dict) -> Tuple[str, Optional[int], int]:
+    """
+    메타데이터 업로드와 민팅 (스레드풀에서 실행, 요청 DB 세션을 쓰지 않음)
+    
+    Returns:
+        (메타데이터 IPFS 해시, 토큰 ID, 민팅 시도 ID)
+    """
+    contract_address = settings.NFT_CONTRACT_ADDRESS
+    journal = MintJournal.start(recipe_id, wallet_address, contract_address, metadata)
+    try:
+        ipfs_hash, token_id = _mint_with_journal(recipe_id, wallet_address, metadata, journal)
+    except Exception as e:
+        journal.interrupted(e.detail if isinstance(e, HTTPException) else str(e))
+        raise
+    return ipfs_hash, token_id, journal.attempt_id
+
+def _mint_with_journal(
+    recipe_id: int,
+    wallet_address: str,
+    metadata: dict,
+    journal: MintJournal,
+) -> Tuple[str, Optional[int]]:
+    """메타데이터 업로드부터 토큰 ID 확인까지 (단계마다 journal에 기록)"""
+    ipfs_hash = _pin_metadata(recipe_id, metadata, journal)
     
     # 3. 스마트 컨트랙트를 통한 NFT 민팅
     token_id = None
     contract_address = settings.NFT_CONTRACT_ADDRESS
-    transaction_hash = None
     
-    if web3_service.is_connected() and contract_address:
+    # 연결 확인 RPC를 생략하기 위해 시작 시 연결 여부만 확인 (노드 장애는 민팅 오류로 드러남)
+    if web3_service.w3 is not None and contract_address:
         # 실제 민팅 로직
         token_uri = f"ipfs://{ipfs_hash}"
         
@@ -109,14 +211,14 @@ async def mint_recipe_nft(
                 detail=f"Invalid wallet address: {str(e)}"
             )
         
-        print(f"Attempting to mint NFT: contract={contract_address}, to={wallet_address}, uri={token_uri}")
+        logger.debug("Attempting to mint NFT: contract=%s, to=%s, uri=%s", contract_address, wallet_address, token_uri)
         
         try:
-            result = web3_service.mint_nft(contract_address, wallet_address, token_uri)
+            result = web3_service.mint_nft(contract_address, wallet_address, token_uri, journal=journal)
             
             if result:
                 token_id, transaction_hash = result
-                print(f"✅ NFT minted successfully! Token ID: {token_id}, TX: {transaction_hash}")
+                logger.info("NFT minted successfully! Token ID: %s, TX: %s", token_id, transaction_hash)
             else:
                 error_msg = "Failed to mint NFT on blockchain"
                 if not settings.PRIVATE_KEY:
@@ -126,16 +228,14 @@ async def mint_recipe_nft(
                 else:
                     error_msg += " (Check server logs for details)"
                 
-                print(f"❌ {error_msg}")
+                logger.error("%s", error_msg)
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=error_msg
                 )
         except Exception as e:
             error_detail = f"Failed to mint NFT: {str(e)}"
-            print(f"❌ Mint error: {error_detail}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Mint error: %s", error_detail)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=error_detail
@@ -145,23 +245,169 @@ async def mint_recipe_nft(
         # 실제로는 스마트 컨트랙트에서 받아와야 함
         import random
         token_id = random.randint(1000, 9999)  # 임시 값
-        warning_msg = "Warning: Using mock token ID. "
+        warning_msg = "Using mock token ID. "
         if not web3_service.is_connected():
             warning_msg += f"Web3 not connected (Provider: {settings.WEB3_PROVIDER_URL}). "
         if not contract_address:
             warning_msg += "Contract address not set. "
-        print(warning_msg)
+        logger.warning("%s", warning_msg)
     
-    # 4. DB 업데이트
-    recipe.ipfs_hash = ipfs_hash
-    recipe.token_id = token_id
-    recipe.contract_address = contract_address
-    recipe.transaction_hash = transaction_hash  # None일 수 있음 (모의 민팅 시)
-    recipe.is_minted = True
+    return ipfs_hash, token_id
+
+@router.get("/mint/{recipe_id}/attempts", response_model=List[schemas.MintAttemptResponse])
+async def list_mint_attempts(recipe_id: int, db: Session = Depends(get_db)):
+    """레시피의 민팅 시도 기록 (최신순, 중단된 민팅의 진행 상태 확인용)"""
+    return db.query(models.MintAttempt).filter(
+        models.MintAttempt.recipe_id == recipe_id
+    ).order_by(models.MintAttempt.id.desc()).all()
+
+def _voucher_response(attempt: models.MintAttempt) -> schemas.MintVoucherResponse:
+    return schemas.MintVoucherResponse(
+        recipe_id=attempt.recipe_id,
+        uri=f"ipfs://{attempt.ipfs_hash}",
+        recipient=attempt.to_address,
+        deadline=attempt.voucher_deadline,
+        signature=attempt.voucher_signature,
+        contract_address=attempt.contract_address,
+        chain_id=settings.CHAIN_ID,
+        signer=voucher_signer.address,
+    )
+
+@router.post("/voucher/{recipe_id}", response_model=schemas.MintVoucherResponse)
+async def issue_mint_voucher(
+    recipe_id: int,
+    wallet_address: str = Query(..., description="지갑 주소 (민팅 대상)"),
+    db: Session = Depends(get_db)
+):
+    """
+    지연 민팅 바우처 발급
     
+    서버는 메타데이터를 IPFS에 올리고 EIP-712 바우처에 서명만 하며 트랜잭션을 보내지 않습니다.
+    받는 사람이 RecipeNFT.redeem으로 직접 민팅한 뒤 /voucher/{recipe_id}/confirm으로 알려주면 레시피에 반영됩니다.
+    이미 발급된 바우처가 있으면 같은 바우처를 반환합니다 (컨트랙트가 레시피당 한 번만 redeem 허용).
+    만료된 바우처는 체인에서 redeem되지 않은 것을 확인한 뒤 새 바우처로 바꿉니다 (VOUCHER_TTL_SECONDS).
+    """
+    if not voucher_signer.is_configured():
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Lazy minting is not configured (NFT_CONTRACT_ADDRESS, CHAIN_ID, VOUCHER_SIGNER_KEY, NFT_CONTRACT_VARIANT=standard)"
+        )
+    recipe = _get_owned_recipe(db, recipe_id, wallet_address)
+    if recipe.mint_state == "voucher":
+        attempt = issued_voucher(db, recipe_id)
+        if attempt and (attempt.voucher_deadline is None or attempt.voucher_deadline > time.time()):
+            return _voucher_response(attempt)
+        if attempt:
+            await _release_expired_voucher(db, attempt)
+    
+    from web3 import Web3
+    try:
+        wallet_address = Web3.to_checksum_address(wallet_address)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid wallet address: {str(e)}"
+        )
+    
+    _claim_or_raise(db, recipe)
+    metadata, image_id, uploaded_image_cid = await _prepare_metadata(db, recipe)
+    attempt_id = await run_in_threadpool(_issue_voucher, recipe_id, wallet_address, metadata)
+    
+    _save_uploaded_image(db, image_id, uploaded_image_cid)
     db.commit()
-    db.refresh(recipe)
+    return _voucher_response(db.get(models.MintAttempt, attempt_id))
+
+async def _release_expired_voucher(db: Session, attempt: models.MintAttempt) -> None:
+    """만료된 바우처의 레시피 점유 해제 (새 바우처 발급 전, redeem되지 않은 것을 확인한 뒤에만)"""
+    if not voucher_expired(attempt):
+        # 만료 직전에 보낸 redeem이 아직 블록에 포함되지 않았을 수 있음
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Voucher expired at {attempt.voucher_deadline}; a new voucher can be issued after "
+                   f"{attempt.voucher_deadline + settings.MINT_RECOVERY_GRACE}"
+        )
+    if web3_service.w3 is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Web3 not connected. Provider: {settings.WEB3_PROVIDER_URL}"
+        )
+    try:
+        released = await run_in_threadpool(release_expired_voucher, attempt)
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to check voucher redemption: {str(e)}"
+        )
+    if not released:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Voucher was already redeemed; confirm it with /api/nft/voucher/{attempt.recipe_id}/confirm"
+        )
+    db.commit()
+
+def _issue_voucher(recipe_id: int, wallet_address: str, metadata: dict) -> int:
+    """메타데이터 업로드와 바우처 서명 (스레드풀에서 실행)"""
+    journal = MintJournal.start(recipe_id, wallet_address, settings.NFT_CONTRACT_ADDRESS, metadata)
+    try:
+        ipfs_hash = _pin_metadata(recipe_id, metadata, journal)
+        with mint_stage("sign"):
+            deadline = int(time.time()) + settings.VOUCHER_TTL_SECONDS
+            signature = voucher_signer.sign(recipe_id, f"ipfs://{ipfs_hash}", wallet_address, deadline)
+        journal.voucher_issued(signature, deadline)
+    except Exception as e:
+        journal.interrupted(str(e))
+        raise
+    return journal.attempt_id
+
+@router.post("/voucher/{recipe_id}/confirm", response_model=schemas.RecipeResponse)
+async def confirm_voucher_redemption(
+    recipe_id: int,
+    tx_hash: str = Query(..., description="redeem 트랜잭션 해시"),
+    db: Session = Depends(get_db)
+):
+    """바우처 redeem 트랜잭션을 확인해 토큰 ID를 레시피에 반영"""
+    recipe = db.query(models.Recipe).filter(models.Recipe.id == recipe_id).first()
+    if not recipe:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Recipe not found"
+        )
+    if recipe.is_minted:
+        return recipe
+    attempt = issued_voucher(db, recipe_id)
+    if not attempt:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No voucher issued for this recipe"
+        )
+    if web3_service.w3 is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Web3 not connected. Provider: {settings.WEB3_PROVIDER_URL}"
+        )
+    
+    from web3.exceptions import TransactionNotFound
+    try:
+        receipt = await run_in_threadpool(web3_service.w3.eth.get_transaction_receipt, tx_hash)
+    except TransactionNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Transaction {tx_hash} is not mined yet"
+        )
+    redemption = find_redemption(receipt.logs, recipe_id, attempt.contract_address) if receipt.status == 1 else None
+    if redemption is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Transaction {tx_hash} did not redeem the voucher for recipe {recipe_id}"
+        )
     
+    attempt.token_id = redemption.token_id
+    attempt.transaction_hash = receipt.transactionHash.hex()
+    attempt.block_number = receipt.blockNumber
+    recipe = finalize_attempt(attempt)
+    db.commit()
+    db.refresh(recipe)
     return recipe
 
 @router.get("/metadata/{recipe_id}")
@@ -180,15 +426,17 @@ async def get_recipe_metadata(recipe_id: int, db: Session = Depends(get_db)):
             detail="Recipe not minted yet"
         )
     
-    # IPFS에서 메타데이터 가져오기
-    metadata_bytes = ipfs_service.get_file(recipe.ipfs_hash)
-    if not metadata_bytes:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve metadata from IPFS"
-        )
-    
-    metadata = json.loads(metadata_bytes.decode('utf-8'))
+    # 민팅 시 저장한 메타데이터가 있으면 IPFS 왕복 없이 사용
+    metadata = recipe.token_metadata
+    if metadata is None:
+        # IPFS에서 메타데이터 가져오기
+        metadata_bytes = ipfs_service.get_file(recipe.ipfs_hash)
+        if not metadata_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to retrieve metadata from IPFS"
+            )
+        metadata = json.loads(metadata_bytes.decode('utf-8'))
     return {
         "recipe_id": recipe.id,
         "token_id": recipe.token_id,
@@ -198,26 +446,48 @@ async def get_recipe_metadata(recipe_id: int, db: Session = Depends(get_db)):
         "metadata_uri": f"ipfs://{recipe.ipfs_hash}"
     }
 
+def _resolve_token(db: Session, chain_id: int, contract_address: str, token_id: int) -> models.Recipe:
+    try:
+        recipe = token_index.resolve(db, chain_id, contract_address, token_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid contract address: {contract_address}"
+        )
+    if not recipe:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recipe not found for token {chain_id}/{contract_address}/{token_id}"
+        )
+    return recipe
+
+@router.get("/tokens/{chain_id}/{contract_address}/{token_id}", response_model=schemas.RecipeResponse)
+async def get_recipe_by_token(
+    chain_id: int,
+    contract_address: str,
+    token_id: int,
+    db: Session = Depends(get_db)
+):
+    """체인 ID + 컨트랙트 + 토큰 ID로 레시피 조회 (여러 체인/컨트랙트의 토큰을 구분)"""
+    return _resolve_token(db, chain_id, contract_address, token_id)
+
 @router.get("/by-token/{token_id}", response_model=schemas.RecipeResponse)
 async def get_recipe_by_token_id(
     token_id: int,
-    contract_address: Optional[str] = Query(None, description="컨트랙트 주소 (선택사항)"),
+    contract_address: Optional[str] = Query(None, description="컨트랙트 주소 (없으면 설정값 사용)"),
+    chain_id: Optional[int] = Query(None, description="체인 ID (없으면 연결된 체인)"),
     db: Session = Depends(get_db)
 ):
-    """토큰 ID로 레시피 조회"""
-    query = db.query(models.Recipe).filter(models.Recipe.token_id == token_id)
-    
-    if contract_address:
-        query = query.filter(models.Recipe.contract_address == contract_address)
-    
-    recipe = query.first()
-    if not recipe:
+    """토큰 ID로 레시피 조회 (/tokens/{chain_id}/{contract_address}/{token_id}의 기본값 버전)"""
+    contract_address = contract_address or settings.NFT_CONTRACT_ADDRESS
+    if chain_id is None:
+        chain_id = await run_in_threadpool(web3_service.chain_id)
+    if not contract_address or chain_id is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Recipe not found for token_id: {token_id}"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="contract_address and chain_id are required (NFT_CONTRACT_ADDRESS/CHAIN_ID not configured)"
         )
-    
-    return recipe
+    return _resolve_token(db, chain_id, contract_address, token_id)
 
 @router.get("/by-tx/{tx_hash}", response_model=schemas.RecipeResponse)
 async def get_recipe_by_transaction(
@@ -253,7 +523,7 @@ async def get_recipe_by_transaction(
         
         # 실패 시 Etherscan API로 재시도 (token_id가 None인 경우만)
         if token_id is None:
-            print("Web3 method failed, trying Etherscan API...")
+            logger.debug("Web3 method failed, trying Etherscan API...")
             token_id = web3_service.get_token_id_from_etherscan(tx_hash, network="sepolia")
     
     if token_id is None:
@@ -270,10 +540,14 @@ async def get_recipe_by_transaction(
         )
     
     # 토큰 ID로 레시피 조회
-    recipe = db.query(models.Recipe).filter(
-        models.Recipe.token_id == token_id,
-        models.Recipe.contract_address == contract_address
-    ).first()
+    chain_id = web3_service.chain_id()
+    if chain_id is not None:
+        recipe = token_index.resolve(db, chain_id, contract_address, token_id)
+    else:
+        recipe = db.query(models.Recipe).filter(
+            models.Recipe.token_id == token_id,
+            models.Recipe.contract_address == contract_address
+        ).first()
     
     if not recipe:
         # 토큰 ID가 일치하지 않는 경우, 데이터베이스의 모든 민팅된 레시피를 확인
@@ -285,8 +559,8 @@ async def get_recipe_by_transaction(
         # 가장 최근에 민팅된 레시피 반환 (토큰 ID 불일치 시 대안)
         if all_minted:
             latest_recipe = sorted(all_minted, key=lambda r: r.created_at, reverse=True)[0]
-            print(f"Warning: Token ID mismatch. Extracted token_id={token_id}, but found recipe with token_id={latest_recipe.token_id}")
-            print(f"Returning latest minted recipe as fallback.")
+            logger.warning("Token ID mismatch. Extracted token_id=%s, but found recipe with token_id=%s", token_id, latest_recipe.token_id)
+            logger.debug("Returning latest minted recipe as fallback.")
             return latest_recipe
         
         raise HTTPException(
@@ -428,3 +702,13 @@ async def debug_transaction(
     
     return debug_info
 
+
+@router.get("/pins/report")
+async def get_pin_report():
+    """마지막 IPFS 핀 정합성 검사 결과 (핀 커버리지, 임시 해시, 고아 핀 수)"""
+    if pin_reconciler.last_report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Pin reconciliation has not run yet"
+        )
+    return pin_reconciler.last_report
@@ -1,29 +1,70 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload
+from typing import Iterator, List, Optional, Tuple
+from datetime import datetime
+import csv
+import hashlib
+import io
+import json
+import logging
+from app.config import settings
+from app.database import get_db, SessionLocal
 from app import models, schemas
+from app.services.users import upsert_user, upsert_user_ids
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/recipes", tags=["recipes"])
 
+def _idempotency_request_hash(recipe: schemas.RecipeCreate, wallet_address: str) -> str:
+    """멱등성 키에 묶인 요청 본문 해시"""
+    payload = json.dumps(
+        {"wallet_address": wallet_address, "recipe": recipe.model_dump()},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _replay_idempotent_recipe(db: Session, key: str, request_hash: str) -> Optional[models.Recipe]:
+    """이미 처리된 멱등성 키라면 최초 생성된 레시피 반환"""
+    record = db.query(models.IdempotencyKey).options(
+        joinedload(models.IdempotencyKey.recipe).joinedload(models.Recipe.owner)
+    ).filter(models.IdempotencyKey.key == key).first()
+    if not record:
+        return None
+    if record.request_hash != request_hash:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used with a different request"
+        )
+    return record.recipe
+
 @router.post("/", response_model=schemas.RecipeResponse, status_code=status.HTTP_201_CREATED)
 async def create_recipe(
     recipe: schemas.RecipeCreate,
     wallet_address: str = Query(..., description="지갑 주소 (임시 인증)"),
+    idempotency_key: Optional[str] = Header(None, max_length=255, description="재시도 시 중복 생성 방지 키"),
     db: Session = Depends(get_db)
 ):
-    """레시피 생성"""
-    # 사용자 조회 또는 생성
-    user = db.query(models.User).filter(models.User.wallet_address == wallet_address).first()
-    if not user:
-        user = models.User(wallet_address=wallet_address)
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    """레시피 생성 (사용자 upsert + 레시피 삽입을 하나의 트랜잭션으로 처리)"""
+    request_hash = None
+    if idempotency_key:
+        request_hash = _idempotency_request_hash(recipe, wallet_address)
+        existing = _replay_idempotent_recipe(db, idempotency_key, request_hash)
+        if existing:
+            return existing
+    
+    # 사용자 조회 또는 생성 (커밋 없이 같은 트랜잭션)
+    user = upsert_user(db, wallet_address)
     
     # 레시피 생성
     db_recipe = models.Recipe(
-        user_id=user.id,
+        owner=user,
         recipe_name=recipe.recipe_name,
         ingredients=recipe.ingredients,
         cooking_tools=recipe.cooking_tools,
@@ -31,10 +72,139 @@ async def create_recipe(
         machine_instructions=recipe.machine_instructions
     )
     db.add(db_recipe)
+    if idempotency_key:
+        db.add(models.IdempotencyKey(
+            key=idempotency_key,
+            request_hash=request_hash,
+            recipe=db_recipe
+        ))
+    
+    try:
+        # INSERT ... RETURNING으로 id/created_at을 받아 응답을 커밋 전에 구성 (refresh 왕복 제거)
+        db.flush()
+        response = schemas.RecipeResponse.model_validate(db_recipe)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if not idempotency_key:
+            raise
+        # 같은 키로 동시에 들어온 재시도 요청: 먼저 커밋된 결과 반환
+        existing = _replay_idempotent_recipe(db, idempotency_key, request_hash)
+        if not existing:
+            raise
+        return existing
+    
+    return response
+
+def _format_validation_error(error: ValidationError) -> str:
+    """pydantic 검증 오류를 한 줄 메시지로 변환"""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc']) or 'line'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+def _import_batch(db: Session, batch: List[Tuple[int, schemas.RecipeImportItem]]) -> List[schemas.RecipeImportError]:
+    """검증된 레시피 묶음을 다중 행 INSERT로 저장 (실패 시 행 단위로 재시도)"""
+    user_ids = upsert_user_ids(db, (item.wallet_address for _, item in batch))
+    rows = [
+        {
+            "user_id": user_ids[item.wallet_address],
+            **item.model_dump(exclude={"wallet_address"}),
+        }
+        for _, item in batch
+    ]
+    try:
+        db.execute(insert(models.Recipe), rows)
+        db.commit()
+        return []
+    except SQLAlchemyError:
+        db.rollback()
+    
+    # 묶음 전체가 실패한 경우: 문제 줄만 골라내기 위해 한 줄씩 저장
+    errors = []
+    user_ids = upsert_user_ids(db, (item.wallet_address for _, item in batch))
+    for (line_no, item), row in zip(batch, rows):
+        row["user_id"] = user_ids[item.wallet_address]
+        try:
+            with db.begin_nested():
+                db.execute(insert(models.Recipe), [row])
+        except SQLAlchemyError as e:
+            errors.append(schemas.RecipeImportError(line=line_no, error=str(e.orig if hasattr(e, "orig") else e)))
     db.commit()
-    db.refresh(db_recipe)
+    return errors
+
+@router.post("/import", response_model=schemas.RecipeImportResult)
+async def import_recipes(request: Request, db: Session = Depends(get_db)):
+    """
+    NDJSON 대량 레시피 임포트
     
-    return db_recipe
+    한 줄에 하나의 레시피(`RecipeCreate` 필드 + `wallet_address`)를 받아
+    스트리밍으로 파싱하고, IMPORT_BATCH_SIZE 단위로 사용자 조회와 다중 행 INSERT를 수행합니다.
+    잘못된 줄은 건너뛰고 줄 번호와 함께 보고합니다.
+    IMPORT_MAX_LINE_BYTES보다 긴 줄을 만나면 413으로 중단합니다 (그 전 배치는 이미 저장됨).
+    """
+    imported = 0
+    failed = 0
+    errors: List[schemas.RecipeImportError] = []
+    batch: List[Tuple[int, schemas.RecipeImportItem]] = []
+    
+    def record_error(error: schemas.RecipeImportError):
+        nonlocal failed
+        failed += 1
+        if len(errors) < settings.IMPORT_MAX_ERRORS:
+            errors.append(error)
+    
+    async def flush():
+        nonlocal imported
+        batch_errors = await run_in_threadpool(_import_batch, db, batch)
+        imported += len(batch) - len(batch_errors)
+        for error in batch_errors:
+            record_error(error)
+        batch.clear()
+    
+    def parse(line_no: int, line: bytes):
+        if not line.strip():
+            return
+        try:
+            batch.append((line_no, schemas.RecipeImportItem.model_validate_json(line)))
+        except ValidationError as e:
+            record_error(schemas.RecipeImportError(line=line_no, error=_format_validation_error(e)))
+    
+    def line_too_long() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Line {line_no + 1} exceeds {settings.IMPORT_MAX_LINE_BYTES} bytes"
+        )
+    
+    line_no = 0
+    # 청크 사이에는 아직 끝나지 않은 마지막 줄만 보관 (각 바이트는 한 번만 탐색)
+    tail = bytearray()
+    async for chunk in request.stream():
+        start = 0
+        while (end := chunk.find(b"\n", start)) >= 0:
+            if len(tail) + end - start > settings.IMPORT_MAX_LINE_BYTES:
+                raise line_too_long()
+            if tail:
+                tail += chunk[start:end]
+                line = bytes(tail)
+                tail.clear()
+            else:
+                line = chunk[start:end]
+            start = end + 1
+            line_no += 1
+            parse(line_no, line)
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                await flush()
+        tail += chunk[start:]
+        if len(tail) > settings.IMPORT_MAX_LINE_BYTES:
+            raise line_too_long()
+    if tail:
+        line_no += 1
+        parse(line_no, bytes(tail))
+    if batch:
+        await flush()
+    
+    return schemas.RecipeImportResult(imported=imported, failed=failed, errors=errors)
 
 @router.get("/", response_model=List[schemas.RecipeListResponse])
 async def get_recipes(
@@ -53,11 +223,113 @@ async def get_recipes(
         recipes = query.offset(skip).limit(limit).all()
         return recipes
     except Exception as e:
-        import traceback
-        print(f"❌ get_recipes error: {e}")
-        traceback.print_exc()
+        logger.exception("get_recipes error: %s", e)
         raise
 
+EXPORT_FIELDS = [
+    "id", "owner", "recipe_name", "ingredients", "cooking_tools", "cooking_steps",
+    "machine_instructions", "token_id", "ipfs_hash", "contract_address", "chain_id",
+    "transaction_hash", "is_minted", "created_at", "updated_at",
+]
+EXPORT_JSON_FIELDS = {"ingredients", "cooking_tools", "cooking_steps", "machine_instructions", "metadata"}
+
+def _export_rows(filters: list, include_metadata: bool) -> Iterator[dict]:
+    """서버 사이드 커서(yield_per)로 레시피를 한 묶음씩 읽어 행 단위로 반환"""
+    recipes = models.Recipe.__table__
+    columns = [
+        recipes.c.id,
+        models.User.wallet_address.label("owner"),
+        *(recipes.c[name] for name in EXPORT_FIELDS if name not in ("id", "owner")),
+    ]
+    if include_metadata:
+        columns.append(recipes.c.token_metadata.label("metadata"))
+    stmt = (
+        select(*columns)
+        .join(models.User, models.User.id == recipes.c.user_id)
+        .where(*filters)
+        .order_by(recipes.c.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    
+    # 응답 스트리밍이 끝날 때까지 살아 있어야 하므로 요청 의존성과 별도의 세션 사용
+    db = SessionLocal()
+    try:
+        for row in db.execute(stmt):
+            data = row._asdict()
+            for key in ("created_at", "updated_at"):
+                if data[key] is not None:
+                    data[key] = data[key].isoformat()
+            if include_metadata:
+                data["metadata_uri"] = f"ipfs://{data['ipfs_hash']}" if data["is_minted"] and data["ipfs_hash"] else None
+            yield data
+    finally:
+        db.close()
+
+def _stream_ndjson(rows: Iterator[dict]) -> Iterator[str]:
+    batch = []
+    for row in rows:
+        batch.append(json.dumps(row, ensure_ascii=False))
+        if len(batch) >= settings.EXPORT_BATCH_SIZE:
+            yield "\n".join(batch) + "\n"
+            batch.clear()
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+def _stream_csv(rows: Iterator[dict], fieldnames: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        for key in EXPORT_JSON_FIELDS.intersection(row):
+            if row[key] is not None:
+                row[key] = json.dumps(row[key], ensure_ascii=False)
+        writer.writerow(row)
+        count += 1
+        if count % settings.EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+@router.get("/export")
+async def export_recipes(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson 또는 csv"),
+    is_minted: Optional[bool] = None,
+    owner: Optional[str] = Query(None, description="소유자 지갑 주소"),
+    created_from: Optional[datetime] = Query(None, description="생성일 시작 (포함)"),
+    created_to: Optional[datetime] = Query(None, description="생성일 끝 (미포함)"),
+    include_metadata: bool = Query(False, description="민팅된 토큰의 ERC-721 메타데이터 포함"),
+):
+    """
+    레시피 전체 내보내기 (스트리밍)
+    
+    OFFSET 페이지 조회 없이 서버 사이드 커서로 id 순서대로 읽어 메모리 사용량이 일정합니다.
+    """
+    filters = []
+    if is_minted is not None:
+        filters.append(models.Recipe.is_minted == is_minted)
+    if owner:
+        filters.append(models.User.wallet_address == owner)
+    if created_from:
+        filters.append(models.Recipe.created_at >= created_from)
+    if created_to:
+        filters.append(models.Recipe.created_at < created_to)
+    
+    rows = _export_rows(filters, include_metadata)
+    if format == "csv":
+        fieldnames = EXPORT_FIELDS + (["metadata", "metadata_uri"] if include_metadata else [])
+        return StreamingResponse(
+            _stream_csv(rows, fieldnames),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="recipes.csv"'},
+        )
+    return StreamingResponse(
+        _stream_ndjson(rows),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="recipes.ndjson"'},
+    )
+
 @router.get("/{recipe_id}", response_model=schemas.RecipeResponse)
 async def get_recipe(recipe_id: int, db: Session = Depends(get_db)):
     """레시피 상세 조회"""
@@ -1,5 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+from web3 import Web3
 from app.database import get_db
 from app import models, schemas
 
@@ -47,3 +49,40 @@ async def get_user_recipes(wallet_address: str, db: Session = Depends(get_db)):
         )
     return user.recipes
 
+@router.get("/{wallet_address}/tokens", response_model=schemas.TokenHoldingPage)
+async def get_user_tokens(
+    wallet_address: str,
+    cursor: Optional[int] = Query(None, description="이전 페이지의 next_cursor"),
+    limit: int = Query(50, ge=1, le=200),
+    chain_id: Optional[int] = Query(None, description="체인 ID (선택사항)"),
+    contract_address: Optional[str] = Query(None, description="컨트랙트 주소 (선택사항)"),
+    db: Session = Depends(get_db)
+):
+    """
+    지갑이 현재 보유한 토큰 목록 (Transfer 이벤트로 갱신되는 token_holdings에서 조회, RPC 없음)
+    
+    민팅한 사람이 아니라 지금 보유한 사람 기준이며, 커서(next_cursor)로 다음 페이지를 요청합니다.
+    """
+    try:
+        owner_address = Web3.to_checksum_address(wallet_address)
+        if contract_address:
+            contract_address = Web3.to_checksum_address(contract_address)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid address"
+        )
+    
+    query = db.query(models.TokenHolding).options(
+        joinedload(models.TokenHolding.recipe).joinedload(models.Recipe.owner)
+    ).filter(models.TokenHolding.owner_address == owner_address)
+    if chain_id is not None:
+        query = query.filter(models.TokenHolding.chain_id == chain_id)
+    if contract_address:
+        query = query.filter(models.TokenHolding.contract_address == contract_address)
+    if cursor is not None:
+        query = query.filter(models.TokenHolding.id > cursor)
+    
+    holdings = query.order_by(models.TokenHolding.id).limit(limit + 1).all()
+    next_cursor = holdings[limit - 1].id if len(holdings) > limit else None
+    return {"items": holdings[:limit], "next_cursor": next_cursor}
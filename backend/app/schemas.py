@@ -44,6 +44,7 @@ class RecipeResponse(RecipeBase):
     token_id: Optional[int] = None
     ipfs_hash: Optional[str] = None
     contract_address: Optional[str] = None
+    chain_id: Optional[int] = None
     transaction_hash: Optional[str] = None
     is_minted: bool
     created_at: datetime
@@ -64,6 +65,18 @@ class RecipeListResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class RecipeImportItem(RecipeCreate):
+    wallet_address: str = Field(..., min_length=42, max_length=42)
+
+class RecipeImportError(BaseModel):
+    line: int
+    error: str
+
+class RecipeImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[RecipeImportError] = []
+
 # Media Schemas
 class MediaBase(BaseModel):
     media_type: str = Field(..., pattern="^(photo|video)$")
@@ -75,14 +88,93 @@ class MediaCreate(MediaBase):
 class MediaResponse(MediaBase):
     id: int
     recipe_id: int
+    variant: str = "original"
+    parent_id: Optional[int] = None
     ipfs_hash: Optional[str] = None
     file_path: Optional[str] = None
     file_size: Optional[int] = None
+    content_hash: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    duration_seconds: Optional[float] = None
     created_at: datetime
     
     class Config:
         from_attributes = True
 
+class DirectUploadRequest(BaseModel):
+    file_name: str = Field(..., min_length=1, max_length=255)
+    file_size: int = Field(..., gt=0)
+    media_type: str = Field("photo", pattern="^(photo|video)$")
+    content_type: str = "application/octet-stream"
+
+class DirectUploadResponse(BaseModel):
+    key: str
+    url: Optional[str] = None  # 단일 PUT 업로드 URL
+    upload_id: Optional[str] = None  # 멀티파트 업로드 ID
+    part_size: Optional[int] = None
+    part_urls: List[str] = []
+
+class DirectUploadPart(BaseModel):
+    part_number: int = Field(..., ge=1)
+    etag: str
+
+class DirectUploadComplete(BaseModel):
+    key: str
+    file_name: str = Field(..., min_length=1, max_length=255)
+    media_type: str = Field("photo", pattern="^(photo|video)$")
+    upload_id: Optional[str] = None
+    parts: List[DirectUploadPart] = []
+
+# Mint Attempt Schemas
+class MintAttemptResponse(BaseModel):
+    id: int
+    recipe_id: int
+    status: str
+    to_address: str
+    contract_address: Optional[str] = None
+    ipfs_hash: Optional[str] = None
+    signer_address: Optional[str] = None
+    nonce: Optional[int] = None
+    transaction_hash: Optional[str] = None
+    transaction_hashes: Optional[List[str]] = None
+    token_id: Optional[int] = None
+    block_number: Optional[int] = None
+    voucher_deadline: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class MintVoucherResponse(BaseModel):
+    """RecipeNFT.redeem(recipe_id, uri, recipient, deadline, signature) 호출 인자"""
+    recipe_id: int
+    uri: str
+    recipient: str
+    deadline: Optional[int] = None  # 유닉스 초, 이후에는 redeem이 거절됨 (만료 시각 없이 서명한 이전 바우처는 없음)
+    signature: str
+    contract_address: str
+    chain_id: int
+    signer: str  # 컨트랙트의 voucherSigner와 같아야 함
+
+class TokenHoldingResponse(BaseModel):
+    chain_id: int
+    contract_address: str
+    token_id: int
+    owner_address: str
+    recipe_id: Optional[int] = None
+    recipe: Optional[RecipeListResponse] = None
+    block_number: int
+    
+    class Config:
+        from_attributes = True
+
+class TokenHoldingPage(BaseModel):
+    items: List[TokenHoldingResponse]
+    next_cursor: Optional[int] = None  # 다음 페이지 요청의 cursor (없으면 마지막 페이지)
+
 # Ownership Transfer Schemas
 class OwnershipTransferCreate(BaseModel):
     recipe_id: int
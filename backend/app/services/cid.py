@@ -0,0 +1,41 @@
+"""
+IPFS CIDv0 ↔ bytes32 변환
+
+RecipeNFTCompact는 토큰마다 CIDv0("Qm...")의 sha2-256 다이제스트 32바이트만 저장하고
+tokenURI를 읽을 때 base58로 다시 만듭니다. CIDv1("bafy...")은 저장할 수 없습니다.
+"""
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+SHA256_MULTIHASH_PREFIX = b"\x12\x20"  # sha2-256, 32바이트
+
+def _b58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, digit = divmod(number, 58)
+        encoded = BASE58_ALPHABET[digit] + encoded
+    return BASE58_ALPHABET[0] * (len(data) - len(data.lstrip(b"\0"))) + encoded
+
+def _b58decode(text: str) -> bytes:
+    number = 0
+    for char in text:
+        digit = BASE58_ALPHABET.find(char)
+        if digit < 0:
+            raise ValueError(f"Invalid base58 character {char!r}")
+        number = number * 58 + digit
+    body = number.to_bytes((number.bit_length() + 7) // 8, "big")
+    return b"\0" * (len(text) - len(text.lstrip(BASE58_ALPHABET[0]))) + body
+
+def cid_to_bytes32(cid: str) -> bytes:
+    """CIDv0 (또는 ipfs://CIDv0)의 다이제스트 32바이트"""
+    if cid.startswith("ipfs://"):
+        cid = cid[len("ipfs://"):]
+    multihash = _b58decode(cid) if cid.startswith("Qm") and len(cid) == 46 else b""
+    if len(multihash) != 34 or not multihash.startswith(SHA256_MULTIHASH_PREFIX):
+        raise ValueError(f"Not a CIDv0 sha2-256 hash: {cid}")
+    return multihash[2:]
+
+def bytes32_to_cid(digest: bytes) -> str:
+    """cid_to_bytes32의 역변환 (RecipeNFTCompact.tokenURI와 같은 결과)"""
+    if len(digest) != 32:
+        raise ValueError("CID digest must be 32 bytes")
+    return _b58encode(SHA256_MULTIHASH_PREFIX + digest)
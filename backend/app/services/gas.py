@@ -0,0 +1,249 @@
+"""
+가스비 오라클 및 트랜잭션 교체(replace-by-fee)
+
+- eth_feeHistory 샘플링으로 EIP-1559 maxFeePerGas/maxPriorityFeePerGas 계산 (블록마다 한 번만 조회)
+- 함수 선택자별 가스 추정치 메모이제이션
+- 영수증이 늦어지는 트랜잭션은 같은 nonce로 수수료를 올려 다시 전송 (영수증 확인은 receipt_watcher)
+"""
+from concurrent.futures import FIRST_COMPLETED, wait
+from statistics import median
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import logging
+import threading
+import time
+from eth_utils import function_abi_to_4byte_selector
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+from app.config import settings
+from app.metrics import TX_REPLACEMENTS
+from app.services.receipts import receipt_watcher
+
+logger = logging.getLogger(__name__)
+
+GWEI = 10 ** 9
+
+class _GasEstimate(NamedTuple):
+    gas: int
+    expires_at: float
+
+class FeeOracle:
+    """블록 단위로 캐시하는 수수료 제안 및 가스 추정 메모이제이션"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fees: Optional[Tuple[int, dict]] = None  # (블록 번호, 트랜잭션 수수료 필드)
+        self._gas_estimates: Dict[str, _GasEstimate] = {}
+
+    def suggest_fees(self, w3: Web3) -> dict:
+        """
+        트랜잭션에 넣을 수수료 필드
+
+        EIP-1559 체인이면 {"maxFeePerGas", "maxPriorityFeePerGas"}, 아니면 {"gasPrice"}.
+        최신 블록이 바뀌지 않았으면 캐시한 값을 그대로 반환합니다.
+        """
+        block_number = w3.eth.block_number
+        with self._lock:
+            if self._fees and self._fees[0] == block_number:
+                return dict(self._fees[1])
+
+        try:
+            history = w3.eth.fee_history(
+                settings.GAS_FEE_HISTORY_BLOCKS, "latest", [settings.GAS_PRIORITY_FEE_PERCENTILE]
+            )
+        except Exception as e:
+            logger.debug("eth_feeHistory unavailable, using legacy gas price: %s", e)
+            history = None
+        fees = self.fees_from_history(block_number, history, lambda: w3.eth.gas_price)
+        logger.debug("Fee suggestion for block %s: %s", block_number, fees)
+        return dict(fees)
+
+    @staticmethod
+    def fee_history_params() -> list:
+        """JSON-RPC 배치에 직접 넣는 eth_feeHistory 인자 (web3처럼 블록 수는 16진수 문자열)"""
+        return [hex(settings.GAS_FEE_HISTORY_BLOCKS), "latest", [settings.GAS_PRIORITY_FEE_PERCENTILE]]
+
+    def fees_from_history(self, block_number: int, history: Optional[dict], gas_price: Callable[[], int]) -> dict:
+        """
+        eth_feeHistory 결과로 수수료를 계산해 block_number 기준으로 캐시
+
+        history가 없거나 기본 수수료가 0이면(EIP-1559 이전 체인) gas_price()를 사용합니다.
+        """
+        fees = self._compute_fees(history) if history else None
+        if fees is None:
+            fees = {"gasPrice": self._cap(gas_price())}
+        with self._lock:
+            self._fees = (block_number, fees)
+        return dict(fees)
+
+    def _compute_fees(self, history: dict) -> Optional[dict]:
+        base_fees: List[int] = history.get("baseFeePerGas") or []
+        if not base_fees or not base_fees[-1]:
+            return None  # EIP-1559 이전 체인
+        # baseFeePerGas의 마지막 값은 다음 블록의 기본 수수료
+        next_base_fee = base_fees[-1]
+        rewards = [reward[0] for reward in history.get("reward") or [] if reward]
+        min_priority_fee = int(settings.GAS_MIN_PRIORITY_FEE_GWEI * GWEI)
+        priority_fee = max(int(median(rewards)) if rewards else 0, min_priority_fee)
+        # 기본 수수료가 몇 블록 연속으로 올라도 포함되도록 여유를 둠
+        max_fee = int(next_base_fee * settings.GAS_BASE_FEE_MULTIPLIER) + priority_fee
+        max_fee = self._cap(max_fee)
+        return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": min(priority_fee, max_fee)}
+
+    def _cap(self, fee: int) -> int:
+        if settings.GAS_MAX_FEE_GWEI is None:
+            return fee
+        cap = int(settings.GAS_MAX_FEE_GWEI * GWEI)
+        if fee > cap:
+            logger.warning("Suggested fee %s gwei exceeds GAS_MAX_FEE_GWEI, capping", fee / GWEI)
+        return min(fee, cap)
+
+    def estimate_gas(self, function, sender: str) -> int:
+        """
+        컨트랙트 함수 호출의 가스 한도 (함수 선택자별로 GAS_ESTIMATE_TTL 동안 재사용)
+
+        추정에 실패하면 이전 추정치를 쓰고, 그것도 없으면 예외를 그대로 올립니다.
+        (추정 실패는 대부분 revert이므로 임의의 한도로 전송하지 않음)
+        """
+        cached = self._cached_gas_estimate(function)
+        if cached and cached.expires_at > time.monotonic():
+            return cached.gas
+
+        try:
+            estimated = function.estimate_gas({"from": sender})
+        except Exception as e:
+            if cached:
+                logger.warning("Gas estimation failed for %s, reusing previous estimate: %s", self.gas_key(function), e)
+                return cached.gas
+            raise
+        return self.remember_gas_estimate(function, estimated)
+
+    def cached_gas_limit(self, function) -> Optional[int]:
+        """만료되지 않은 메모이제이션 가스 한도 (없으면 None, 이때만 eth_estimateGas 필요)"""
+        cached = self._cached_gas_estimate(function)
+        if cached and cached.expires_at > time.monotonic():
+            return cached.gas
+        return None
+
+    def remember_gas_estimate(self, function, estimated: int) -> int:
+        """eth_estimateGas 결과에 여유를 더한 가스 한도를 저장하고 반환"""
+        gas = int(estimated * settings.GAS_LIMIT_MULTIPLIER)
+        key = self.gas_key(function)
+        with self._lock:
+            self._gas_estimates[key] = _GasEstimate(gas, time.monotonic() + settings.GAS_ESTIMATE_TTL)
+        logger.debug("Estimated gas for %s: %s (limit %s)", key, estimated, gas)
+        return gas
+
+    def _cached_gas_estimate(self, function) -> Optional[_GasEstimate]:
+        with self._lock:
+            return self._gas_estimates.get(self.gas_key(function))
+
+    def forget_gas_estimate(self, function) -> None:
+        """가스 부족으로 실패한 경우 다음 호출에서 다시 추정하도록 제거"""
+        with self._lock:
+            self._gas_estimates.pop(self.gas_key(function), None)
+
+    @staticmethod
+    def gas_key(function) -> str:
+        return f"{function.address}:0x{function_abi_to_4byte_selector(function.abi).hex()}"
+
+    def bump_fees(self, w3: Web3, transaction: dict) -> Optional[dict]:
+        """
+        교체 트랜잭션용으로 수수료를 올린 사본 (상한에 걸려 더 올릴 수 없으면 None)
+
+        노드는 기존 수수료보다 10% 이상 높아야 교체를 받아들이므로 TX_REPLACE_BUMP_PERCENT만큼 올리고,
+        그 사이 시세가 더 올랐으면 현재 제안값을 사용합니다.
+        """
+        factor = 100 + settings.TX_REPLACE_BUMP_PERCENT
+        current = self.suggest_fees(w3)
+        bumped = dict(transaction)
+        fields = ("maxFeePerGas", "maxPriorityFeePerGas") if "maxFeePerGas" in transaction else ("gasPrice",)
+        for field in fields:
+            bumped[field] = max(transaction[field] * factor // 100, current.get(field, 0))
+
+        if settings.GAS_MAX_FEE_GWEI is not None:
+            cap = int(settings.GAS_MAX_FEE_GWEI * GWEI)
+            if transaction[fields[0]] >= cap:
+                return None
+            bumped[fields[0]] = min(bumped[fields[0]], cap)
+        if "maxFeePerGas" in bumped:
+            bumped["maxPriorityFeePerGas"] = min(bumped["maxPriorityFeePerGas"], bumped["maxFeePerGas"])
+        return bumped
+
+def wait_for_receipt_with_replacement(
+    w3: Web3,
+    account,
+    transaction: dict,
+    tx_hash,
+    timeout: Optional[float] = None,
+    confirmations: Optional[int] = None,
+    on_replace: Optional[Callable[[str], None]] = None,
+) -> TxReceipt:
+    """
+    영수증 대기, TX_REPLACE_AFTER초마다 수수료를 올린 같은 nonce 트랜잭션으로 교체
+
+    영수증은 공유 receipt_watcher가 블록 단위로 확인하며,
+    교체 전후 어느 트랜잭션이든 먼저 포함된 것의 영수증을 반환합니다.
+    on_replace는 교체 트랜잭션을 서명한 뒤 전송하기 전에 해시와 함께 호출됩니다.
+    """
+    timeout = settings.TX_RECEIPT_TIMEOUT if timeout is None else timeout
+    started = time.monotonic()
+    deadline = started + timeout
+    replace_at = started + settings.TX_REPLACE_AFTER
+    replacements = 0
+    watched = {receipt_watcher.watch(w3, tx_hash, confirmations): tx_hash}
+
+    try:
+        while True:
+            can_replace = settings.TX_REPLACE_AFTER > 0 and replacements < settings.TX_MAX_REPLACEMENTS
+            wake_at = min(deadline, replace_at) if can_replace else deadline
+            done, _ = wait(list(watched), timeout=max(0.0, wake_at - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                if not future.cancelled():
+                    return future.result()
+                # 감시기가 종료(stop)되었거나 감시가 해제되어 취소됨: 다시 기다리면 즉시 반환되므로 제외
+                watched.pop(future)
+            if not watched:
+                # 결과를 알 수 없으므로 시간 초과와 같이 처리 (서명한 시도는 복구 작업이 마무리)
+                raise TimeExhausted(
+                    f"Receipt watcher stopped before transaction {HexBytes(tx_hash).hex()} was confirmed"
+                )
+
+            now = time.monotonic()
+            if now >= deadline:
+                raise TimeExhausted(
+                    f"Transaction {HexBytes(tx_hash).hex()} is not in the chain after {timeout} seconds "
+                    f"({replacements} replacements)"
+                )
+            if not can_replace or now < replace_at:
+                continue
+
+            replace_at = now + settings.TX_REPLACE_AFTER
+            bumped = fee_oracle.bump_fees(w3, transaction)
+            if bumped is None:
+                logger.warning("Transaction %s stuck but fees already at GAS_MAX_FEE_GWEI", HexBytes(tx_hash).hex())
+                replacements = settings.TX_MAX_REPLACEMENTS
+                continue
+            signed = account.sign_transaction(bumped)
+            if on_replace:
+                on_replace(signed.hash.hex())
+            try:
+                tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
+            except ValueError as e:
+                # nonce too low: 이전 트랜잭션이 그 사이 포함됨 → 감시 중인 Future가 완료될 것
+                logger.info("Replacement for nonce %s rejected: %s", transaction["nonce"], e)
+                continue
+            transaction = bumped
+            replacements += 1
+            TX_REPLACEMENTS.inc()
+            watched[receipt_watcher.watch(w3, tx_hash, confirmations)] = tx_hash
+            logger.warning(
+                "Replaced stuck transaction (nonce %s, attempt %s): %s",
+                transaction["nonce"], replacements, HexBytes(tx_hash).hex(),
+            )
+    finally:
+        for watched_hash in watched.values():
+            receipt_watcher.unwatch(watched_hash)
+
+fee_oracle = FeeOracle()
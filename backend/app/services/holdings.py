@@ -0,0 +1,210 @@
+"""
+지갑별 보유 토큰 인덱스
+
+NFT 컨트랙트의 Transfer 이벤트를 블록 순서대로 token_holdings에 반영해
+지갑 페이지(GET /api/users/{wallet}/tokens)가 RPC 없이 DB만으로 응답하도록 합니다.
+- indexer_cursors에 (체인, 컨트랙트)별로 반영을 끝낸 블록을 저장하고 이어서 조회
+- RECEIPT_CONFIRMATIONS 블록 깊이까지만 반영 (재구성된 블록의 이벤트를 남기지 않도록)
+- 토큰마다 마지막으로 반영한 (블록, 로그 인덱스)보다 앞선 이벤트는 무시하므로 다시 반영해도 안전
+- 민팅을 마무리할 때 record_mint로 먼저 기록해 인덱서가 따라오기 전에도 보유 토큰에 보임
+"""
+from typing import Dict, Iterable, List, Mapping, Optional
+import logging
+import threading
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from web3 import Web3
+from app.config import settings
+from app.database import SessionLocal
+from app import models
+from app.services.token_index import normalize_contract_address
+from app.services.transfers import TRANSFER_EVENT_TOPIC, parse_transfer_log
+from app.services.web3 import web3_service
+
+logger = logging.getLogger(__name__)
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+def record_mint(
+    db: Session,
+    chain_id: int,
+    contract_address: str,
+    token_id: int,
+    owner_address: str,
+    recipe_id: int,
+    block_number: Optional[int],
+) -> None:
+    """
+    민팅 직후 보유 토큰 기록 (커밋은 호출자)
+
+    인덱서가 먼저 반영했으면 소유자는 그대로 두고 비어 있는 레시피 연결만 채웁니다
+    (바우처 확인이나 복구로 마무리되는 민팅은 보통 인덱서가 먼저 봄).
+    """
+    holding = db.query(models.TokenHolding).filter(
+        models.TokenHolding.chain_id == chain_id,
+        models.TokenHolding.contract_address == contract_address,
+        models.TokenHolding.token_id == token_id,
+    ).first()
+    if holding:
+        if holding.recipe_id is None:
+            holding.recipe_id = recipe_id
+        return
+    try:
+        with db.begin_nested():
+            db.add(models.TokenHolding(
+                chain_id=chain_id,
+                contract_address=contract_address,
+                token_id=token_id,
+                owner_address=Web3.to_checksum_address(owner_address),
+                recipe_id=recipe_id,
+                block_number=block_number or 0,
+                log_index=-1,  # 같은 블록의 실제 Transfer 이벤트가 항상 덮어씀
+            ))
+    except IntegrityError:
+        pass  # 그 사이 인덱서가 반영함
+
+def apply_transfers(db: Session, chain_id: int, contract_address: str, logs: Iterable[Mapping]) -> int:
+    """
+    Transfer 로그를 보유 토큰 테이블에 반영 (커밋은 호출자) 후 바뀐 토큰 수 반환
+
+    토큰마다 가장 마지막 이벤트만 적용하며, 받는 주소가 0x0(소각)이면 행을 지웁니다.
+    """
+    latest: Dict[int, tuple] = {}
+    for log in logs:
+        transfer = parse_transfer_log(log)
+        if transfer is None:
+            continue
+        position = (log["blockNumber"], log["logIndex"])
+        if transfer.token_id not in latest or latest[transfer.token_id][0] < position:
+            latest[transfer.token_id] = (position, transfer)
+    if not latest:
+        return 0
+
+    token_ids = list(latest)
+    holdings = {
+        holding.token_id: holding
+        for holding in db.query(models.TokenHolding).filter(
+            models.TokenHolding.chain_id == chain_id,
+            models.TokenHolding.contract_address == contract_address,
+            models.TokenHolding.token_id.in_(token_ids),
+        )
+    }
+    recipe_ids = _recipe_ids(db, chain_id, contract_address, token_ids)
+
+    changed = 0
+    for token_id, ((block_number, log_index), transfer) in latest.items():
+        holding = holdings.get(token_id)
+        if holding and (holding.block_number, holding.log_index) >= (block_number, log_index):
+            continue
+        changed += 1
+        if transfer.to_address == ZERO_ADDRESS:
+            if holding:
+                db.delete(holding)
+            continue
+        if holding is None:
+            holding = models.TokenHolding(chain_id=chain_id, contract_address=contract_address, token_id=token_id)
+            db.add(holding)
+        holding.owner_address = transfer.to_address
+        holding.block_number = block_number
+        holding.log_index = log_index
+        if holding.recipe_id is None:
+            holding.recipe_id = recipe_ids.get(token_id)
+    return changed
+
+def _recipe_ids(db: Session, chain_id: int, contract_address: str, token_ids: List[int]) -> Dict[int, int]:
+    """토큰 ID별 레시피 ID (chain_id가 비어 있는 이전 레시피와 소문자 주소도 포함)"""
+    rows = db.query(models.Recipe.id, models.Recipe.token_id, models.Recipe.chain_id).filter(
+        models.Recipe.contract_address.in_([contract_address, contract_address.lower()]),
+        models.Recipe.token_id.in_(token_ids),
+    ).all()
+    recipe_ids: Dict[int, int] = {}
+    for recipe_id, token_id, recipe_chain_id in rows:
+        if recipe_chain_id == chain_id or (recipe_chain_id is None and token_id not in recipe_ids):
+            recipe_ids[token_id] = recipe_id
+    return recipe_ids
+
+class HoldingsIndexer:
+    """NFT_CONTRACT_ADDRESS의 Transfer 이벤트를 따라가며 token_holdings 갱신"""
+
+    def __init__(self):
+        self.last_report: Optional[dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def sync(self) -> Optional[dict]:
+        """확인된 블록까지 따라잡고 처리 결과 반환 (체인/컨트랙트가 설정되지 않았으면 None)"""
+        w3 = web3_service.w3
+        chain_id = web3_service.chain_id()
+        if w3 is None or chain_id is None or not settings.NFT_CONTRACT_ADDRESS:
+            return None
+        contract_address = normalize_contract_address(settings.NFT_CONTRACT_ADDRESS)
+        safe_head = w3.eth.block_number - max(1, settings.RECEIPT_CONFIRMATIONS) + 1
+
+        report = {"from_block": None, "to_block": None, "logs": 0, "changed": 0}
+        db = SessionLocal()
+        try:
+            cursor = self._cursor(db, chain_id, contract_address)
+            report["from_block"] = cursor.block_number + 1
+            while cursor.block_number < safe_head and not self._stop.is_set():
+                from_block = cursor.block_number + 1
+                to_block = min(safe_head, from_block + settings.HOLDINGS_MAX_BLOCK_RANGE - 1)
+                logs = w3.eth.get_logs({
+                    "address": contract_address,
+                    "topics": ["0x" + TRANSFER_EVENT_TOPIC.hex()],
+                    "fromBlock": from_block,
+                    "toBlock": to_block,
+                })
+                report["logs"] += len(logs)
+                report["changed"] += apply_transfers(db, chain_id, contract_address, logs)
+                # 보유 토큰과 커서를 한 트랜잭션으로 저장 (중단되면 이 구간부터 다시 반영)
+                cursor.block_number = to_block
+                db.commit()
+            report["to_block"] = cursor.block_number
+        finally:
+            db.close()
+
+        self.last_report = report
+        if report["logs"]:
+            logger.info(
+                "Holdings indexed blocks %s-%s: %s transfers, %s tokens changed",
+                report["from_block"], report["to_block"], report["logs"], report["changed"],
+            )
+        return report
+
+    @staticmethod
+    def _cursor(db: Session, chain_id: int, contract_address: str) -> models.IndexerCursor:
+        cursor = db.query(models.IndexerCursor).filter(
+            models.IndexerCursor.chain_id == chain_id,
+            models.IndexerCursor.contract_address == contract_address,
+        ).first()
+        if cursor is None:
+            cursor = models.IndexerCursor(
+                chain_id=chain_id, contract_address=contract_address, block_number=settings.HOLDINGS_START_BLOCK - 1
+            )
+            db.add(cursor)
+            db.commit()
+        return cursor
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning("Holdings indexer error: %s", e)
+            self._stop.wait(settings.HOLDINGS_INDEX_INTERVAL)
+
+    def start(self):
+        """HOLDINGS_INDEX_INTERVAL > 0이면 주기적으로 인덱싱"""
+        if settings.HOLDINGS_INDEX_INTERVAL <= 0 or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="holdings-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+holdings_indexer = HoldingsIndexer()
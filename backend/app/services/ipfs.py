@@ -1,32 +1,93 @@
-from typing import Optional
+from datetime import datetime
+from typing import Dict, Optional
 import ipfshttpclient
 import requests
+import io
 import json
+import logging
+import os
+import threading
+import uuid
 from app.config import settings
+from app.metrics import observe_ipfs
+
+logger = logging.getLogger(__name__)
+
+class _MultipartFileBody:
+    """
+    multipart 앞부분 + 파일 + 끝 경계를 차례로 읽어 주는 본문
+
+    길이(len)를 알려 주므로 requests가 Content-Length로 고정 길이 전송하며
+    (chunked 아님), 파일은 전송하면서 조금씩 읽어 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self, head: bytes, file_path: str, tail: bytes):
+        self.len = len(head) + os.path.getsize(file_path) + len(tail)
+        self._parts = [io.BytesIO(head), open(file_path, "rb"), io.BytesIO(tail)]
+
+    def __len__(self) -> int:
+        return self.len
+
+    def __iter__(self):
+        return iter(lambda: self.read(1024 * 1024), b"")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read(self, size: int = -1) -> bytes:
+        while self._parts:
+            chunk = self._parts[0].read(size)
+            if chunk:
+                return chunk
+            self._parts.pop(0).close()
+        return b""
+
+    def close(self):
+        for part in self._parts:
+            part.close()
+        self._parts = []
 
 class IPFSService:
     def __init__(self):
-        self.client = None
+        # 로컬 노드 연결은 import 시점이 아니라 서버 시작(lifespan) 또는 처음 사용할 때 한 번 시도
+        self._client = None
+        self._connected = False
+        self._connect_lock = threading.Lock()
         self.use_pinata = bool(settings.PINATA_API_KEY and settings.PINATA_SECRET_KEY)
-        self._connect()
+    
+    @property
+    def client(self):
+        if not self._connected:
+            self.connect()
+        return self._client
+    
+    def connect(self) -> bool:
+        """IPFS 연결 (한 번만 시도) 후 사용 가능 여부 반환"""
+        with self._connect_lock:
+            if not self._connected:
+                self._connect()
+                self._connected = True
+        return self.is_available()
     
     def _connect(self):
         """IPFS 클라이언트 연결"""
         if self.use_pinata:
             # Pinata 사용 - 로컬 노드 연결 불필요
-            print("✅ Using Pinata for IPFS (no local node required)")
+            logger.info("Using Pinata for IPFS (no local node required)")
             return
         
         # Pinata 키가 없을 때만 로컬 IPFS 노드 연결 시도
         try:
-            self.client = ipfshttpclient.connect(
+            self._client = ipfshttpclient.connect(
                 f"/ip4/{settings.IPFS_HOST}/tcp/{settings.IPFS_PORT}/http"
             )
-            print(f"✅ Connected to local IPFS node at {settings.IPFS_HOST}:{settings.IPFS_PORT}")
+            logger.info("Connected to local IPFS node at %s:%s", settings.IPFS_HOST, settings.IPFS_PORT)
         except Exception as e:
-            print(f"⚠️ IPFS connection error (non-critical): {e}")
-            print("⚠️ IPFS features will be limited. Consider using Pinata for production.")
-            self.client = None
+            logger.warning("IPFS connection error (non-critical, IPFS features will be limited; consider Pinata for production): %s", e)
+            self._client = None
     
     def _upload_to_pinata(self, data, is_json: bool = True, filename: str = None) -> Optional[str]:
         """Pinata에 파일/JSON 업로드"""
@@ -42,6 +103,10 @@ class IPFSService:
                     "pinataContent": data,
                     "pinataMetadata": {
                         "name": "recipe-nft-metadata"
+                    },
+                    # RecipeNFTCompact는 CIDv0 다이제스트만 저장하므로 메타데이터는 항상 CIDv0로 고정
+                    "pinataOptions": {
+                        "cidVersion": 0
                     }
                 }
                 response = requests.post(url, json=payload, headers=headers, timeout=30)
@@ -54,25 +119,50 @@ class IPFSService:
                 result = response.json()
                 return result.get("IpfsHash")
             else:
-                print(f"Pinata upload error: {response.status_code} - {response.text}")
+                logger.warning("Pinata upload error: %s - %s", response.status_code, response.text)
                 return None
         except Exception as e:
-            print(f"Pinata upload error: {e}")
+            logger.warning("Pinata upload error: %s", e)
             return None
     
+    def _upload_file_to_pinata(self, file_path: str) -> Optional[str]:
+        """
+        Pinata에 파일 업로드 (multipart 본문을 파일에서 바로 흘려보내 메모리에 올리지 않음)
+        """
+        filename = os.path.basename(file_path).replace('"', "")
+        boundary = uuid.uuid4().hex
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        tail = f"\r\n--{boundary}--\r\n".encode()
+
+        headers = {
+            **self._pinata_headers(),
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        }
+        try:
+            with _MultipartFileBody(head, file_path, tail) as body:
+                response = requests.post(
+                    "https://api.pinata.cloud/pinning/pinFileToIPFS",
+                    data=body,
+                    headers=headers,
+                    timeout=(10, 300),
+                )
+            if response.status_code == 200:
+                return response.json().get("IpfsHash")
+            logger.warning("Pinata upload error: %s - %s", response.status_code, response.text)
+            return None
+        except Exception as e:
+            logger.warning("Pinata file upload error: %s", e)
+            return None
+
+    @observe_ipfs("upload_file")
     def upload_file(self, file_path: str) -> Optional[str]:
         """파일을 IPFS에 업로드하고 해시 반환"""
         if self.use_pinata:
-            # Pinata 파일 업로드
-            try:
-                import os
-                filename = os.path.basename(file_path)
-                with open(file_path, 'rb') as f:
-                    file_data = f.read()
-                    return self._upload_to_pinata(file_data, is_json=False, filename=filename)
-            except Exception as e:
-                print(f"Pinata file upload error: {e}")
-                return None
+            return self._upload_file_to_pinata(file_path)
         
         if not self.client:
             return None
@@ -81,9 +171,10 @@ class IPFSService:
             result = self.client.add(file_path)
             return result["Hash"]
         except Exception as e:
-            print(f"IPFS upload error: {e}")
+            logger.warning("IPFS upload error: %s", e)
             return None
     
+    @observe_ipfs("upload_json")
     def upload_json(self, data: dict) -> Optional[str]:
         """JSON 데이터를 IPFS에 업로드하고 해시 반환"""
         if self.use_pinata:
@@ -100,14 +191,15 @@ class IPFSService:
                 json.dump(data, f)
                 temp_path = f.name
             
-            result = self.client.add(temp_path)
+            result = self.client.add(temp_path, cid_version=0)  # RecipeNFTCompact 호환 (CIDv0)
             import os
             os.unlink(temp_path)
             return result["Hash"]
         except Exception as e:
-            print(f"IPFS JSON upload error: {e}")
+            logger.warning("IPFS JSON upload error: %s", e)
             return None
     
+    @observe_ipfs("get_file")
     def get_file(self, ipfs_hash: str) -> Optional[bytes]:
         """IPFS에서 파일 다운로드"""
         if not self.client:
@@ -116,7 +208,119 @@ class IPFSService:
         try:
             return self.client.cat(ipfs_hash)
         except Exception as e:
-            print(f"IPFS get error: {e}")
+            logger.warning("IPFS get error: %s", e)
+            return None
+
+    def _pinata_headers(self) -> dict:
+        return {
+            "pinata_api_key": settings.PINATA_API_KEY,
+            "pinata_secret_api_key": settings.PINATA_SECRET_KEY,
+        }
+
+    def is_available(self) -> bool:
+        """핀 관리에 쓸 백엔드(Pinata 또는 로컬 노드)가 있는지 여부"""
+        return self.use_pinata or self.client is not None
+
+    @observe_ipfs("pin")
+    def pin_hash(self, ipfs_hash: str) -> bool:
+        """이미 네트워크에 있는 CID를 고정(pin)"""
+        if self.use_pinata:
+            try:
+                response = requests.post(
+                    "https://api.pinata.cloud/pinning/pinByHash",
+                    json={"hashToPin": ipfs_hash},
+                    headers=self._pinata_headers(),
+                    timeout=30,
+                )
+                if response.status_code == 200:
+                    return True
+                logger.warning("Pinata pin error: %s - %s", response.status_code, response.text)
+                return False
+            except Exception as e:
+                logger.warning("Pinata pin error: %s", e)
+                return False
+
+        if not self.client:
+            return False
+
+        try:
+            self.client.pin.add(ipfs_hash)
+            return True
+        except Exception as e:
+            logger.warning("IPFS pin error: %s", e)
+            return False
+
+    @observe_ipfs("unpin")
+    def unpin(self, ipfs_hash: str) -> bool:
+        """CID 고정 해제"""
+        if self.use_pinata:
+            try:
+                response = requests.delete(
+                    f"https://api.pinata.cloud/pinning/unpin/{ipfs_hash}",
+                    headers=self._pinata_headers(),
+                    timeout=30,
+                )
+                if response.status_code == 200:
+                    return True
+                logger.warning("Pinata unpin error: %s - %s", response.status_code, response.text)
+                return False
+            except Exception as e:
+                logger.warning("Pinata unpin error: %s", e)
+                return False
+
+        if not self.client:
+            return False
+
+        try:
+            self.client.pin.rm(ipfs_hash)
+            return True
+        except Exception as e:
+            logger.warning("IPFS unpin error: %s", e)
+            return False
+
+    @observe_ipfs("list_pins")
+    def list_pins(self) -> Optional[Dict[str, Optional[datetime]]]:
+        """
+        고정된 CID 목록 {CID: 고정 시각} 조회 (조회 실패 시 None)
+
+        로컬 노드는 고정 시각을 알려주지 않으므로 값이 None입니다.
+        """
+        if self.use_pinata:
+            pins: Dict[str, Optional[datetime]] = {}
+            page_limit = 1000
+            offset = 0
+            try:
+                while True:
+                    response = requests.get(
+                        "https://api.pinata.cloud/data/pinList",
+                        params={"status": "pinned", "pageLimit": page_limit, "pageOffset": offset},
+                        headers=self._pinata_headers(),
+                        timeout=30,
+                    )
+                    if response.status_code != 200:
+                        logger.warning("Pinata pin list error: %s - %s", response.status_code, response.text)
+                        return None
+                    rows = response.json().get("rows", [])
+                    for row in rows:
+                        pinned_at = row.get("date_pinned")
+                        pins[row["ipfs_pin_hash"]] = (
+                            datetime.fromisoformat(pinned_at.replace("Z", "+00:00")) if pinned_at else None
+                        )
+                    if len(rows) < page_limit:
+                        return pins
+                    offset += page_limit
+            except Exception as e:
+                logger.warning("Pinata pin list error: %s", e)
+                return None
+
+        if not self.client:
+            return None
+
+        try:
+            keys = self.client.pin.ls(type="recursive").get("Keys", {})
+            return {cid: None for cid in keys}
+        except Exception as e:
+            logger.warning("IPFS pin list error: %s", e)
             return None
 
 ipfs_service = IPFSService()
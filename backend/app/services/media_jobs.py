@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+import logging
+import threading
+from sqlalchemy import and_, case, or_, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app import models
+from app.services.renditions import rendition_service
+from app.services.video import video_service
+from app.services.pinning import media_pinner
+
+logger = logging.getLogger(__name__)
+
+class MediaJobWorker:
+    """
+    DB에 저장된 미디어 작업(media_jobs)을 처리하는 백그라운드 워커
+
+    작업 행은 업로드와 같은 트랜잭션에서 만들어지므로 프로세스가 재시작되어도 사라지지 않습니다.
+    실행 중인 작업은 locked_until까지 임대되며, 임대가 끝난 작업은 다른 워커가 다시 가져갑니다.
+    처리하는 동안에는 임대 시간의 1/3마다 locked_until을 연장하고, 결과는 이 워커가 아직 작업을
+    가지고 있을 때(같은 시도 번호로 running)만 기록합니다.
+    실패한 작업은 run_after까지 지수 백오프로 기다렸다가 재시도합니다.
+    처리 중 워커가 죽어(OOM, 디코더 크래시 등) 임대가 만료된 작업도 시도 횟수에 포함되어
+    최대 시도 횟수에 이르면 다시 가져가지 않고 failed로 표시합니다.
+    동시에 실행되는 작업 수는 MEDIA_WORKERS로 제한됩니다.
+    """
+
+    def __init__(self):
+        self.handlers: Dict[str, Callable[[int], object]] = {
+            "photo_renditions": rendition_service.generate,
+            "video_processing": video_service.process,
+            "ipfs_pin": media_pinner.pin,
+        }
+        # 작업 종류별 최대 시도 횟수 (없으면 MEDIA_JOB_MAX_ATTEMPTS)
+        self.max_attempts: Dict[str, int] = {
+            "ipfs_pin": settings.IPFS_PIN_MAX_ATTEMPTS,
+        }
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._wakeup = threading.Event()
+
+    def enqueue(self, db: Session, media: models.RecipeMedia, kind: str) -> models.MediaJob:
+        """작업 추가 (커밋은 호출자가 미디어 행과 함께 수행)"""
+        job = models.MediaJob(media=media, kind=kind, status="pending", attempts=0)
+        db.add(job)
+        return job
+
+    def wake(self):
+        """대기 중인 워커를 즉시 깨움 (커밋 이후 호출)"""
+        self._wakeup.set()
+
+    def _attempt_limit(self):
+        """작업 종류별 최대 시도 횟수 SQL 식"""
+        return case(self.max_attempts, value=models.MediaJob.kind, else_=settings.MEDIA_JOB_MAX_ATTEMPTS)
+
+    def _fail_exhausted(self, db: Session, now: datetime):
+        """임대가 만료됐고 시도 횟수를 다 쓴 작업을 failed로 표시 (워커를 죽이는 작업을 반복하지 않도록)"""
+        result = db.execute(
+            update(models.MediaJob)
+            .where(
+                models.MediaJob.status == "running",
+                models.MediaJob.locked_until < now,
+                models.MediaJob.attempts >= self._attempt_limit(),
+            )
+            .values(status="failed", locked_until=None, error="Lease expired after the last attempt (worker crashed?)")
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount:
+            logger.warning("Marked %s media jobs failed after their lease expired on the last attempt", result.rowcount)
+
+    def _claim(self, db: Session) -> Optional[models.MediaJob]:
+        """대기 중이거나 임대가 만료된 작업 하나를 가져옴 (다른 레플리카와 경합 시 SKIP LOCKED)"""
+        now = datetime.now(timezone.utc)
+        self._fail_exhausted(db, now)
+        job = db.query(models.MediaJob).filter(
+            or_(
+                and_(
+                    models.MediaJob.status == "pending",
+                    or_(models.MediaJob.run_after.is_(None), models.MediaJob.run_after <= now),
+                ),
+                and_(
+                    models.MediaJob.status == "running",
+                    models.MediaJob.locked_until < now,
+                    models.MediaJob.attempts < self._attempt_limit(),
+                ),
+            )
+        ).order_by(models.MediaJob.id).with_for_update(skip_locked=True).first()
+        if not job:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.attempts += 1
+        job.locked_until = now + timedelta(seconds=settings.MEDIA_JOB_LEASE_SECONDS)
+        db.commit()
+        return job
+
+    def _backoff(self, attempts: int) -> timedelta:
+        """실패 횟수에 따른 재시도 대기 시간"""
+        seconds = settings.MEDIA_JOB_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+        return timedelta(seconds=min(seconds, settings.MEDIA_JOB_BACKOFF_MAX_SECONDS))
+
+    @staticmethod
+    def _update_owned(db: Session, job_id: int, attempts: int, **values) -> bool:
+        """이 워커가 가져간 시도(같은 시도 번호로 running)일 때만 작업 행을 갱신"""
+        result = db.execute(
+            update(models.MediaJob)
+            .where(
+                models.MediaJob.id == job_id,
+                models.MediaJob.status == "running",
+                models.MediaJob.attempts == attempts,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def _heartbeat(self, job_id: int, attempts: int, done: threading.Event):
+        """작업이 끝날 때까지 임대 연장 (긴 변환 중에 다른 워커가 같은 작업을 가져가지 않도록)"""
+        interval = max(settings.MEDIA_JOB_LEASE_SECONDS / 3, 1)
+        while not done.wait(interval):
+            db = SessionLocal()
+            try:
+                locked_until = datetime.now(timezone.utc) + timedelta(seconds=settings.MEDIA_JOB_LEASE_SECONDS)
+                if not self._update_owned(db, job_id, attempts, locked_until=locked_until):
+                    logger.warning("Media job %s lease was lost while running", job_id)
+                    return
+            except Exception as e:
+                logger.warning("Media job %s lease renewal failed: %s", job_id, e)
+            finally:
+                db.close()
+
+    def run_once(self) -> bool:
+        """작업 하나를 처리. 처리할 작업이 없으면 False"""
+        db = SessionLocal()
+        try:
+            job = self._claim(db)
+            if not job:
+                return False
+            job_id, kind, attempts = job.id, job.kind, job.attempts
+
+            done = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat, args=(job_id, attempts, done), name=f"media-job-{job_id}-lease", daemon=True
+            )
+            heartbeat.start()
+            handler = self.handlers.get(kind)
+            try:
+                if handler is None:
+                    raise ValueError(f"Unknown media job kind: {kind}")
+                handler(job.media_id)
+            except Exception as e:
+                logger.warning("Media job %s (%s) failed (attempt %s): %s", job_id, kind, attempts, e)
+                values = {"error": str(e)[:2000]}
+                max_attempts = self.max_attempts.get(kind, settings.MEDIA_JOB_MAX_ATTEMPTS)
+                if attempts >= max_attempts:
+                    values["status"] = "failed"
+                else:
+                    values["status"] = "pending"
+                    values["run_after"] = datetime.now(timezone.utc) + self._backoff(attempts)
+            else:
+                values = {"status": "done", "error": None, "run_after": None}
+            finally:
+                done.set()
+                heartbeat.join()
+            if not self._update_owned(db, job_id, attempts, locked_until=None, **values):
+                # 임대를 잃은 사이 다른 워커가 가져갔으므로 그 워커의 상태를 덮어쓰지 않음
+                logger.warning("Media job %s (%s) lease was lost; result discarded", job_id, kind)
+            return True
+        finally:
+            db.close()
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+            except Exception as e:
+                logger.exception("Media job worker error: %s", e)
+            self._wakeup.wait(settings.MEDIA_JOB_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def start(self):
+        """워커 스레드 시작"""
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(settings.MEDIA_WORKERS):
+            thread = threading.Thread(target=self._loop, name=f"media-job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """워커 스레드 종료 (실행 중인 작업은 임대 만료 후 재시도됨)"""
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+media_job_worker = MediaJobWorker()
@@ -0,0 +1,31 @@
+from app import models
+
+def create_recipe_metadata(recipe: models.Recipe, image: str = "") -> dict:
+    """레시피를 NFT 메타데이터 형식으로 변환"""
+    # ERC-721 Metadata 표준 형식
+    metadata = {
+        "name": recipe.recipe_name,
+        "description": f"Recipe NFT: {recipe.recipe_name}",
+        "image": image,  # 대표 이미지 URI (ipfs://...)
+        "attributes": [
+            {
+                "trait_type": "Ingredients Count",
+                "value": len(recipe.ingredients)
+            },
+            {
+                "trait_type": "Cooking Steps",
+                "value": len(recipe.cooking_steps)
+            },
+            {
+                "trait_type": "Tools Count",
+                "value": len(recipe.cooking_tools)
+            }
+        ],
+        "properties": {
+            "ingredients": recipe.ingredients,
+            "cooking_tools": recipe.cooking_tools,
+            "cooking_steps": recipe.cooking_steps,
+            "machine_instructions": recipe.machine_instructions or []
+        }
+    }
+    return metadata
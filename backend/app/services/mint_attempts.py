@@ -0,0 +1,405 @@
+"""
+민팅 시도 기록(mint_attempts)과 복구
+
+민팅은 메타데이터 생성 → IPFS 고정 → 서명 → 전송 → 영수증 확인 → 레시피 반영 순서로 진행되며,
+각 단계는 다음 단계를 시작하기 전에 커밋합니다. 서명한 트랜잭션의 nonce와 해시는 전송 전에 남기므로
+전송 직후 프로세스가 죽어도 복구 작업이 체인의 영수증을 찾아 레시피에 반영합니다.
+
+레시피는 조건부 UPDATE로 점유(Recipe.mint_state = "minting")한 요청만 민팅하며,
+시도가 실패하거나 레시피에 반영될 때 점유를 풉니다. 서명 후 중단된 시도는 복구 작업이 끝낼 때까지 점유가 유지됩니다.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import logging
+import threading
+import time
+from sqlalchemy.orm import Session, object_session
+from app.config import settings
+from app.database import SessionLocal
+from app import models
+from app.services.rpc import batch_request, format_receipt
+from app.services.holdings import record_mint
+from app.services.signers import signer_pool
+from app.services.token_index import normalize_contract_address
+from app.services.transfers import find_mint_transfer
+from app.services.web3 import web3_service
+
+logger = logging.getLogger(__name__)
+
+# 아직 끝나지 않은 상태
+IN_FLIGHT_STATUSES = ("metadata_built", "pinned", "signed", "broadcast", "confirmed")
+# 서명한 트랜잭션이 체인에 포함됐을 수 있는 상태 (점유를 풀지 않음)
+ON_CHAIN_STATUSES = ("signed", "broadcast", "confirmed")
+
+def claim_recipe(db: Session, recipe_id: int) -> bool:
+    """
+    민팅할 레시피 점유 (이미 민팅됐거나 다른 요청이 점유 중이면 False)
+
+    조건부 UPDATE 한 번으로 판단하므로 동시 요청 중 하나만 성공하며, 바로 커밋해 행 잠금을 오래 잡지 않습니다.
+    """
+    claimed = db.query(models.Recipe).filter(
+        models.Recipe.id == recipe_id,
+        models.Recipe.is_minted.is_(False),
+        models.Recipe.mint_state.is_(None),
+    ).update(
+        {models.Recipe.mint_state: "minting", models.Recipe.mint_claimed_at: datetime.now(timezone.utc)},
+        synchronize_session=False,
+    )
+    db.commit()
+    return claimed == 1
+
+def release_recipe(db: Session, recipe_id: int) -> None:
+    """점유 해제 (커밋은 호출자가 수행)"""
+    db.query(models.Recipe).filter(models.Recipe.id == recipe_id).update(
+        {models.Recipe.mint_state: None, models.Recipe.mint_claimed_at: None},
+        synchronize_session=False,
+    )
+
+def finalize_attempt(attempt: models.MintAttempt) -> models.Recipe:
+    """
+    확인된 시도를 레시피에 반영 (커밋은 호출자가 수행해 두 행이 함께 바뀌도록 함)
+
+    레시피가 이미 다른 토큰으로 민팅되어 있으면 이 시도의 토큰은 고아 토큰으로 기록합니다.
+    """
+    recipe = attempt.recipe
+    recipe.mint_state = None
+    recipe.mint_claimed_at = None
+    if recipe.is_minted and recipe.token_id is not None and recipe.token_id != attempt.token_id:
+        attempt.status = "orphaned"
+        attempt.error = f"Recipe already minted as token {recipe.token_id}"
+        logger.error(
+            "Orphaned token %s from mint attempt %s (recipe %s is token %s)",
+            attempt.token_id, attempt.id, recipe.id, recipe.token_id,
+        )
+        return recipe
+
+    recipe.ipfs_hash = attempt.ipfs_hash
+    recipe.token_metadata = attempt.token_metadata
+    recipe.token_id = attempt.token_id
+    # 토큰 조회는 (체인 ID, 체크섬 주소, 토큰 ID) 기준
+    recipe.contract_address = (
+        normalize_contract_address(attempt.contract_address) if attempt.contract_address else None
+    )
+    recipe.chain_id = web3_service.chain_id() if attempt.contract_address else None
+    recipe.transaction_hash = attempt.transaction_hash  # None일 수 있음 (모의 민팅 시)
+    recipe.is_minted = True
+    if recipe.chain_id is not None and recipe.contract_address and attempt.token_id is not None:
+        # 인덱서가 Transfer 이벤트를 따라오기 전에도 지갑의 보유 토큰에 보이도록
+        record_mint(
+            object_session(attempt), recipe.chain_id, recipe.contract_address, attempt.token_id,
+            attempt.to_address, recipe.id, attempt.block_number,
+        )
+    attempt.status = "finalized"
+    attempt.error = None
+    return recipe
+
+def issued_voucher(db: Session, recipe_id: int) -> Optional[models.MintAttempt]:
+    """레시피에 발급된 (아직 레시피에 반영되지 않은) 바우처"""
+    return db.query(models.MintAttempt).filter(
+        models.MintAttempt.recipe_id == recipe_id,
+        models.MintAttempt.status == "voucher_issued",
+    ).order_by(models.MintAttempt.id.desc()).first()
+
+def voucher_expired(attempt: models.MintAttempt) -> bool:
+    """바우처 만료 후 MINT_RECOVERY_GRACE가 지났는지 (만료 직전에 보낸 redeem이 블록에 포함될 시간을 둠)"""
+    if attempt.voucher_deadline is None:
+        return False  # 만료 시각 없이 서명한 이전 바우처
+    return time.time() > attempt.voucher_deadline + settings.MINT_RECOVERY_GRACE
+
+def release_expired_voucher(attempt: models.MintAttempt) -> bool:
+    """
+    만료된 바우처 정리
+
+    체인에서 redeem되지 않은 것을 확인한 뒤에만 시도를 expired로 바꾸고 레시피 점유를 해제합니다
+    (이미 redeem됐으면 /voucher/{recipe_id}/confirm으로 반영해야 하므로 그대로 둠).
+    """
+    if web3_service.is_voucher_redeemed(attempt.contract_address, attempt.recipe_id):
+        return False
+    attempt.status = "expired"
+    attempt.error = f"Voucher expired at {attempt.voucher_deadline} without being redeemed"
+    attempt.recipe.mint_state = None
+    attempt.recipe.mint_claimed_at = None
+    return True
+
+def _fail(attempt: models.MintAttempt, error: str) -> None:
+    attempt.status = "failed"
+    attempt.error = error
+    attempt.recipe.mint_state = None
+    attempt.recipe.mint_claimed_at = None
+
+class MintJournal:
+    """
+    한 민팅 시도의 단계 기록
+
+    요청 세션과 별도의 세션으로 단계마다 즉시 커밋합니다 (요청이 중간에 실패해도 기록이 남음).
+    """
+
+    def __init__(self, attempt_id: int, recipe_id: int):
+        self.attempt_id = attempt_id
+        self.recipe_id = recipe_id
+        self.status = "metadata_built"
+        self._hashes: list = []
+
+    @classmethod
+    def start(cls, recipe_id: int, to_address: str, contract_address: Optional[str], metadata: dict) -> "MintJournal":
+        db = SessionLocal()
+        try:
+            attempt = models.MintAttempt(
+                recipe_id=recipe_id,
+                status="metadata_built",
+                to_address=to_address,
+                contract_address=contract_address,
+                token_metadata=metadata,
+            )
+            db.add(attempt)
+            db.commit()
+            return cls(attempt.id, recipe_id)
+        finally:
+            db.close()
+
+    def _update(self, release: bool = False, **fields) -> None:
+        if "status" in fields:
+            self.status = fields["status"]
+        db = SessionLocal()
+        try:
+            db.query(models.MintAttempt).filter(models.MintAttempt.id == self.attempt_id).update(fields)
+            if release:
+                release_recipe(db, self.recipe_id)
+            db.commit()
+        finally:
+            db.close()
+
+    def pinned(self, ipfs_hash: str) -> None:
+        self._update(status="pinned", ipfs_hash=ipfs_hash)
+
+    def signed(self, nonce: int, tx_hash: str, signer_address: Optional[str] = None) -> None:
+        """전송 전에 호출 (이 기록이 커밋된 뒤에만 트랜잭션을 보냄)"""
+        self._hashes = [tx_hash]
+        self._update(
+            status="signed", nonce=nonce, signer_address=signer_address,
+            transaction_hash=tx_hash, transaction_hashes=list(self._hashes),
+        )
+
+    def broadcast(self) -> None:
+        self._update(status="broadcast")
+
+    def replaced(self, tx_hash: str) -> None:
+        """같은 nonce의 교체 트랜잭션 (역시 전송 전에 호출)"""
+        self._hashes.append(tx_hash)
+        self._update(transaction_hash=tx_hash, transaction_hashes=list(self._hashes))
+
+    def confirmed(self, token_id: int, tx_hash: str, block_number: int) -> None:
+        self._update(status="confirmed", token_id=token_id, transaction_hash=tx_hash, block_number=block_number)
+
+    def voucher_issued(self, signature: str, deadline: int) -> None:
+        """
+        지연 민팅 바우처 발급 (레시피는 redeem 확인 또는 만료 전까지 voucher 상태로 점유)
+
+        바우처는 체인에서 레시피당 한 번만 쓸 수 있으므로 서명 후 복구 대상이 아니며,
+        만료된 뒤에는 복구 작업이 redeem 여부를 확인하고 점유를 해제합니다.
+        """
+        self.status = "voucher_issued"
+        db = SessionLocal()
+        try:
+            db.query(models.MintAttempt).filter(models.MintAttempt.id == self.attempt_id).update(
+                {"status": "voucher_issued", "voucher_signature": signature, "voucher_deadline": deadline}
+            )
+            db.query(models.Recipe).filter(models.Recipe.id == self.recipe_id).update(
+                {models.Recipe.mint_state: "voucher"}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def failed(self, error: str) -> None:
+        """체인에 포함되지 않은 것이 확실한 실패 (레시피 점유도 해제)"""
+        self._update(release=True, status="failed", error=error[:2000])
+
+    def interrupted(self, error: str) -> None:
+        """
+        민팅 중 예외 처리
+
+        서명 전이면 실패로 끝내고, 서명 후면 트랜잭션이 체인에 포함됐을 수 있으므로
+        오류만 남기고 복구 작업에 맡깁니다.
+        """
+        if self.status in ("metadata_built", "pinned"):
+            self.failed(error)
+        elif self.status in ON_CHAIN_STATUSES:
+            self._update(error=error[:2000])
+
+class MintRecovery:
+    """
+    끝나지 않은 민팅 시도를 체인 상태와 맞추는 작업
+
+    MINT_RECOVERY_GRACE초 동안 갱신되지 않은 시도만 처리합니다 (다른 워커에서 진행 중인 민팅 제외).
+    - 서명 전: 실패 처리 (체인에 아무것도 없음)
+    - 서명 후: 서명한 모든 해시의 영수증을 배치로 조회해 포함됐으면 토큰 ID를 레시피에 반영,
+      포함되지 않았는데 계정 nonce가 이미 지나갔거나 노드가 서명한 해시를 하나도 모르면 실패 처리,
+      아니면 다음 검사까지 대기
+    - 시도 기록 없이 남은 레시피 점유(시도를 만들기 전에 중단)는 해제
+    - 만료 후 MINT_RECOVERY_GRACE가 지난 바우처는 체인에서 redeem되지 않았으면 expired로 바꾸고 점유 해제
+    """
+
+    def __init__(self):
+        self.last_report: Optional[dict] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def sweep(self) -> dict:
+        """검사 1회 실행 후 상태별 처리 건수 반환"""
+        report = {"checked": 0, "finalized": 0, "failed": 0, "orphaned": 0, "pending": 0, "released_claims": 0,
+                  "expired_vouchers": 0}
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.MINT_RECOVERY_GRACE)
+        db = SessionLocal()
+        try:
+            attempts = db.query(models.MintAttempt).filter(
+                models.MintAttempt.status.in_(IN_FLIGHT_STATUSES),
+                models.MintAttempt.updated_at < cutoff,
+            ).order_by(models.MintAttempt.id).limit(settings.MINT_RECOVERY_BATCH_SIZE).all()
+            for attempt in attempts:
+                report["checked"] += 1
+                try:
+                    self._reconcile(attempt)
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.warning("Mint attempt %s recovery failed: %s", attempt.id, e)
+                    report["pending"] += 1
+                    continue
+                report[attempt.status if attempt.status in report else "pending"] += 1
+            report["released_claims"] = self._release_stale_claims(db, cutoff)
+            report["expired_vouchers"] = self._expire_vouchers(db)
+        finally:
+            db.close()
+
+        self.last_report = report
+        if report["checked"] or report["released_claims"] or report["expired_vouchers"]:
+            logger.info(
+                "Mint recovery: %s checked, %s finalized, %s failed, %s orphaned, %s pending, %s claims released, "
+                "%s vouchers expired",
+                report["checked"], report["finalized"], report["failed"], report["orphaned"], report["pending"],
+                report["released_claims"], report["expired_vouchers"],
+            )
+        return report
+
+    def _release_stale_claims(self, db: Session, cutoff: datetime) -> int:
+        in_flight = db.query(models.MintAttempt.recipe_id).filter(
+            models.MintAttempt.status.in_(IN_FLIGHT_STATUSES)
+        )
+        released = db.query(models.Recipe).filter(
+            models.Recipe.mint_state == "minting",
+            models.Recipe.mint_claimed_at < cutoff,
+            models.Recipe.id.notin_(in_flight),
+        ).update(
+            {models.Recipe.mint_state: None, models.Recipe.mint_claimed_at: None},
+            synchronize_session=False,
+        )
+        db.commit()
+        return released
+
+    def _expire_vouchers(self, db: Session) -> int:
+        if web3_service.w3 is None:
+            return 0  # redeem 여부를 확인할 수 없으면 점유를 풀지 않음
+        cutoff = int(time.time()) - settings.MINT_RECOVERY_GRACE
+        attempts = db.query(models.MintAttempt).filter(
+            models.MintAttempt.status == "voucher_issued",
+            models.MintAttempt.voucher_deadline < cutoff,
+        ).order_by(models.MintAttempt.id).limit(settings.MINT_RECOVERY_BATCH_SIZE).all()
+        expired = 0
+        for attempt in attempts:
+            try:
+                if release_expired_voucher(attempt):
+                    expired += 1
+                else:
+                    logger.warning(
+                        "Mint attempt %s: voucher for recipe %s was redeemed but never confirmed",
+                        attempt.id, attempt.recipe_id,
+                    )
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning("Mint attempt %s voucher expiry check failed: %s", attempt.id, e)
+        return expired
+
+    def _reconcile(self, attempt: models.MintAttempt) -> None:
+        if attempt.status in ("metadata_built", "pinned"):
+            _fail(attempt, "Interrupted before signing")
+            return
+        if attempt.status == "confirmed" and attempt.token_id is not None:
+            finalize_attempt(attempt)
+            return
+
+        w3 = web3_service.w3
+        if w3 is None or not signer_pool.is_configured():
+            return  # 체인에 연결되지 않으면 다음 검사까지 대기
+        hashes = attempt.transaction_hashes or [attempt.transaction_hash]
+        calls = [("eth_blockNumber", [])] + [("eth_getTransactionReceipt", [h]) for h in hashes]
+        head, *results = batch_request(w3, calls, allow_errors=True)
+        head = int(head, 16)
+        for raw in results:
+            if not raw or isinstance(raw, Exception):
+                continue
+            receipt = format_receipt(raw)
+            if head - receipt.blockNumber + 1 < settings.RECEIPT_CONFIRMATIONS:
+                return
+            attempt.transaction_hash = receipt.transactionHash.hex()
+            attempt.block_number = receipt.blockNumber
+            if receipt.status != 1:
+                _fail(attempt, f"Transaction failed with status {receipt.status}")
+                return
+            transfer = find_mint_transfer(receipt.logs, attempt.contract_address)
+            if transfer is None:
+                # 토큰은 있을 수 있으므로 실패로 끝내지 않음 (운영자 확인 필요)
+                attempt.status = "confirmed"
+                attempt.error = "Mint Transfer event not found in receipt"
+                logger.error("Mint attempt %s: no Transfer event in %s", attempt.id, attempt.transaction_hash)
+                return
+            attempt.token_id = transfer.token_id
+            finalize_attempt(attempt)
+            return
+
+        # 포함된 트랜잭션이 없음: 서명자의 같은 nonce를 다른 트랜잭션이 썼다면 이 시도는 실패
+        # (서명자 기록이 없는 이전 시도는 PRIVATE_KEY 계정 하나로 보낸 것)
+        signer_address = attempt.signer_address or signer_pool.signers()[0].address
+        calls = [
+            ("eth_getTransactionCount", [signer_address, "latest"]),
+            ("eth_getTransactionCount", [signer_address, "pending"]),
+        ] + [("eth_getTransactionByHash", [h]) for h in hashes]
+        confirmed_nonce, pending_nonce, *transactions = batch_request(w3, calls, allow_errors=True)
+        if attempt.nonce is None or isinstance(confirmed_nonce, Exception):
+            return
+        if int(confirmed_nonce, 16) > attempt.nonce:
+            _fail(attempt, f"Nonce {attempt.nonce} was used by another transaction")
+            return
+        # 전송이 거절됐거나 멤풀에서 빠진 경우: 노드가 서명한 해시를 하나도 모르고 그 nonce 자리도 비어 있으면
+        # 포함될 트랜잭션이 없으므로 실패 처리 (서명자가 쉬고 있어 nonce가 지나가지 않아도 점유 해제)
+        if isinstance(pending_nonce, Exception) or int(pending_nonce, 16) > attempt.nonce:
+            return
+        if all(tx is None for tx in transactions):
+            _fail(attempt, "Transaction unknown to the node (rejected or dropped)")
+
+    def _loop(self):
+        # 시작 직후 한 번 실행하고 이후 MINT_RECOVERY_INTERVAL 주기로 반복
+        while True:
+            try:
+                self.sweep()
+            except Exception as e:
+                logger.exception("Mint recovery error: %s", e)
+            if settings.MINT_RECOVERY_INTERVAL <= 0 or self._stop.wait(settings.MINT_RECOVERY_INTERVAL):
+                break
+
+    def start(self):
+        """시작 시 복구 검사 실행 (MINT_RECOVERY_INTERVAL > 0이면 이후 주기적으로 반복)"""
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="mint-recovery", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+mint_recovery = MintRecovery()
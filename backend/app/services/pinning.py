@@ -0,0 +1,264 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, Optional, Set
+import hashlib
+import logging
+import re
+import threading
+import time
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app import models
+from app.services.ipfs import ipfs_service
+from app.services.metadata import create_recipe_metadata
+from app.services.mint_attempts import IN_FLIGHT_STATUSES
+from app.services.storage import storage
+
+logger = logging.getLogger(__name__)
+
+# IPFS를 쓸 수 없을 때 민팅 경로에서 만드는 임시 해시 "Qm" + md5 (실제 CIDv0는 base58 46자)
+PLACEHOLDER_CID_RE = re.compile(r"Qm[0-9a-f]{32}")
+
+def make_placeholder_cid(seed: str) -> str:
+    """IPFS 미연결 개발 환경용 임시 CID (재고정 작업이 찾아낼 수 있는 형식)"""
+    return "Qm" + hashlib.md5(seed.encode()).hexdigest()
+
+def is_placeholder_cid(cid: Optional[str]) -> bool:
+    return bool(cid) and PLACEHOLDER_CID_RE.fullmatch(cid) is not None
+
+def should_pin(media: models.RecipeMedia) -> bool:
+    """IPFS에 고정할 미디어인지 (원본과 NFT 메타데이터 대표 이미지 렌디션만)"""
+    # 플러시 전 새 행은 컬럼 기본값("original")이 아직 적용되지 않음
+    return (media.variant or "original") in ("original", settings.METADATA_IMAGE_VARIANT)
+
+def enqueue_pin(db: Session, media: models.RecipeMedia) -> Optional[models.MediaJob]:
+    """미디어 IPFS 고정 작업 추가 (커밋은 호출자가 미디어 행과 함께 수행)"""
+    # IPFS가 없는 개발 환경에서는 실패할 작업을 만들지 않음
+    if not settings.IPFS_PIN_MEDIA or not should_pin(media) or not ipfs_service.is_available():
+        return None
+    job = models.MediaJob(media=media, kind="ipfs_pin", status="pending", attempts=0)
+    db.add(job)
+    return job
+
+class MediaPinner:
+    """미디어 작업 워커에서 실행되는 미디어 파일 IPFS 고정"""
+
+    def pin(self, media_id: int) -> Optional[str]:
+        """
+        저장된 파일을 IPFS(또는 Pinata)에 스트리밍 업로드하고 CID를 RecipeMedia.ipfs_hash에 기록
+
+        이미 CID가 있으면 아무것도 하지 않으며, 업로드에 실패하면 예외를 던져 작업이 백오프 후 재시도됩니다.
+        """
+        db = SessionLocal()
+        try:
+            media = db.get(models.RecipeMedia, media_id)
+            if not media or not media.file_path:
+                return None
+            if media.ipfs_hash and not is_placeholder_cid(media.ipfs_hash):
+                return media.ipfs_hash
+            if not ipfs_service.is_available():
+                raise RuntimeError("IPFS is not available (set Pinata keys or run a local IPFS node)")
+
+            with storage.local_path(media.file_path) as path:
+                cid = ipfs_service.upload_file(path)
+            if not cid:
+                raise RuntimeError(f"IPFS upload failed for media {media_id}")
+            media.ipfs_hash = cid
+            db.commit()
+            return cid
+        finally:
+            db.close()
+
+class PinReconciler:
+    """
+    DB의 IPFS 해시와 핀 서비스 상태를 맞추는 작업
+
+    - Recipe.ipfs_hash / RecipeMedia.ipfs_hash를 id 순서로 배치 조회
+    - 임시(placeholder) 해시는 메타데이터/파일을 다시 올려 실제 CID로 교체
+    - 고정되지 않은 CID는 PIN_CONCURRENCY개씩 병렬로 다시 고정
+    - PIN_UNPIN_ORPHANS가 켜져 있으면 어디서도 참조하지 않는 핀을 유예 시간 후 해제
+    """
+
+    def __init__(self):
+        self.last_report: Optional[dict] = None
+        # 고정 시각을 알 수 없는 로컬 노드용: 고아로 처음 발견한 시각
+        self._orphans_seen: Dict[str, datetime] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _batches(self, db: Session, model) -> Iterator[list]:
+        """ipfs_hash가 있는 행을 id 키셋 페이지네이션으로 순회"""
+        last_id = 0
+        while True:
+            rows = db.scalars(
+                select(model)
+                .where(model.ipfs_hash.isnot(None), model.id > last_id)
+                .order_by(model.id)
+                .limit(settings.PIN_RECONCILE_BATCH_SIZE)
+            ).all()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1].id
+
+    def _recipe_metadata(self, recipe: models.Recipe) -> dict:
+        if recipe.token_metadata:
+            return recipe.token_metadata
+        # token_metadata 저장 이전에 민팅된 레시피는 현재 데이터로 다시 생성
+        return create_recipe_metadata(recipe)
+
+    def _repair_media_file(self, file_path: str) -> Optional[str]:
+        with storage.local_path(file_path) as path:
+            return ipfs_service.upload_file(path)
+
+    def _run_task(self, task: dict) -> Optional[str]:
+        """재고정 작업 하나 실행 (스레드 풀에서 호출). 성공 시 최종 CID 반환"""
+        try:
+            cid = task["cid"]
+            if not task["placeholder"] and ipfs_service.pin_hash(cid):
+                return cid
+            # 임시 해시이거나 네트워크에서 내용을 찾지 못하면 원본으로 다시 업로드
+            if task.get("metadata") is not None:
+                return ipfs_service.upload_json(task["metadata"])
+            if task.get("file_path"):
+                return self._repair_media_file(task["file_path"])
+        except Exception as e:
+            logger.warning("Pin repair error (%s %s): %s", task['kind'], task['id'], e)
+        return None
+
+    def _reconcile_model(self, db: Session, model, kind: str, pins: Dict[str, Optional[datetime]],
+                         referenced: Set[str], stats: dict, executor: ThreadPoolExecutor):
+        stats["total"] = db.scalar(select(func.count()).select_from(model))
+        for rows in self._batches(db, model):
+            tasks = []
+            for row in rows:
+                stats["with_cid"] += 1
+                placeholder = is_placeholder_cid(row.ipfs_hash)
+                if placeholder:
+                    stats["placeholders"] += 1
+                elif row.ipfs_hash in pins:
+                    stats["pinned"] += 1
+                    referenced.add(row.ipfs_hash)
+                    continue
+                task = {"kind": kind, "id": row.id, "cid": row.ipfs_hash, "placeholder": placeholder}
+                if kind == "recipe":
+                    task["metadata"] = self._recipe_metadata(row)
+                else:
+                    task["file_path"] = row.file_path
+                tasks.append((row, task))
+
+            results = executor.map(self._run_task, [task for _, task in tasks])
+            for (row, task), cid in zip(tasks, results):
+                if not cid:
+                    stats["repin_failed"] += 1
+                    if not task["placeholder"]:
+                        referenced.add(row.ipfs_hash)
+                    continue
+                if cid != row.ipfs_hash:
+                    if kind == "recipe" and row.is_minted and task["placeholder"]:
+                        # 온체인 tokenURI는 바꿀 수 없으므로 DB도 체인과 같은 값으로 두어
+                        # 토큰을 체인에서 고칠 때까지 매 실행마다 broken_tokens로 보고
+                        stats["broken_tokens"] += 1
+                        logger.warning("Recipe %s token URI still points to placeholder %s; metadata re-pinned as %s", row.id, row.ipfs_hash, cid)
+                    else:
+                        row.ipfs_hash = cid
+                stats["repinned"] += 1
+                stats["pinned"] += 1
+                referenced.add(cid)
+            db.commit()
+
+    @staticmethod
+    def _reference_attempts(db: Session, referenced: Set[str]):
+        # 레시피에 반영되기 전이지만 체인에 올라갔거나 올라갈 수 있는 민팅 시도의 메타데이터
+        # (진행 중 민팅, 발급된 바우처, 레시피와 다른 토큰으로 민팅된 시도)
+        statuses = IN_FLIGHT_STATUSES + ("voucher_issued", "orphaned")
+        rows = db.execute(
+            select(models.MintAttempt.ipfs_hash).distinct().where(
+                models.MintAttempt.status.in_(statuses),
+                models.MintAttempt.ipfs_hash.isnot(None),
+            )
+        ).scalars()
+        referenced.update(rows)
+
+    def _unpin_orphans(self, pins: Dict[str, Optional[datetime]], referenced: Set[str],
+                       stats: dict, executor: ThreadPoolExecutor):
+        now = datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=settings.PIN_ORPHAN_GRACE_SECONDS)
+        orphans = [cid for cid in pins if cid not in referenced]
+        stats["orphans"] = len(orphans)
+        self._orphans_seen = {cid: self._orphans_seen.get(cid, now) for cid in orphans}
+        if not settings.PIN_UNPIN_ORPHANS:
+            return
+
+        expired = [
+            cid for cid in orphans
+            if (pins[cid] or self._orphans_seen[cid]) <= cutoff
+        ]
+        for cid, ok in zip(expired, executor.map(ipfs_service.unpin, expired)):
+            if ok:
+                stats["unpinned"] += 1
+                self._orphans_seen.pop(cid, None)
+
+    def reconcile(self) -> dict:
+        """전체 검사 1회 실행 후 핀 커버리지 보고서 반환"""
+        started = time.monotonic()
+        pins = ipfs_service.list_pins() if ipfs_service.is_available() else None
+        if pins is None:
+            raise RuntimeError("IPFS pin list is not available (check Pinata keys or local IPFS node)")
+
+        report = {
+            "recipes": {"total": 0, "with_cid": 0, "pinned": 0, "placeholders": 0, "repinned": 0, "repin_failed": 0,
+                        "broken_tokens": 0},
+            "media": {"total": 0, "with_cid": 0, "pinned": 0, "placeholders": 0, "repinned": 0, "repin_failed": 0},
+            "pins": {"total": len(pins), "orphans": 0, "unpinned": 0},
+        }
+        referenced: Set[str] = set()
+        db = SessionLocal()
+        try:
+            with ThreadPoolExecutor(max_workers=settings.PIN_CONCURRENCY) as executor:
+                self._reconcile_model(db, models.Recipe, "recipe", pins, referenced, report["recipes"], executor)
+                self._reconcile_model(db, models.RecipeMedia, "media", pins, referenced, report["media"], executor)
+                self._reference_attempts(db, referenced)
+                self._unpin_orphans(pins, referenced, report["pins"], executor)
+        finally:
+            db.close()
+
+        for key in ("recipes", "media"):
+            stats = report[key]
+            stats["coverage"] = round(stats["pinned"] / stats["with_cid"], 4) if stats["with_cid"] else 1.0
+        report["finished_at"] = datetime.now(timezone.utc).isoformat()
+        report["duration_seconds"] = round(time.monotonic() - started, 3)
+        self.last_report = report
+        logger.info(
+            "Pin reconcile: recipes %s/%s, media %s/%s pinned, %s orphans (%s unpinned)",
+            report["recipes"]["pinned"], report["recipes"]["with_cid"],
+            report["media"]["pinned"], report["media"]["with_cid"],
+            report["pins"]["orphans"], report["pins"]["unpinned"],
+        )
+        return report
+
+    def _loop(self):
+        while not self._stop.wait(settings.PIN_RECONCILE_INTERVAL):
+            try:
+                self.reconcile()
+            except Exception as e:
+                logger.exception("Pin reconcile error: %s", e)
+
+    def start(self):
+        """PIN_RECONCILE_INTERVAL 주기로 백그라운드 실행"""
+        if settings.PIN_RECONCILE_INTERVAL <= 0 or self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="pin-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+media_pinner = MediaPinner()
+pin_reconciler = PinReconciler()
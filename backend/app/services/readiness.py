@@ -0,0 +1,121 @@
+"""
+서버 시작 시 외부 서비스 초기화와 준비 상태
+
+lifespan에서 DB/IPFS/Web3 초기화를 각각의 스레드에서 동시에 시작하고 STARTUP_TIMEOUT초까지만 기다립니다.
+시간 안에 끝나지 않은 초기화는 백그라운드에서 계속되며(상태 timeout, 끝나면 ready/unavailable로 바뀜)
+서비스는 처음 사용할 때 그 결과를 기다립니다. GET /ready는 필수 서비스(DB)가 준비됐을 때만 200이며,
+준비되지 않은 필수 서비스는 호출될 때마다 다시 확인하므로 시작 후에 DB가 살아나도 준비 상태로 바뀝니다.
+"""
+from typing import Callable, Dict, Iterable, Optional
+import asyncio
+import logging
+import threading
+import time
+from app.metrics import SERVICE_INIT_SECONDS, STARTUP_SECONDS
+
+logger = logging.getLogger(__name__)
+
+class Readiness:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._services: Dict[str, dict] = {}
+        self._checks: Dict[str, Callable[[], bool]] = {}
+        self._running: Dict[str, asyncio.Future] = {}  # 실행 중인 확인 (같은 서비스를 겹쳐 확인하지 않도록)
+        self._required: set = set()
+        self.started = False  # 시작 초기화 대기가 끝났는지
+        self.startup_seconds: Optional[float] = None
+
+    async def initialize(
+        self,
+        services: Dict[str, Callable[[], bool]],
+        timeout: float,
+        required: Iterable[str] = (),
+    ) -> dict:
+        """초기화 함수(성공 여부 반환)를 동시에 실행하고 최대 timeout초 기다린 뒤 준비 상태 반환"""
+        started = time.monotonic()
+        self._checks = dict(services)
+        self._required = set(required)
+        with self._lock:
+            for name in services:
+                self._services[name] = {"status": "pending"}
+        waiters = [self._start(name) for name in services]
+        if waiters:
+            await asyncio.wait(waiters, timeout=timeout)
+
+        with self._lock:
+            for state in self._services.values():
+                if state["status"] == "pending":
+                    state["status"] = "timeout"
+        self.startup_seconds = time.monotonic() - started
+        self.started = True
+        STARTUP_SECONDS.set(self.startup_seconds)
+        report = self.report()
+        logger.info(
+            "Startup initialization finished in %.2fs: %s", self.startup_seconds,
+            ", ".join(f"{name}={state['status']}" for name, state in report["services"].items()),
+        )
+        return report
+
+    async def check(self, timeout: float) -> dict:
+        """
+        준비 상태 반환 (GET /ready)
+
+        준비되지 않은 필수 서비스는 다시 확인하고 최대 timeout초 기다립니다.
+        이전 확인이 아직 끝나지 않았으면 새로 시작하지 않고 그 결과를 기다립니다.
+        """
+        if self.started:
+            with self._lock:
+                pending = [
+                    name for name in self._required
+                    if name in self._checks and self._services.get(name, {}).get("status") != "ready"
+                ]
+            waiters = [self._running.get(name) or self._start(name) for name in pending]
+            if waiters:
+                await asyncio.wait(waiters, timeout=timeout)
+        return self.report()
+
+    def _start(self, name: str) -> asyncio.Future:
+        """서비스 확인을 스레드에서 시작하고 끝나면 완료되는 Future 반환 (이벤트 루프에서 호출)"""
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._running[name] = waiter
+        waiter.add_done_callback(lambda _: self._running.pop(name, None))
+        # 기본 실행기를 쓰지 않는 데몬 스레드 (멈춘 연결이 종료를 막지 않도록)
+        threading.Thread(
+            target=self._run, args=(name, self._checks[name], loop, waiter), name=f"init-{name}", daemon=True
+        ).start()
+        return waiter
+
+    def _run(self, name: str, init: Callable[[], bool], loop: asyncio.AbstractEventLoop, waiter: asyncio.Future):
+        started = time.monotonic()
+        error = None
+        try:
+            ok = bool(init())
+        except Exception as e:
+            ok = False
+            error = str(e)
+            logger.warning("%s initialization failed: %s", name, e)
+        seconds = time.monotonic() - started
+        SERVICE_INIT_SECONDS.labels(service=name).set(seconds)
+        with self._lock:
+            self._services[name] = {"status": "ready" if ok else "unavailable", "seconds": round(seconds, 3)}
+            if error:
+                self._services[name]["error"] = error
+        try:
+            loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+        except RuntimeError:
+            pass  # 이벤트 루프가 이미 종료됨
+
+    def report(self) -> dict:
+        with self._lock:
+            services = {name: dict(state) for name, state in self._services.items()}
+        ready = self.started and all(
+            services.get(name, {}).get("status") == "ready" for name in self._required
+        )
+        return {
+            "ready": ready,
+            "startup_seconds": round(self.startup_seconds, 3) if self.startup_seconds is not None else None,
+            "services": services,
+        }
+
+readiness = Readiness()
@@ -0,0 +1,193 @@
+"""
+공유 영수증 감시기
+
+트랜잭션마다 영수증을 폴링하지 않고, 스레드 하나가 새 블록을 따라가며 블록 단위로 영수증을 모아
+대기 중인 Future를 완료합니다. 대기 중인 트랜잭션이 없으면 RPC를 전혀 보내지 않습니다.
+
+- 블록 영수증: eth_getBlockReceipts (지원하지 않는 노드는 eth_getBlockByNumber + 일치하는 영수증만 배치 조회)
+- 확인 깊이: confirmations 블록이 쌓인 뒤 완료하며, 그 사이 재구성(reorg)으로 빠진 영수증은 다시 기다림
+"""
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+import logging
+import threading
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+from web3.types import TxReceipt
+from app.config import settings
+from app.services.rpc import batch_request, format_receipt
+
+logger = logging.getLogger(__name__)
+
+class _Pending:
+    __slots__ = ("tx_hash", "future", "confirmations", "receipt", "checked")
+
+    def __init__(self, tx_hash: str, confirmations: int):
+        self.tx_hash = tx_hash
+        self.future: Future = Future()
+        self.confirmations = confirmations
+        self.receipt: Optional[TxReceipt] = None
+        self.checked = False  # 등록 후 영수증을 한 번 직접 조회했는지 (감시 시작 전에 포함된 경우 대비)
+
+def _cancel(future: Future) -> None:
+    """Future 취소 후 concurrent.futures.wait로 기다리는 쪽도 깨움 (cancel()만으로는 깨어나지 않음)"""
+    if future.cancel():
+        future.set_running_or_notify_cancel()
+
+def _hash_key(tx_hash) -> str:
+    return "0x" + bytes(HexBytes(tx_hash)).hex()
+
+class ReceiptWatcher:
+    def __init__(self):
+        self._w3: Optional[Web3] = None
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_block: Optional[int] = None
+        self._block_receipts_supported: Optional[bool] = None
+
+    def watch(self, w3: Web3, tx_hash, confirmations: Optional[int] = None) -> Future:
+        """tx_hash의 영수증이 confirmations 블록 깊이에 도달하면 완료되는 Future"""
+        key = _hash_key(tx_hash)
+        with self._lock:
+            if self._w3 is None:
+                self._w3 = w3
+            entry = self._pending.get(key)
+            if entry is None:
+                entry = _Pending(key, max(1, confirmations or settings.RECEIPT_CONFIRMATIONS))
+                self._pending[key] = entry
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="receipt-watcher", daemon=True)
+                self._thread.start()
+        self._wake.set()
+        return entry.future
+
+    def unwatch(self, tx_hash) -> None:
+        """더 이상 기다리지 않는 트랜잭션 제거 (완료되지 않은 Future는 취소)"""
+        with self._lock:
+            entry = self._pending.pop(_hash_key(tx_hash), None)
+        if entry:
+            _cancel(entry.future)
+
+    def wait(self, w3: Web3, tx_hash, timeout: Optional[float] = None, confirmations: Optional[int] = None) -> TxReceipt:
+        """영수증 대기 (w3.eth.wait_for_transaction_receipt 대체)"""
+        timeout = settings.TX_RECEIPT_TIMEOUT if timeout is None else timeout
+        future = self.watch(w3, tx_hash, confirmations)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            self.unwatch(tx_hash)
+            raise TimeExhausted(f"Transaction {_hash_key(tx_hash)} is not in the chain after {timeout} seconds")
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=10)
+            self._thread = None
+        with self._lock:
+            pending, self._pending = list(self._pending.values()), {}
+        for entry in pending:
+            _cancel(entry.future)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                idle = not self._pending
+            if idle:
+                # 대기 중인 트랜잭션이 없으면 다음 watch()까지 잠듦
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            try:
+                self._poll()
+            except Exception:
+                logger.warning("Receipt watcher poll failed", exc_info=True)
+            self._stop.wait(settings.TX_RECEIPT_POLL_INTERVAL)
+
+    def _poll(self) -> None:
+        head = self._w3.eth.block_number
+        with self._lock:
+            entries = list(self._pending.values())
+
+        last = self._last_block
+        if last is None or head - last > settings.RECEIPT_MAX_BLOCKS_PER_POLL:
+            # 처음이거나 블록이 너무 많이 밀렸으면 블록을 훑지 않고 대기 중인 트랜잭션을 직접 조회
+            self._check_directly([e for e in entries if e.receipt is None])
+        else:
+            # 새로 등록된 트랜잭션은 이미 지나간 블록에 있을 수 있으므로 한 번 직접 조회
+            self._check_directly([e for e in entries if e.receipt is None and not e.checked])
+            waiting = {e.tx_hash: e for e in entries if e.receipt is None}
+            if waiting and head > last:
+                self._scan_blocks(range(last + 1, head + 1), waiting)
+        self._last_block = head
+        self._resolve(head, entries)
+
+    def _check_directly(self, entries: List[_Pending]) -> None:
+        if not entries:
+            return
+        results = batch_request(
+            self._w3, [("eth_getTransactionReceipt", [e.tx_hash]) for e in entries], allow_errors=True
+        )
+        for entry, raw in zip(entries, results):
+            entry.checked = True
+            if raw and not isinstance(raw, Exception):
+                entry.receipt = format_receipt(raw)
+
+    def _scan_blocks(self, blocks: range, waiting: Dict[str, _Pending]) -> None:
+        """새 블록들의 영수증을 모아 대기 중인 트랜잭션과 맞춤"""
+        if self._block_receipts_supported is not False:
+            results = batch_request(
+                self._w3, [("eth_getBlockReceipts", [hex(n)]) for n in blocks], allow_errors=True
+            )
+            if all(isinstance(r, Exception) for r in results) and self._block_receipts_supported is None:
+                logger.info("eth_getBlockReceipts not supported, falling back to block transaction lists")
+                self._block_receipts_supported = False
+            else:
+                self._block_receipts_supported = True
+                for receipts in results:
+                    if isinstance(receipts, Exception):
+                        raise receipts
+                    for raw in receipts or []:
+                        entry = waiting.get(raw["transactionHash"].lower())
+                        if entry:
+                            entry.receipt = format_receipt(raw)
+                return
+
+        blocks_data = batch_request(self._w3, [("eth_getBlockByNumber", [hex(n), False]) for n in blocks])
+        matched = [
+            waiting[tx_hash.lower()]
+            for block in blocks_data if block
+            for tx_hash in block["transactions"]
+            if tx_hash.lower() in waiting
+        ]
+        self._check_directly(matched)
+
+    def _resolve(self, head: int, entries: List[_Pending]) -> None:
+        ready = [e for e in entries if e.receipt is not None and head - e.receipt.blockNumber + 1 >= e.confirmations]
+        # 확인 깊이가 2 이상이면 완료 전에 영수증이 여전히 같은 블록에 있는지(재구성 여부) 확인
+        deep = [e for e in ready if e.confirmations > 1]
+        if deep:
+            results = batch_request(
+                self._w3, [("eth_getTransactionReceipt", [e.tx_hash]) for e in deep], allow_errors=True
+            )
+            for entry, raw in zip(deep, results):
+                if isinstance(raw, Exception):
+                    ready.remove(entry)
+                elif not raw or raw["blockHash"].lower() != "0x" + bytes(entry.receipt.blockHash).hex():
+                    logger.warning("Receipt for %s dropped by reorg, waiting again", entry.tx_hash)
+                    entry.receipt = format_receipt(raw) if raw else None
+                    ready.remove(entry)
+
+        for entry in ready:
+            with self._lock:
+                if self._pending.get(entry.tx_hash) is entry:
+                    del self._pending[entry.tx_hash]
+            if not entry.future.done():
+                entry.future.set_result(entry.receipt)
+
+receipt_watcher = ReceiptWatcher()
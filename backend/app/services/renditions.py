@@ -0,0 +1,138 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+import multiprocessing
+import os
+import tempfile
+import threading
+from PIL import Image, ImageOps
+from app.config import settings
+from app.responses import file_sha256
+from app.services.storage import storage
+from app.services.pinning import enqueue_pin
+from app.database import SessionLocal
+from app import models
+
+# 포맷별 Pillow 저장 옵션
+FORMAT_OPTIONS = {
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 85, "optimize": True, "progressive": True}),
+}
+
+def parse_sizes(value: str) -> Dict[str, int]:
+    """"thumb:320,card:640" 형식의 설정값을 {이름: 긴 변 픽셀}로 변환"""
+    sizes = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        name, edge = item.split(":")
+        sizes[name.strip()] = int(edge)
+    return sizes
+
+def render_photo(src_path: str, out_dir: str, stem: str, sizes: Dict[str, int], formats: List[str]) -> List[dict]:
+    """
+    원본 사진에서 크기/포맷별 렌디션 생성 (프로세스 풀에서 실행)
+
+    큰 크기부터 줄여 나가며 직전 결과를 다음 크기의 입력으로 사용합니다.
+    원본보다 크게 확대하지 않습니다.
+    """
+    results = []
+    with Image.open(src_path) as image:
+        largest = max(sizes.values())
+        # JPEG은 디코딩 단계에서 축소하여 큰 원본의 디코딩 비용을 줄임
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+        current = image
+        for name, edge in sorted(sizes.items(), key=lambda item: item[1], reverse=True):
+            resized = current.copy()
+            resized.thumbnail((edge, edge), Image.LANCZOS)
+            current = resized
+            for fmt in formats:
+                pil_format, options = FORMAT_OPTIONS[fmt]
+                output = resized.convert("RGB") if pil_format == "JPEG" and resized.mode != "RGB" else resized
+                file_name = f"{stem}_{name}.{'jpg' if fmt == 'jpeg' else fmt}"
+                file_path = os.path.join(out_dir, file_name)
+                output.save(file_path, pil_format, **options)
+                results.append({
+                    "variant": f"{name}_{fmt}",
+                    "file_path": file_path,
+                    "file_name": file_name,
+                    "file_size": os.path.getsize(file_path),
+                    "content_hash": file_sha256(file_path),
+                    "width": output.width,
+                    "height": output.height,
+                })
+    return results
+
+class RenditionService:
+    def __init__(self):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.sizes = parse_sizes(settings.RENDITION_SIZES)
+        self.formats = [f.strip() for f in settings.RENDITION_FORMATS.split(",") if f.strip()]
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        """프로세스 풀 지연 생성 (멀티스레드 서버에서 fork 대신 spawn 사용)"""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=settings.RENDITION_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
+
+    def generate(self, media_id: int) -> List[models.RecipeMedia]:
+        """
+        원본 사진 미디어의 렌디션을 만들고 RecipeMedia 변형 행으로 저장
+
+        미디어 작업 워커에서 호출되며, 이미 렌디션이 있으면 아무것도 하지 않습니다.
+        """
+        db = SessionLocal()
+        try:
+            media = db.get(models.RecipeMedia, media_id)
+            if not media or media.media_type != "photo" or media.variant != "original" or not media.file_path:
+                return []
+            if media.variants:
+                return []
+
+            # 임시 디렉토리에서 렌더링한 뒤 결과물을 저장소로 옮김
+            stem = Path(media.file_path).stem
+            with storage.local_path(media.file_path) as src, tempfile.TemporaryDirectory() as out_dir:
+                future = self._get_pool().submit(
+                    render_photo, src, out_dir, stem, self.sizes, self.formats
+                )
+                renditions = future.result()
+                for rendition in renditions:
+                    key = storage.key_for(media.recipe_id, rendition["file_name"])
+                    storage.put_file(rendition["file_path"], key)
+                    rendition["file_path"] = key
+
+            variants = [
+                models.RecipeMedia(
+                    recipe_id=media.recipe_id,
+                    media_type="photo",
+                    parent_id=media.id,
+                    **rendition,
+                )
+                for rendition in renditions
+            ]
+            db.add_all(variants)
+            # 메타데이터 대표 이미지 렌디션은 민팅 전에 미리 IPFS에 고정
+            for variant in variants:
+                enqueue_pin(db, variant)
+            db.commit()
+            return variants
+        finally:
+            db.close()
+
+    def shutdown(self):
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+rendition_service = RenditionService()
@@ -0,0 +1,50 @@
+from typing import List, Tuple
+import json
+import time
+from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3._utils.request import make_post_request
+from web3.datastructures import AttributeDict
+from web3.types import TxReceipt
+from app.metrics import RPC_LATENCY
+from app.tracing import start_span
+
+def batch_request(w3: Web3, calls: List[Tuple[str, list]], allow_errors: bool = False) -> list:
+    """
+    JSON-RPC 배치 요청 (요청 순서대로 결과 반환)
+
+    web3 6.x는 배치를 지원하지 않으므로 프로바이더의 HTTP 세션으로 직접 보냅니다.
+    allow_errors가 False면 하나라도 오류가 있을 때 첫 번째 오류로 예외를 발생시키고,
+    True면 오류 항목 자리에 ValueError 인스턴스를 넣어 반환합니다.
+    """
+    provider = w3.provider
+    payload = [{"jsonrpc": "2.0", "id": i, "method": method, "params": params} for i, (method, params) in enumerate(calls)]
+    methods = ",".join(sorted({method for method, _ in calls}))
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with start_span("rpc batch", **{"rpc.system": "jsonrpc", "rpc.method": methods, "rpc.batch_size": len(calls)}):
+            raw = make_post_request(provider.endpoint_uri, json.dumps(payload).encode(), **provider.get_request_kwargs())
+        responses = json.loads(raw)
+        if isinstance(responses, dict):
+            # 배치를 지원하지 않는 노드는 단일 오류 객체를 반환
+            raise ValueError(f"JSON-RPC batch not supported: {responses.get('error', responses)}")
+        by_id = {response.get("id"): response for response in responses}
+        results = []
+        for i, (method, _) in enumerate(calls):
+            response = by_id.get(i, {})
+            if "error" in response or "result" not in response:
+                error = ValueError(f"{method} failed: {response.get('error', 'no response')}")
+                if not allow_errors:
+                    raise error
+                results.append(error)
+            else:
+                results.append(response["result"])
+        outcome = "ok"
+        return results
+    finally:
+        RPC_LATENCY.labels(method="batch", outcome=outcome).observe(time.perf_counter() - started)
+
+def format_receipt(raw: dict) -> TxReceipt:
+    """배치로 받은 원시 영수증을 w3.eth.get_transaction_receipt와 같은 형식으로 변환"""
+    return AttributeDict.recursive(receipt_formatter(raw))
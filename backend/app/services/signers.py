@@ -0,0 +1,116 @@
+"""
+민팅 서명자 풀
+
+MINTER_PRIVATE_KEYS의 계정마다 nonce 순서(레인)를 따로 관리해 여러 민팅을 병렬로 전송합니다.
+- 민팅마다 진행 중 민팅이 가장 적은 서명자를 배정 (트랜잭션이 막힌 레인은 자연히 덜 배정됨)
+- 서명자별 계정 상태(잔액, 대기 중 nonce)는 CHAIN_BLOCK_TIME 동안 재사용
+- 잔액이 SIGNER_MIN_BALANCE_ETH 아래로 내려가면 경고 로그와 지표로 충전이 필요함을 알림
+"""
+from typing import List, NamedTuple, Optional
+import logging
+import threading
+import time
+from eth_account import Account
+from app.config import settings
+from app.metrics import SIGNER_BALANCE, SIGNER_IN_FLIGHT, SIGNER_LOW_BALANCE
+
+logger = logging.getLogger(__name__)
+
+WEI_PER_ETH = 10 ** 18
+
+class SignerState(NamedTuple):
+    """서명자 계정의 블록 단위 상태 (CHAIN_BLOCK_TIME 동안 재사용)"""
+    block_number: int
+    balance: int
+    nonce: int  # 조회 시점의 대기 중 포함 nonce
+    fees: dict
+    fetched_at: float
+
+class Signer:
+    """서명자 하나의 레인 (nonce 배정과 전송은 lock으로 직렬화)"""
+
+    def __init__(self, account):
+        self.account = account
+        self.address: str = account.address
+        self.lock = threading.Lock()
+        self.state: Optional[SignerState] = None
+        self.next_nonce = 0  # 이 프로세스에서 마지막으로 보낸 nonce + 1
+        self.in_flight = 0
+        self.low_balance = False
+
+    def fresh_state(self) -> Optional[SignerState]:
+        state = self.state
+        if state and time.monotonic() - state.fetched_at <= settings.CHAIN_BLOCK_TIME:
+            return state
+        return None
+
+    def reset(self) -> None:
+        """nonce 충돌 등 전송 실패 시 다음 민팅에서 계정 상태를 다시 조회"""
+        self.state = None
+        self.next_nonce = 0
+
+class SignerPool:
+    def __init__(self):
+        self._signers: Optional[List[Signer]] = None
+        self._lock = threading.Lock()
+        self._cursor = 0  # 진행 중 민팅 수가 같을 때 돌아가며 배정
+
+    def is_configured(self) -> bool:
+        return bool(settings.MINTER_PRIVATE_KEYS.strip() or settings.PRIVATE_KEY)
+
+    def signers(self) -> List[Signer]:
+        """설정된 서명자 목록 (키 변환은 처음 한 번)"""
+        if self._signers is None:
+            keys = [key.strip() for key in settings.MINTER_PRIVATE_KEYS.split(",") if key.strip()]
+            if not keys and settings.PRIVATE_KEY:
+                keys = [settings.PRIVATE_KEY]
+            signers = {}
+            for key in keys:
+                account = Account.from_key(key)
+                signers.setdefault(account.address, Signer(account))
+            self._signers = list(signers.values())
+            logger.info("Signer pool: %s", ", ".join(self._signers_addresses()) or "(empty)")
+        return self._signers
+
+    def _signers_addresses(self) -> List[str]:
+        return [signer.address for signer in self._signers or []]
+
+    def get(self, address: Optional[str]) -> Optional[Signer]:
+        if not address:
+            return None
+        return next((s for s in self.signers() if s.address.lower() == address.lower()), None)
+
+    def acquire(self) -> Signer:
+        """진행 중 민팅이 가장 적은 서명자 배정 (끝나면 release 호출)"""
+        with self._lock:
+            signers = self.signers()
+            if not signers:
+                raise RuntimeError("No minter keys configured (set MINTER_PRIVATE_KEYS or PRIVATE_KEY)")
+            count = len(signers)
+            ordered = [signers[(self._cursor + i) % count] for i in range(count)]
+            signer = min(ordered, key=lambda s: s.in_flight)
+            self._cursor = (signers.index(signer) + 1) % count
+            signer.in_flight += 1
+            SIGNER_IN_FLIGHT.labels(address=signer.address).set(signer.in_flight)
+        return signer
+
+    def release(self, signer: Signer) -> None:
+        with self._lock:
+            signer.in_flight -= 1
+            SIGNER_IN_FLIGHT.labels(address=signer.address).set(signer.in_flight)
+
+    def record_balance(self, signer: Signer, balance: int) -> None:
+        """잔액 지표 갱신, 기준 아래로 처음 내려가면 충전 경고"""
+        SIGNER_BALANCE.labels(address=signer.address).set(balance / WEI_PER_ETH)
+        if balance >= settings.SIGNER_MIN_BALANCE_ETH * WEI_PER_ETH:
+            signer.low_balance = False
+            return
+        if not signer.low_balance:
+            signer.low_balance = True
+            SIGNER_LOW_BALANCE.labels(address=signer.address).inc()
+            logger.warning(
+                "Signer %s balance %.6f ETH is below SIGNER_MIN_BALANCE_ETH (%s), top up required",
+                signer.address, balance / WEI_PER_ETH, settings.SIGNER_MIN_BALANCE_ETH,
+            )
+
+signer_pool = SignerPool()
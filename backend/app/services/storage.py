@@ -0,0 +1,227 @@
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional
+import math
+import os
+import shutil
+import tempfile
+from app.config import settings
+
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+except ImportError:  # S3 백엔드를 쓰지 않으면 boto3 없이도 동작
+    boto3 = None
+    TransferConfig = None
+
+class StorageError(Exception):
+    """스토리지 백엔드 오류"""
+
+class StorageBackend(ABC):
+    """
+    미디어 파일 저장소 인터페이스
+
+    키(key)는 RecipeMedia.file_path에 저장되는 값입니다.
+    추상 메서드를 모두 구현하지 않은 백엔드는 생성 시점에 TypeError가 납니다.
+    """
+    supports_direct_upload = False
+
+    @abstractmethod
+    def key_for(self, recipe_id: int, file_name: str) -> str:
+        ...
+
+    @abstractmethod
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        """파일 객체 내용을 키에 저장"""
+
+    @abstractmethod
+    def put_file(self, local_path: str, key: str) -> None:
+        """로컬 파일을 키로 옮김 (작업 결과물 저장용, 원본 파일은 사용 후 삭제될 수 있음)"""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def size(self, key: str) -> int:
+        ...
+
+    def local_file(self, key: str) -> Optional[str]:
+        """키가 이 프로세스의 로컬 파일이면 경로 반환 (직접 전송용)"""
+        return None
+
+    @abstractmethod
+    def local_path(self, key: str):
+        """처리 작업용 로컬 파일 경로 컨텍스트 (원격 백엔드는 임시 파일로 내려받음)"""
+
+    def presigned_get_url(self, key: str) -> Optional[str]:
+        return None
+
+    def create_direct_upload(self, key: str, file_size: int, content_type: str) -> dict:
+        raise StorageError("Direct upload is not supported by this storage backend")
+
+    def complete_direct_upload(self, key: str, upload_id: Optional[str], parts: List[dict]) -> None:
+        raise StorageError("Direct upload is not supported by this storage backend")
+
+class LocalStorage(StorageBackend):
+    """UPLOAD_DIR 아래 로컬 디스크 저장소 (키 = 파일 경로)"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def key_for(self, recipe_id: int, file_name: str) -> str:
+        return str(self.root / str(recipe_id) / file_name)
+
+    def _prepare(self, key: str) -> None:
+        Path(key).parent.mkdir(parents=True, exist_ok=True)
+
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        self._prepare(key)
+        with open(key, "wb") as buffer:
+            shutil.copyfileobj(fileobj, buffer, 1024 * 1024)
+
+    def put_file(self, local_path: str, key: str) -> None:
+        self._prepare(key)
+        shutil.move(local_path, key)
+
+    def delete(self, key: str) -> None:
+        if os.path.exists(key):
+            os.remove(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(key)
+
+    def size(self, key: str) -> int:
+        return os.path.getsize(key)
+
+    def local_file(self, key: str) -> Optional[str]:
+        return key if os.path.isfile(key) else None
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        yield key
+
+class S3Storage(StorageBackend):
+    """
+    S3 호환 저장소 (AWS S3, MinIO 등)
+
+    큰 파일은 S3_MULTIPART_CHUNKSIZE 단위 멀티파트로 S3_MAX_CONCURRENCY개씩 병렬 전송하고,
+    클라이언트 직접 업로드용 presigned URL(단일 PUT 또는 파트별 PUT)을 발급합니다.
+    """
+    supports_direct_upload = True
+
+    def __init__(self):
+        if boto3 is None:
+            raise StorageError("STORAGE_BACKEND=s3 requires the boto3 package")
+        if not settings.S3_BUCKET:
+            raise StorageError("S3_BUCKET not set in environment")
+        self.bucket = settings.S3_BUCKET
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            region_name=settings.S3_REGION,
+            aws_access_key_id=settings.S3_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+        )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=settings.S3_MULTIPART_THRESHOLD,
+            multipart_chunksize=settings.S3_MULTIPART_CHUNKSIZE,
+            max_concurrency=settings.S3_MAX_CONCURRENCY,
+            use_threads=True,
+        )
+
+    def key_for(self, recipe_id: int, file_name: str) -> str:
+        return f"{recipe_id}/{file_name}"
+
+    def save(self, key: str, fileobj: BinaryIO) -> None:
+        self.client.upload_fileobj(fileobj, self.bucket, key, Config=self.transfer_config)
+
+    def put_file(self, local_path: str, key: str) -> None:
+        self.client.upload_file(local_path, self.bucket, key, Config=self.transfer_config)
+        os.remove(local_path)
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except self.client.exceptions.ClientError:
+            return False
+
+    def size(self, key: str) -> int:
+        return self.client.head_object(Bucket=self.bucket, Key=key)["ContentLength"]
+
+    @contextmanager
+    def local_path(self, key: str) -> Iterator[str]:
+        suffix = Path(key).suffix
+        fd, path = tempfile.mkstemp(suffix=suffix)
+        os.close(fd)
+        try:
+            self.client.download_file(self.bucket, key, path, Config=self.transfer_config)
+            yield path
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def presigned_get_url(self, key: str) -> Optional[str]:
+        return self.client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.bucket, "Key": key},
+            ExpiresIn=settings.S3_PRESIGN_EXPIRES,
+        )
+
+    def create_direct_upload(self, key: str, file_size: int, content_type: str) -> dict:
+        """API 서버를 거치지 않는 업로드용 presigned URL 발급"""
+        if file_size <= settings.S3_MULTIPART_THRESHOLD:
+            url = self.client.generate_presigned_url(
+                "put_object",
+                Params={"Bucket": self.bucket, "Key": key, "ContentType": content_type},
+                ExpiresIn=settings.S3_PRESIGN_EXPIRES,
+            )
+            return {"key": key, "url": url}
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, ContentType=content_type
+        )["UploadId"]
+        part_size = settings.S3_MULTIPART_CHUNKSIZE
+        part_urls = [
+            self.client.generate_presigned_url(
+                "upload_part",
+                Params={"Bucket": self.bucket, "Key": key, "UploadId": upload_id, "PartNumber": number},
+                ExpiresIn=settings.S3_PRESIGN_EXPIRES,
+            )
+            for number in range(1, math.ceil(file_size / part_size) + 1)
+        ]
+        return {"key": key, "upload_id": upload_id, "part_size": part_size, "part_urls": part_urls}
+
+    def complete_direct_upload(self, key: str, upload_id: Optional[str], parts: List[dict]) -> None:
+        if not upload_id:
+            return
+        self.client.complete_multipart_upload(
+            Bucket=self.bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={
+                "Parts": [
+                    {"PartNumber": part["part_number"], "ETag": part["etag"]}
+                    for part in sorted(parts, key=lambda p: p["part_number"])
+                ]
+            },
+        )
+
+def create_storage() -> StorageBackend:
+    """STORAGE_BACKEND 설정에 따른 저장소 생성"""
+    if settings.STORAGE_BACKEND == "s3":
+        return S3Storage()
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.UPLOAD_DIR)
+    raise StorageError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
+
+storage = create_storage()
@@ -0,0 +1,74 @@
+"""
+(체인 ID, 컨트랙트, 토큰 ID) → 레시피 조회
+
+컨트랙트를 다시 배포하면 토큰 ID가 0부터 다시 시작하므로 토큰 ID만으로는 레시피를 찾을 수 없습니다.
+recipes의 (chain_id, contract_address, token_id) 유일 인덱스로 조회하고,
+자주 조회되는 토큰은 레시피 ID를 프로세스 안에 LRU로 기억해 DB 조회를 기본 키 조회 하나로 줄입니다.
+(민팅된 레시피는 삭제할 수 없고 토큰도 바뀌지 않으므로 기억한 값은 무효화할 필요가 없음)
+"""
+from collections import OrderedDict
+from typing import Optional, Tuple
+import logging
+import threading
+from sqlalchemy.orm import Session
+from web3 import Web3
+from app.config import settings
+from app import models
+
+logger = logging.getLogger(__name__)
+
+TokenKey = Tuple[int, str, int]
+
+def normalize_contract_address(contract_address: str) -> str:
+    """레시피에 저장하는 컨트랙트 주소 형식 (체크섬)"""
+    return Web3.to_checksum_address(contract_address)
+
+class TokenIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recipe_ids: "OrderedDict[TokenKey, int]" = OrderedDict()
+
+    def resolve(self, db: Session, chain_id: int, contract_address: str, token_id: int) -> Optional[models.Recipe]:
+        """토큰의 레시피 (없으면 None, 주소 형식이 잘못되면 ValueError)"""
+        contract_address = normalize_contract_address(contract_address)
+        key = (chain_id, contract_address, token_id)
+        with self._lock:
+            recipe_id = self._recipe_ids.get(key)
+            if recipe_id is not None:
+                self._recipe_ids.move_to_end(key)
+        if recipe_id is not None:
+            recipe = db.get(models.Recipe, recipe_id)
+            if recipe is not None:
+                return recipe
+            self.forget(key)
+
+        recipe = self._lookup(db, chain_id, contract_address, token_id)
+        if recipe is not None:
+            self.remember(key, recipe.id)
+        return recipe
+
+    def _lookup(self, db: Session, chain_id: int, contract_address: str, token_id: int) -> Optional[models.Recipe]:
+        # 이전에 저장된 주소는 소문자일 수 있음 (둘 다 인덱스 조회)
+        addresses = list({contract_address, contract_address.lower()})
+        query = db.query(models.Recipe).filter(
+            models.Recipe.token_id == token_id,
+            models.Recipe.contract_address.in_(addresses),
+        )
+        recipe = query.filter(models.Recipe.chain_id == chain_id).first()
+        if recipe is None:
+            # chain_id가 채워지기 전에 민팅된 레시피
+            recipe = query.filter(models.Recipe.chain_id.is_(None)).first()
+        return recipe
+
+    def remember(self, key: TokenKey, recipe_id: int) -> None:
+        with self._lock:
+            self._recipe_ids[key] = recipe_id
+            self._recipe_ids.move_to_end(key)
+            while len(self._recipe_ids) > settings.TOKEN_INDEX_CACHE_SIZE:
+                self._recipe_ids.popitem(last=False)
+
+    def forget(self, key: TokenKey) -> None:
+        with self._lock:
+            self._recipe_ids.pop(key, None)
+
+token_index = TokenIndex()
@@ -0,0 +1,92 @@
+"""
+ERC-721 Transfer 로그/민팅 호출 데이터 디코딩
+
+web3 영수증의 로그(AttributeDict, HexBytes 토픽)와 Etherscan 프록시 응답의 로그(dict, 16진 문자열 토픽)를
+같은 함수로 처리합니다. Transfer의 세 인자는 모두 indexed라서 ABI 디코딩 없이 토픽만으로 읽을 수 있습니다.
+"""
+from typing import Iterable, Mapping, NamedTuple, Optional, Union
+from web3 import Web3
+
+# keccak256("Transfer(address,address,uint256)")
+TRANSFER_EVENT_TOPIC = bytes.fromhex("ddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef")
+# keccak256("RecipeRedeemed(uint256,uint256,address)") - 바우처로 민팅한 경우
+RECIPE_REDEEMED_EVENT_TOPIC = bytes.fromhex("8f9bc064df2197df712b957b7274ee9ca221b1d8cae03a3a32c720b76488dc86")
+# mintRecipe(address,string) 함수 선택자
+MINT_RECIPE_SELECTOR = "675f0173"
+# RecipeNFTCompact.mintRecipe(address,bytes32) 함수 선택자
+MINT_RECIPE_COMPACT_SELECTOR = "9bed779c"
+
+HexLike = Union[bytes, str]
+
+class Redemption(NamedTuple):
+    recipe_id: int
+    token_id: int
+    recipient: str  # 체크섬 주소
+
+class Transfer(NamedTuple):
+    from_address: str  # 체크섬 주소
+    to_address: str
+    token_id: int
+
+def _to_bytes(value: HexLike) -> bytes:
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    return bytes.fromhex(value[2:] if value[:2] in ("0x", "0X") else value)
+
+def parse_transfer_log(log: Mapping) -> Optional[Transfer]:
+    """Transfer(from, to, tokenId) 로그면 디코딩, 아니면 None"""
+    topics = log["topics"]
+    if len(topics) != 4:
+        return None
+    if _to_bytes(topics[0]) != TRANSFER_EVENT_TOPIC:
+        return None
+    return Transfer(
+        from_address=Web3.to_checksum_address(_to_bytes(topics[1])[-20:]),
+        to_address=Web3.to_checksum_address(_to_bytes(topics[2])[-20:]),
+        token_id=int.from_bytes(_to_bytes(topics[3]), "big"),
+    )
+
+def find_mint_transfer(logs: Iterable[Mapping], contract_address: Optional[str] = None) -> Optional[Transfer]:
+    """
+    로그 중 첫 민팅 Transfer(from == 0x0) 반환
+
+    contract_address가 있으면 해당 컨트랙트에서 발생한 로그만 봅니다.
+    """
+    contract_lower = contract_address.lower() if contract_address else None
+    for log in logs:
+        if contract_lower and log["address"].lower() != contract_lower:
+            continue
+        # 민팅이 아닌 로그는 체크섬 주소 변환 전에 from 토픽만 보고 건너뜀
+        topics = log["topics"]
+        if len(topics) != 4 or any(_to_bytes(topics[1])):
+            continue
+        transfer = parse_transfer_log(log)
+        if transfer:
+            return transfer
+    return None
+
+def find_redemption(logs: Iterable[Mapping], recipe_id: int, contract_address: Optional[str] = None) -> Optional[Redemption]:
+    """로그 중 recipe_id 바우처의 RecipeRedeemed(recipeId, tokenId, recipient) 이벤트"""
+    contract_lower = contract_address.lower() if contract_address else None
+    for log in logs:
+        if contract_lower and log["address"].lower() != contract_lower:
+            continue
+        topics = log["topics"]
+        if len(topics) != 4 or _to_bytes(topics[0]) != RECIPE_REDEEMED_EVENT_TOPIC:
+            continue
+        if int.from_bytes(_to_bytes(topics[1]), "big") != recipe_id:
+            continue
+        return Redemption(
+            recipe_id=recipe_id,
+            token_id=int.from_bytes(_to_bytes(topics[2]), "big"),
+            recipient=Web3.to_checksum_address(_to_bytes(topics[3])[-20:]),
+        )
+    return None
+
+def decode_mint_recipient(input_data: HexLike) -> Optional[str]:
+    """mintRecipe(address to, string uri | bytes32 cid) 호출 데이터에서 to 주소 추출"""
+    data = _to_bytes(input_data)
+    # 선택자(4바이트) + to(32바이트, 앞 12바이트는 0 패딩) + uri 오프셋 또는 cid(32바이트)
+    if len(data) < 68 or data[:4].hex() not in (MINT_RECIPE_SELECTOR, MINT_RECIPE_COMPACT_SELECTOR):
+        return None
+    return Web3.to_checksum_address(data[16:36])
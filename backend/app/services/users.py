@@ -0,0 +1,77 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app import models
+
+
+def _insert_for(db: Session):
+    """세션의 DB 방언에 맞는 insert 생성자 반환 (ON CONFLICT 지원)"""
+    if db.get_bind().dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+    return insert
+
+
+def upsert_user(db: Session, wallet_address: str) -> models.User:
+    """
+    지갑 주소로 사용자 조회 또는 생성 (단일 왕복)
+
+    PostgreSQL에서는 `INSERT ... ON CONFLICT DO NOTHING RETURNING`과 기존 행 조회를
+    하나의 문장(CTE)으로 실행합니다. 커밋하지 않으므로 호출자의 트랜잭션에 포함됩니다.
+    """
+    users = models.User.__table__
+    insert = _insert_for(db)
+    inserted = (
+        insert(users)
+        .values(wallet_address=wallet_address)
+        .on_conflict_do_nothing(index_elements=[users.c.wallet_address])
+        .returning(*users.c)
+    )
+
+    user: Optional[models.User] = None
+    if db.get_bind().dialect.name == "postgresql":
+        ins = inserted.cte("ins")
+        stmt = (
+            select(ins)
+            .union_all(select(users).where(users.c.wallet_address == wallet_address))
+            .limit(1)
+        )
+        user = db.execute(
+            select(models.User).from_statement(stmt)
+        ).scalars().first()
+    else:
+        user = db.execute(
+            select(models.User).from_statement(inserted)
+        ).scalars().first()
+
+    if user is None:
+        # 동시 요청이 같은 주소를 먼저 삽입한 경우: 새 스냅샷으로 다시 조회
+        user = db.execute(
+            select(models.User).where(models.User.wallet_address == wallet_address)
+        ).scalar_one()
+    return user
+
+
+def upsert_user_ids(db: Session, wallet_addresses: Iterable[str]) -> Dict[str, int]:
+    """
+    여러 지갑 주소를 한 번에 사용자 id로 변환 (대량 임포트용)
+
+    없는 주소는 다중 행 `INSERT ... ON CONFLICT DO NOTHING`으로 생성한 뒤
+    `IN` 조회 한 번으로 id를 가져옵니다. 커밋하지 않습니다.
+    """
+    wallets = sorted(set(wallet_addresses))
+    if not wallets:
+        return {}
+    
+    users = models.User.__table__
+    insert = _insert_for(db)
+    db.execute(
+        insert(users)
+        .values([{"wallet_address": w} for w in wallets])
+        .on_conflict_do_nothing(index_elements=[users.c.wallet_address])
+    )
+    rows = db.execute(
+        select(users.c.wallet_address, users.c.id).where(users.c.wallet_address.in_(wallets))
+    )
+    return {wallet: user_id for wallet, user_id in rows}
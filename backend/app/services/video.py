@@ -0,0 +1,128 @@
+from pathlib import Path
+from typing import List, Optional
+import json
+import os
+import subprocess
+import tempfile
+from app.config import settings
+from app.responses import file_sha256
+from app.services.storage import storage
+from app.database import SessionLocal
+from app import models
+
+class VideoService:
+    def _run(self, args: List[str]) -> subprocess.CompletedProcess:
+        """ffmpeg/ffprobe 실행 (실패 시 stderr 포함 예외)"""
+        result = subprocess.run(
+            args,
+            capture_output=True,
+            timeout=settings.VIDEO_JOB_TIMEOUT,
+        )
+        if result.returncode != 0:
+            stderr = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(f"{Path(args[0]).name} failed ({result.returncode}): {stderr[-500:]}")
+        return result
+
+    def probe(self, file_path: str) -> dict:
+        """ffprobe로 길이와 해상도 조회"""
+        result = self._run([
+            settings.FFPROBE_PATH, "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height:format=duration",
+            "-of", "json",
+            file_path,
+        ])
+        data = json.loads(result.stdout)
+        stream = (data.get("streams") or [{}])[0]
+        duration = data.get("format", {}).get("duration")
+        return {
+            "width": stream.get("width"),
+            "height": stream.get("height"),
+            "duration_seconds": float(duration) if duration not in (None, "N/A") else None,
+        }
+
+    def extract_poster(self, file_path: str, output_path: str, duration: Optional[float]) -> None:
+        """대표 프레임을 JPEG으로 추출 (1초 지점, 짧은 영상은 중간 지점)"""
+        offset = min(1.0, duration / 2) if duration else 0
+        self._run([
+            settings.FFMPEG_PATH, "-y", "-v", "error",
+            "-ss", f"{offset:.3f}",
+            "-i", file_path,
+            "-frames:v", "1",
+            "-vf", "scale='min(1280,iw)':-2",
+            "-q:v", "3",
+            output_path,
+        ])
+
+    def transcode(self, file_path: str, output_path: str) -> None:
+        """H.264/AAC mp4로 변환 (moov atom을 앞에 두어 다운로드 중 재생 가능)"""
+        self._run([
+            settings.FFMPEG_PATH, "-y", "-v", "error",
+            "-i", file_path,
+            "-threads", str(settings.FFMPEG_THREADS),
+            "-c:v", "libx264", "-preset", "veryfast", "-crf", "23",
+            "-pix_fmt", "yuv420p",
+            "-c:a", "aac", "-b:a", "128k",
+            "-movflags", "+faststart",
+            output_path,
+        ])
+
+    def _store_variant(self, media: models.RecipeMedia, path: str, media_type: str, variant: str) -> models.RecipeMedia:
+        """작업 결과 파일을 조회한 뒤 저장소로 옮기고 변형 행 생성"""
+        info = self.probe(path)
+        if media_type == "photo":
+            info.pop("duration_seconds")
+        file_name = os.path.basename(path)
+        row = models.RecipeMedia(
+            recipe_id=media.recipe_id,
+            media_type=media_type,
+            variant=variant,
+            parent_id=media.id,
+            file_name=file_name,
+            file_size=os.path.getsize(path),
+            content_hash=file_sha256(path),
+            **info,
+        )
+        row.file_path = storage.key_for(media.recipe_id, file_name)
+        storage.put_file(path, row.file_path)
+        return row
+
+    def process(self, media_id: int) -> List[models.RecipeMedia]:
+        """
+        동영상 미디어 처리: 메타데이터 조회, 포스터 추출, (선택) mp4 변환
+
+        이미 만들어진 변형은 건너뛰므로 재시도해도 중복 행이 생기지 않습니다.
+        """
+        db = SessionLocal()
+        try:
+            media = db.get(models.RecipeMedia, media_id)
+            if not media or media.media_type != "video" or media.variant != "original" or not media.file_path:
+                return []
+
+            stem = Path(media.file_path).stem
+            with storage.local_path(media.file_path) as src, tempfile.TemporaryDirectory() as work_dir:
+                info = self.probe(src)
+                media.width = info["width"]
+                media.height = info["height"]
+                media.duration_seconds = info["duration_seconds"]
+
+                existing = {variant.variant for variant in media.variants}
+                created = []
+
+                if "poster_jpeg" not in existing:
+                    poster_path = os.path.join(work_dir, f"{stem}_poster.jpg")
+                    self.extract_poster(src, poster_path, info["duration_seconds"])
+                    created.append(self._store_variant(media, poster_path, "photo", "poster_jpeg"))
+
+                if settings.VIDEO_TRANSCODE and "mp4_h264" not in existing:
+                    mp4_path = os.path.join(work_dir, f"{stem}_stream.mp4")
+                    self.transcode(src, mp4_path)
+                    created.append(self._store_variant(media, mp4_path, "video", "mp4_h264"))
+
+            db.add_all(created)
+            db.commit()
+            return created
+        finally:
+            db.close()
+
+video_service = VideoService()
@@ -0,0 +1,71 @@
+"""
+지연 민팅(lazy mint) 바우처
+
+서버는 체인에 접근하지 않고 EIP-712 바우처(레시피 ID, 토큰 URI, 받는 주소, 만료 시각)에 서명만 하며,
+받는 사람(또는 대신 가스를 내는 누구나)이 RecipeNFT.redeem으로 민팅합니다.
+컨트랙트는 레시피 ID마다 한 번만 redeem을 허용하므로 같은 바우처를 다시 발급해도 중복 민팅되지 않고,
+만료 시각이 지난 바우처는 거절하므로 쓰이지 않은 바우처의 레시피 점유를 풀 수 있습니다.
+"""
+import logging
+from eth_account import Account
+from web3 import Web3
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+VOUCHER_TYPES = {
+    "RecipeVoucher": [
+        {"name": "recipeId", "type": "uint256"},
+        {"name": "uri", "type": "string"},
+        {"name": "recipient", "type": "address"},
+        {"name": "deadline", "type": "uint256"},
+    ],
+}
+
+class VoucherSigner:
+    """RecipeNFT EIP-712 도메인의 바우처 서명"""
+
+    def __init__(self):
+        self._address = None
+
+    def is_configured(self) -> bool:
+        # redeem은 RecipeNFT(standard)에만 있음
+        return bool(
+            (settings.VOUCHER_SIGNER_KEY or settings.PRIVATE_KEY) and settings.NFT_CONTRACT_ADDRESS and settings.CHAIN_ID
+            and settings.NFT_CONTRACT_VARIANT == "standard"
+        )
+
+    @property
+    def address(self) -> str:
+        """컨트랙트의 voucherSigner로 설정해야 하는 주소"""
+        if self._address is None:
+            self._address = Account.from_key(self._key()).address
+        return self._address
+
+    @staticmethod
+    def _key() -> str:
+        return settings.VOUCHER_SIGNER_KEY or settings.PRIVATE_KEY
+
+    def domain(self) -> dict:
+        return {
+            "name": "RecipeNFT",
+            "version": "1",
+            "chainId": settings.CHAIN_ID,
+            "verifyingContract": Web3.to_checksum_address(settings.NFT_CONTRACT_ADDRESS),
+        }
+
+    def sign(self, recipe_id: int, uri: str, recipient: str, deadline: int) -> str:
+        """바우처 서명 (0x 16진 문자열, 65바이트, deadline은 유닉스 초)"""
+        if not self.is_configured():
+            raise RuntimeError("Lazy minting requires NFT_CONTRACT_ADDRESS, CHAIN_ID and VOUCHER_SIGNER_KEY (or PRIVATE_KEY)")
+        message = {
+            "recipeId": recipe_id,
+            "uri": uri,
+            "recipient": Web3.to_checksum_address(recipient),
+            "deadline": deadline,
+        }
+        signed = Account.sign_typed_data(self._key(), self.domain(), VOUCHER_TYPES, message)
+        logger.debug("Signed voucher for recipe %s to %s", recipe_id, message["recipient"])
+        return "0x" + bytes(signed.signature).hex()
+
+voucher_signer = VoucherSigner()
@@ -1,25 +1,78 @@
-from typing import Optional, Tuple
+from typing import List, Optional, Set, Tuple
 from web3 import Web3
 from web3.types import TxReceipt
 from app.config import settings
+from app.metrics import TOKEN_ID_FALLBACKS, mint_stage, rpc_metrics_middleware
+from app.services.cid import cid_to_bytes32
+from app.services.gas import fee_oracle, wait_for_receipt_with_replacement
+from app.services.rpc import batch_request
+from app.services.signers import Signer, SignerState, signer_pool
+from app.services.transfers import decode_mint_recipient, find_mint_transfer
+from app.tracing import rpc_tracing_middleware
 import json
+import logging
 import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# NFT_CONTRACT_VARIANT별 ABI 파일
+CONTRACT_ABI_FILES = {
+    "standard": "RecipeNFT.abi.json",
+    "compact": "RecipeNFTCompact.abi.json",
+}
+
+def _decode_fee_history(result: dict) -> dict:
+    """배치로 받은 eth_feeHistory의 16진 값을 정수로 변환"""
+    return {
+        "baseFeePerGas": [int(value, 16) for value in result.get("baseFeePerGas") or []],
+        "reward": [[int(value, 16) for value in rewards] for rewards in result.get("reward") or []],
+    }
+
+def _already_known(error: ValueError) -> bool:
+    """같은 트랜잭션이 이미 노드 멤풀에 있다는 거절인지 (geth: already known, 그 외: known transaction)"""
+    message = error.args[0].get("message", "") if error.args and isinstance(error.args[0], dict) else str(error)
+    return "already known" in message.lower() or "known transaction" in message.lower()
 
 class Web3Service:
     def __init__(self):
-        self.w3 = None
-        self._connect()
+        # 프로바이더 연결 확인은 import 시점이 아니라 서버 시작(lifespan) 또는 처음 사용할 때 한 번 수행
+        self._w3 = None
+        self._connected = False
+        self._connect_lock = threading.Lock()
+        self._abi: Optional[list] = None
+        self._contracts: dict = {}
+        self._chain_id: Optional[int] = settings.CHAIN_ID
+        self._verified_contracts: Set[str] = set()
+    
+    @property
+    def w3(self):
+        if not self._connected:
+            self.connect()
+        return self._w3
+    
+    def connect(self) -> bool:
+        """Web3 프로바이더 연결 (한 번만 시도) 후 연결 여부 반환"""
+        with self._connect_lock:
+            if not self._connected:
+                self._connect()
+                self._connected = True
+        return self._w3 is not None
     
     def _connect(self):
         """Web3 프로바이더 연결"""
         try:
-            self.w3 = Web3(Web3.HTTPProvider(settings.WEB3_PROVIDER_URL))
-            if not self.w3.is_connected():
-                print("Web3 connection failed")
-                self.w3 = None
+            w3 = Web3(Web3.HTTPProvider(settings.WEB3_PROVIDER_URL))
+            # JSON-RPC 메서드별 지연 시간 기록 및 트레이싱 스팬
+            w3.middleware_onion.add(rpc_metrics_middleware, "metrics")
+            w3.middleware_onion.add(rpc_tracing_middleware, "tracing")
+            if w3.is_connected():
+                self._w3 = w3
+            else:
+                logger.warning("Web3 connection failed: %s", settings.WEB3_PROVIDER_URL)
         except Exception as e:
-            print(f"Web3 connection error: {e}")
-            self.w3 = None
+            logger.warning("Web3 connection error: %s", e)
     
     def is_connected(self) -> bool:
         """Web3 연결 상태 확인"""
@@ -31,6 +84,15 @@ class Web3Service:
             return None
         return self.w3.eth.contract(address=contract_address, abi=abi)
     
+    def chain_id(self) -> Optional[int]:
+        """체인 ID (CHAIN_ID 설정 또는 민팅 중 조회한 값, 없으면 노드에서 한 번 조회)"""
+        if self._chain_id is None and self.w3 is not None:
+            try:
+                self._chain_id = self.w3.eth.chain_id
+            except Exception as e:
+                logger.warning("Failed to fetch chain ID: %s", e)
+        return self._chain_id
+    
     def verify_address(self, address: str) -> bool:
         """지갑 주소 유효성 검증"""
         return Web3.is_address(address)
@@ -42,385 +104,333 @@ class Web3Service:
         try:
             return self.w3.eth.get_balance(address)
         except Exception as e:
-            print(f"Get balance error: {e}")
+            logger.warning("Get balance error: %s", e)
             return None
     
+    def is_voucher_redeemed(self, contract_address: str, recipe_id: int) -> bool:
+        """레시피 바우처가 체인에서 사용됐는지 (RecipeNFT.redeemed, 조회 실패 시 예외)"""
+        if self.w3 is None:
+            raise RuntimeError(f"Web3 not connected. Provider: {settings.WEB3_PROVIDER_URL}")
+        contract = self._mint_contract(Web3.to_checksum_address(contract_address))
+        return contract.functions.redeemed(recipe_id).call()
+    
     def load_contract_abi(self) -> Optional[list]:
-        """컨트랙트 ABI 로드"""
+        """NFT_CONTRACT_VARIANT에 맞는 컨트랙트 ABI 로드 (처음 한 번만 파일에서 읽음)"""
+        if self._abi is not None:
+            return self._abi
         try:
-            abi_path = os.path.join(os.path.dirname(__file__), "..", "contracts", "RecipeNFT.abi.json")
+            abi_file = CONTRACT_ABI_FILES[settings.NFT_CONTRACT_VARIANT]
+            abi_path = os.path.join(os.path.dirname(__file__), "..", "contracts", abi_file)
             with open(abi_path, 'r') as f:
-                return json.load(f)
+                self._abi = json.load(f)
+            return self._abi
         except Exception as e:
-            print(f"Failed to load ABI: {e}")
+            logger.error("Failed to load ABI: %s", e)
             return None
     
-    def mint_nft(self, contract_address: str, to_address: str, token_uri: str) -> Optional[Tuple[int, str]]:
+    def mint_nft(self, contract_address: str, to_address: str, token_uri: str, journal=None) -> Optional[Tuple[int, str]]:
         """
         NFT 민팅
         
+        전송 전 조회(계정 상태, 수수료, 컨트랙트 코드, 가스 추정)는 JSON-RPC 배치 한 번으로 모으고
+        이미 알고 있는 값(블록 간격 안의 계정 상태, 확인된 컨트랙트, 메모이제이션된 가스)은 생략합니다.
+        서명자는 signer_pool에서 진행 중 민팅이 가장 적은 계정을 배정하며, nonce는 서명자별로 따로 관리합니다.
+        journal(MintJournal)이 있으면 서명한 트랜잭션을 전송 전에 기록하고 이후 단계도 남깁니다.
+        
         Returns:
             Tuple[token_id, transaction_hash] 또는 None
         """
-        if not self.is_connected():
+        if self.w3 is None:
             error_msg = f"Web3 not connected. Provider: {settings.WEB3_PROVIDER_URL}"
-            print(f"❌ {error_msg}")
             raise Exception(error_msg)
         
-        if not settings.PRIVATE_KEY:
-            error_msg = "PRIVATE_KEY not set in environment"
-            print(f"❌ {error_msg}")
+        if not signer_pool.is_configured():
+            error_msg = "PRIVATE_KEY or MINTER_PRIVATE_KEYS not set in environment"
             raise Exception(error_msg)
         
         if not contract_address:
             error_msg = "NFT_CONTRACT_ADDRESS not set in environment"
-            print(f"❌ {error_msg}")
             raise Exception(error_msg)
         
+        signer = None
         try:
-            print(f"📝 Starting NFT mint process...")
-            
             # 주소를 체크섬 형식으로 변환
             to_address = Web3.to_checksum_address(to_address)
             contract_address = Web3.to_checksum_address(contract_address)
             
-            print(f"   Contract: {contract_address}")
-            print(f"   To: {to_address}")
-            print(f"   Token URI: {token_uri}")
-            
-            # ABI 로드
-            abi = self.load_contract_abi()
-            if not abi:
-                error_msg = "Failed to load contract ABI"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            
-            print(f"✅ ABI loaded successfully")
-            
-            # 컨트랙트 인스턴스 생성
-            contract = self.get_contract(contract_address, abi)
-            if not contract:
-                error_msg = f"Failed to create contract instance for {contract_address}"
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            
-            print(f"✅ Contract instance created")
+            logger.debug("Starting NFT mint: contract=%s to=%s uri=%s", contract_address, to_address, token_uri)
             
-            # 컨트랙트 코드 확인 (컨트랙트가 실제로 배포되었는지)
-            try:
-                code = self.w3.eth.get_code(contract_address)
-                if code == b'' or code == '0x':
-                    error_msg = f"No contract code found at address {contract_address}. This address is NOT a contract!"
-                    print(f"❌ {error_msg}")
-                    raise Exception(error_msg)
-                else:
-                    print(f"✅ Contract code verified (length: {len(code)} bytes)")
-            except Exception as e:
-                if "NOT a contract" in str(e):
-                    raise
-                print(f"⚠️  Warning: Could not verify contract code: {e}")
-            
-            # 계정 생성
-            account = self.w3.eth.account.from_key(settings.PRIVATE_KEY)
-            print(f"✅ Account loaded: {account.address}")
-            
-            # 잔액 확인
-            balance = self.w3.eth.get_balance(account.address)
-            balance_eth = self.w3.from_wei(balance, 'ether')
-            print(f"💰 Account balance: {balance_eth} ETH ({balance} Wei)")
-            
-            if balance == 0:
-                raise Exception(f"Insufficient balance. Account {account.address} has 0 ETH")
-            
-            # 민팅 함수 호출 (mintRecipe)
-            mint_function = contract.functions.mintRecipe(to_address, token_uri)
-            print(f"📤 Building transaction...")
-            
-            # 트랜잭션 전에 call로 반환값 확인 (토큰 ID 미리 얻기)
-            expected_token_id = None
-            try:
-                print(f"   Pre-calling mintRecipe to get expected token ID...")
-                expected_token_id = mint_function.call({'from': account.address})
-                print(f"   Expected token ID from call: {expected_token_id}")
-            except Exception as e:
-                print(f"   Could not pre-call mintRecipe (this is normal): {e}")
-            
-            # 트랜잭션 전에 balanceOf 확인 (최신 토큰 ID 찾기용)
-            balance_before = 0
-            try:
-                balance_before = contract.functions.balanceOf(to_address).call()
-                print(f"   Balance before mint: {balance_before}")
-            except Exception as e:
-                print(f"   Could not get balance before mint: {e}")
-            
-            # 트랜잭션 빌드
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            gas_price = self.w3.eth.gas_price
-            print(f"   Nonce: {nonce}, Gas Price: {gas_price} Wei")
-            
-            # Gas 추정
-            try:
-                estimated_gas = mint_function.estimate_gas({'from': account.address})
-                print(f"   Estimated gas: {estimated_gas}")
-            except Exception as gas_err:
-                print(f"⚠️  Gas estimation failed: {gas_err}")
-                estimated_gas = 200000  # 기본값
-            
-            transaction = mint_function.build_transaction({
-                'from': account.address,
-                'nonce': nonce,
-                'gasPrice': gas_price,
-                'gas': estimated_gas,
-            })
-            
-            print(f"✅ Transaction built")
-            
-            # 트랜잭션 서명
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, settings.PRIVATE_KEY)
-            print(f"✅ Transaction signed")
-            
-            # 트랜잭션 전송
-            print(f"📡 Sending transaction...")
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            print(f"✅ Transaction sent: {tx_hash.hex()}")
-            
-            # 트랜잭션 영수증 대기
-            print(f"⏳ Waiting for transaction receipt...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-            print(f"✅ Transaction confirmed in block {receipt.blockNumber}")
+            with mint_stage("prepare"):
+                contract = self._mint_contract(contract_address)
+                signer = signer_pool.acquire()
+                account = signer.account
+                mint_args = self._mint_args(to_address, token_uri)
+                mint_function = contract.functions.mintRecipe(*mint_args)
+                data = contract.encodeABI(fn_name="mintRecipe", args=mint_args)
+                state, gas_limit = self._mint_preamble(contract_address, signer, mint_function, data)
+                
+                if state.balance == 0:
+                    raise Exception(f"Insufficient balance. Account {account.address} has 0 ETH")
+            
+            # 서명자별로 nonce를 순서대로 배정하고 전송 (다른 서명자의 민팅은 기다리지 않음)
+            with signer.lock:
+                with mint_stage("sign"):
+                    nonce = max(state.nonce, signer.next_nonce)
+                    transaction = {
+                        'chainId': self._chain_id,
+                        'from': account.address,
+                        'to': contract_address,
+                        'data': data,
+                        'value': 0,
+                        'nonce': nonce,
+                        'gas': gas_limit,
+                        **state.fees,
+                    }
+                    logger.debug("Nonce: %s, Fees: %s, Gas limit: %s", nonce, state.fees, gas_limit)
+                    signed_txn = account.sign_transaction(transaction)
+                    if journal:
+                        journal.signed(nonce, signed_txn.hash.hex(), account.address)
+                
+                with mint_stage("broadcast"):
+                    logger.debug("Sending transaction...")
+                    try:
+                        tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+                    except ValueError as e:
+                        # 노드가 JSON-RPC 오류로 거절 (nonce too low, insufficient funds 등)
+                        if not _already_known(e):
+                            # 이 트랜잭션은 체인에 포함될 수 없으므로 시도를 실패로 끝내고 레시피 점유 해제
+                            signer.reset()
+                            if journal:
+                                journal.failed(f"Broadcast rejected: {e}")
+                            raise
+                        # 이미 멤풀에 있는 같은 트랜잭션 (재전송): 전송된 것으로 처리
+                        tx_hash = signed_txn.hash
+                    except Exception:
+                        # 연결 오류 등: 노드가 받았을 수 있으므로 복구 작업에 맡기고 계정 상태를 다시 조회
+                        signer.reset()
+                        raise
+                    signer.next_nonce = nonce + 1
+                    logger.debug("Transaction sent: %s", tx_hash.hex())
+                    if journal:
+                        journal.broadcast()
+            
+            with mint_stage("receipt"):
+                # 트랜잭션 영수증 대기 (오래 걸리면 수수료를 올려 교체)
+                logger.debug("Waiting for transaction receipt...")
+                receipt = wait_for_receipt_with_replacement(
+                    self.w3, account, transaction, tx_hash,
+                    on_replace=journal.replaced if journal else None,
+                )
+                logger.debug("Transaction confirmed in block %s", receipt.blockNumber)
             
             # 트랜잭션 상태 확인
             if receipt.status != 1:
+                if receipt.gasUsed >= transaction['gas']:
+                    # 가스 부족으로 실패했을 수 있으므로 다음 민팅에서 다시 추정
+                    fee_oracle.forget_gas_estimate(mint_function)
                 error_msg = f"Transaction failed with status {receipt.status}"
-                print(f"❌ {error_msg}")
+                if journal:
+                    journal.failed(error_msg)
                 raise Exception(error_msg)
             
-            print(f"✅ Transaction status: {receipt.status} (1 = success)")
-            print(f"   Gas used: {receipt.gasUsed} / {transaction['gas']}")
-            print(f"   Logs count: {len(receipt.logs)}")
-            print(f"🔍 Analyzing {len(receipt.logs)} logs for Transfer events...")
+            logger.debug("Gas used: %s / %s, logs: %s", receipt.gasUsed, transaction['gas'], len(receipt.logs))
             
-            # 트랜잭션이 실제로 성공했는지 확인 (gasUsed가 0이면 revert)
-            if receipt.gasUsed == transaction['gas']:
-                print(f"⚠️  Warning: All gas was used, transaction might have reverted")
+            with mint_stage("extract"):
+                token_id = self._extract_minted_token_id(contract, transaction, receipt, to_address)
+                if journal:
+                    journal.confirmed(token_id, receipt.transactionHash.hex(), receipt.blockNumber)
             
-            # 토큰 ID 추출 시도
-            token_id = None
-            
-            # 방법 0: 트랜잭션 반환값 확인 시도
-            try:
-                tx_result = self.w3.eth.call({
-                    'to': contract_address,
-                    'data': transaction['data'],
-                    'from': account.address,
-                }, receipt.blockNumber - 1)  # 이전 블록에서 call
-                
-                if tx_result and len(tx_result) > 0:
-                    # 반환값 디코딩 (uint256)
-                    decoded_result = int.from_bytes(tx_result, byteorder='big')
-                    print(f"   Transaction return value (from call): {decoded_result}")
-                    if decoded_result > 0:
-                        token_id = decoded_result
-                        print(f"✅ Using transaction return value: Token ID = {token_id}")
-            except Exception as e:
-                print(f"   Could not decode transaction return value: {e}")
-            
-            # 방법 1: 이벤트에서 토큰 ID 추출
-            zero_address = Web3.to_checksum_address('0x0000000000000000000000000000000000000000')
+            logger.info("NFT minted! Token ID: %s", token_id)
+            return (token_id, receipt.transactionHash.hex())
             
-            if receipt.logs:
-                # Transfer 이벤트 파싱
-                transfer_event = contract.events.Transfer()
-                contract_address_lower = contract_address.lower()
-                
-                for i, log in enumerate(receipt.logs):
+        except Exception:
+            logger.exception("Mint NFT error")
+            raise  # 예외를 다시 발생시켜서 상위에서 처리하도록
+        finally:
+            if signer:
+                signer_pool.release(signer)
+    
+    @staticmethod
+    def _mint_args(to_address: str, token_uri: str) -> list:
+        """mintRecipe 인자 (compact 컨트랙트는 URI 대신 CIDv0 다이제스트 bytes32)"""
+        if settings.NFT_CONTRACT_VARIANT == "compact":
+            return [to_address, cid_to_bytes32(token_uri)]
+        return [to_address, token_uri]
+    
+    def _mint_contract(self, contract_address: str):
+        """주소별 컨트랙트 인스턴스 (ABI는 한 번만 로드)"""
+        contract = self._contracts.get(contract_address)
+        if contract is None:
+            abi = self.load_contract_abi()
+            if not abi:
+                raise Exception("Failed to load contract ABI")
+            contract = self.w3.eth.contract(address=contract_address, abi=abi)
+            self._contracts[contract_address] = contract
+        return contract
+    
+    def _mint_preamble(self, contract_address: str, signer: Signer, mint_function, data: str) -> Tuple[SignerState, int]:
+        """
+        전송 전에 필요한 값을 한 번의 JSON-RPC 배치로 조회
+        
+        - 체인 ID: 처음 한 번
+        - 서명자의 잔액/대기 중 nonce/수수료: CHAIN_BLOCK_TIME 안에 조회한 값이 있으면 재사용
+        - 컨트랙트 코드: 주소별로 처음 한 번
+        - 가스 추정: 함수별 메모이제이션이 없을 때만
+        
+        eth_feeHistory가 실패하면(지원하지 않는 노드) eth_gasPrice를 쓰고, eth_estimateGas가 실패하면
+        단건 추정(이전 추정치 재사용 또는 revert 사유 그대로 예외)으로 넘어갑니다. 그 밖의 오류는 예외입니다.
+        """
+        sender = signer.address
+        state = signer.fresh_state()
+        gas_limit = fee_oracle.cached_gas_limit(mint_function)
+        
+        calls: List[Tuple[str, list]] = []
+        if self._chain_id is None:
+            calls.append(("eth_chainId", []))
+        if state is None:
+            calls += [
+                ("eth_blockNumber", []),
+                ("eth_getBalance", [sender, "latest"]),
+                ("eth_getTransactionCount", [sender, "pending"]),
+                ("eth_feeHistory", fee_oracle.fee_history_params()),
+                ("eth_gasPrice", []),
+            ]
+        if contract_address not in self._verified_contracts:
+            calls.append(("eth_getCode", [contract_address, "latest"]))
+        if gas_limit is None:
+            calls.append(("eth_estimateGas", [{"from": sender, "to": contract_address, "data": data}]))
+        if not calls:
+            return state, gas_limit
+        
+        results = dict(zip((method for method, _ in calls), batch_request(self.w3, calls, allow_errors=True)))
+        
+        def required(method: str):
+            value = results[method]
+            if isinstance(value, Exception):
+                raise value
+            return value
+        
+        if "eth_chainId" in results:
+            self._chain_id = int(required("eth_chainId"), 16)
+        if "eth_getCode" in results:
+            if required("eth_getCode") in (None, "0x", "0x0"):
+                raise Exception(f"No contract code found at address {contract_address}. This address is NOT a contract!")
+            self._verified_contracts.add(contract_address)
+        if state is None:
+            block_number = int(required("eth_blockNumber"), 16)
+            history = results["eth_feeHistory"]
+            if isinstance(history, Exception):
+                logger.debug("eth_feeHistory unavailable, using legacy gas price: %s", history)
+                history = None
+            fees = fee_oracle.fees_from_history(
+                block_number,
+                _decode_fee_history(history) if history else None,
+                lambda: int(required("eth_gasPrice"), 16),
+            )
+            state = SignerState(
+                block_number=block_number,
+                balance=int(required("eth_getBalance"), 16),
+                nonce=int(required("eth_getTransactionCount"), 16),
+                fees=fees,
+                fetched_at=time.monotonic(),
+            )
+            signer.state = state
+            signer_pool.record_balance(signer, state.balance)
+            logger.debug(
+                "Signer %s state at block %s: balance=%s nonce=%s", sender, block_number, state.balance, state.nonce
+            )
+        if gas_limit is None:
+            estimated = results["eth_estimateGas"]
+            if isinstance(estimated, Exception):
+                gas_limit = fee_oracle.estimate_gas(mint_function, sender)
+            else:
+                gas_limit = fee_oracle.remember_gas_estimate(mint_function, int(estimated, 16))
+        return state, gas_limit
+    
+    def _extract_minted_token_id(self, contract, transaction: dict, receipt: TxReceipt, to_address: str) -> int:
+        """
+        영수증에서 민팅된 토큰 ID 추출
+        
+        보통은 Transfer 로그만으로 끝나며(추가 RPC 없음), 로그가 없을 때만 대체 방법을 씁니다.
+        """
+        # 방법 1: 이벤트에서 토큰 ID 추출 (from이 0x0000...인 Transfer가 민팅 이벤트)
+        transfer = find_mint_transfer(receipt.logs, transaction['to'])
+        if transfer:
+            logger.debug("Found mint Transfer event! Token ID: %s, To: %s", transfer.token_id, transfer.to_address)
+            return transfer.token_id
+        
+        logger.warning("Token ID not found in Transfer events (logs: %s). Trying alternative methods...", len(receipt.logs))
+        
+        # 방법 2: 직전 블록 상태에서 같은 호출을 재실행해 반환값을 얻고 ownerOf로 확인
+        try:
+            TOKEN_ID_FALLBACKS.labels(method="replay_call").inc()
+            tx_result = self.w3.eth.call({
+                'to': transaction['to'],
+                'data': transaction['data'],
+                'from': transaction['from'],
+            }, receipt.blockNumber - 1)
+            if tx_result:
+                candidate = int.from_bytes(tx_result, byteorder='big')
+                owner = contract.functions.ownerOf(candidate).call(block_identifier=receipt.blockNumber)
+                if owner.lower() == to_address.lower():
+                    logger.debug("Using replayed call result: Token ID = %s", candidate)
+                    return candidate
+        except Exception as e:
+            logger.debug("Replay call failed: %s", e)
+        
+        # 방법 3: balanceOf 만큼 ownerOf를 순차 검색해 가장 큰 토큰 ID 사용
+        try:
+            balance = contract.functions.balanceOf(to_address).call(block_identifier=receipt.blockNumber)
+            logger.debug("Balance of %s: %s", to_address, balance)
+            if balance > 0:
+                TOKEN_ID_FALLBACKS.labels(method="ownerof_scan").inc()
+                found_tokens = []
+                for check_id in range(1000):
                     try:
-                        # 로그가 이 컨트랙트에서 발생한 것인지 확인
-                        if log.address.lower() != contract_address_lower:
-                            print(f"   Log {i}: Skipping (different contract: {log.address})")
-                            continue
-                        
-                        print(f"   Log {i}: Processing Transfer event from contract {log.address}")
-                        event = transfer_event.process_log(log)
-                        
-                        # Transfer 이벤트: Transfer(address indexed from, address indexed to, uint256 indexed tokenId)
-                        # from이 0x0000...이면 민팅 이벤트
-                        from_address = Web3.to_checksum_address(event['args']['from'])
-                        to_address = Web3.to_checksum_address(event['args']['to'])
-                        potential_token_id = event['args']['tokenId']
-                        
-                        print(f"      From: {from_address}, To: {to_address}, TokenID: {potential_token_id}")
-                        
-                        if from_address == zero_address:
-                            token_id = potential_token_id
-                            print(f"✅ Found mint Transfer event! Token ID: {token_id}")
+                        owner = contract.functions.ownerOf(check_id).call(block_identifier=receipt.blockNumber)
+                    except Exception:
+                        continue  # 토큰이 존재하지 않으면 계속
+                    if owner.lower() == to_address.lower():
+                        found_tokens.append(check_id)
+                        if len(found_tokens) >= balance:
                             break
-                    except Exception as e:
-                        # 이벤트 파싱 실패 시 다음 로그 시도
-                        print(f"   Log {i}: Failed to parse Transfer event: {e}")
-                        continue
-            
-            # 토큰 ID를 찾지 못한 경우 대안 방법 시도
-            if token_id is None:
-                print(f"⚠️  Token ID not found in Transfer events (logs: {len(receipt.logs)}). Trying alternative methods...")
-                
-                # 방법 0: 예상 토큰 ID 사용 (call로 미리 얻은 값)
-                if expected_token_id is not None:
-                    try:
-                        # 예상 토큰 ID가 실제로 해당 주소에 속하는지 확인
-                        owner = contract.functions.ownerOf(expected_token_id).call()
-                        if owner.lower() == to_address.lower():
-                            token_id = expected_token_id
-                            print(f"✅ Using pre-call token ID: {token_id}")
-                    except Exception as e:
-                        print(f"   Pre-call token ID verification failed: {e}")
-                
-                # 방법 1: balanceOf를 사용하여 최신 토큰 ID 찾기
-                try:
-                    print(f"   Method 1: Using balanceOf to find latest token...")
-                    # 블록이 확정될 때까지 잠시 대기
-                    import time
-                    time.sleep(2)  # 2초 대기
-                    
-                    balance_after = contract.functions.balanceOf(to_address).call()
-                    print(f"      Balance before: {balance_before}, Balance after: {balance_after}")
-                    
-                    if balance_after > balance_before:
-                        # balance가 증가했다면, 새로 민팅된 토큰을 찾아야 함
-                        print(f"      Balance increased! Searching for new token...")
-                        
-                        # 효율적인 검색: 작은 범위부터 시작
-                        # 일반적으로 토큰 ID는 순차적으로 증가하므로, 0부터 시작
-                        max_search = 1000  # 최대 1000개까지 검색
-                        found_tokens = []
-                        
-                        # 순차적으로 검색하여 to_address가 소유한 모든 토큰 찾기
-                        for check_id in range(max_search):
-                            try:
-                                owner = contract.functions.ownerOf(check_id).call()
-                                if owner.lower() == to_address.lower():
-                                    found_tokens.append(check_id)
-                                    print(f"      Found token {check_id} owned by {to_address}")
-                                    # balance_after만큼 찾았으면 중단
-                                    if len(found_tokens) >= balance_after:
-                                        break
-                            except Exception:
-                                # 토큰이 존재하지 않으면 계속
-                                continue
-                        
-                        if found_tokens:
-                            # balance_before 이후의 토큰만 필터링 (새로 민팅된 것)
-                            new_tokens = found_tokens[balance_before:]
-                            if new_tokens:
-                                # 가장 큰 토큰 ID가 최신일 가능성이 높음
-                                token_id = max(new_tokens)
-                                print(f"✅ Using balanceOf method: New Token ID = {token_id}")
-                            else:
-                                # 모든 토큰이 새 것일 수도 있음
-                                token_id = max(found_tokens)
-                                print(f"✅ Using balanceOf method (fallback): Latest Token ID = {token_id}")
-                        else:
-                            print(f"      Could not find any tokens owned by {to_address}")
-                    elif balance_after > 0:
-                        # balance가 증가하지 않았지만 0보다 크면, 기존 토큰 중 최신 것 사용
-                        print(f"      Balance did not increase, but balance > 0. Searching...")
-                        # 위와 동일한 검색 로직
-                        for check_id in range(1000):
-                            try:
-                                owner = contract.functions.ownerOf(check_id).call()
-                                if owner.lower() == to_address.lower():
-                                    found_tokens.append(check_id)
-                                    if len(found_tokens) >= balance_after:
-                                        break
-                            except Exception:
-                                continue
-                        
-                        if found_tokens:
-                            token_id = max(found_tokens)
-                            print(f"✅ Using balanceOf fallback: Latest Token ID = {token_id}")
-                    else:
-                        print(f"      Balance is 0, cannot determine token ID")
-                except Exception as e:
-                    print(f"   balanceOf method failed: {e}")
-                    import traceback
-                    traceback.print_exc()
-                
-                # 방법 2: 트랜잭션 반환값 디코딩 시도 (일반적으로 불가능하지만 시도)
-                if token_id is None:
-                    try:
-                        print(f"   Method 2: Attempting to decode transaction return value...")
-                        # 트랜잭션 반환값은 receipt에 없으므로, 트랜잭션을 다시 call로 실행
-                        # 하지만 이미 실행된 트랜잭션이므로 이 방법은 작동하지 않음
-                        # 대신 트랜잭션 데이터를 디코딩하여 확인
-                        tx = self.w3.eth.get_transaction(tx_hash)
-                        print(f"      Transaction data length: {len(tx.input)}")
-                    except Exception as e:
-                        print(f"   Transaction decoding failed: {e}")
-                
-                # 방법 3: 모든 로그를 자세히 출력
-                if token_id is None and receipt.logs:
-                    print(f"   Method 3: Detailed log analysis:")
-                    for i, log in enumerate(receipt.logs):
-                        print(f"      Log {i}:")
-                        print(f"         Address: {log.address}")
-                        print(f"         Topics: {[t.hex() if hasattr(t, 'hex') else str(t) for t in log.topics]}")
-                        print(f"         Data: {log.data.hex() if hasattr(log.data, 'hex') else str(log.data)}")
-                elif token_id is None:
-                    print(f"   ⚠️  No logs found in transaction receipt!")
-                    print(f"      This might indicate:")
-                    print(f"      1. Contract doesn't emit Transfer events")
-                    print(f"      2. Transaction reverted silently")
-                    print(f"      3. Contract address or ABI mismatch")
-            
-            # 여전히 토큰 ID를 찾지 못한 경우, 트랜잭션이 실제로 성공했는지 확인
-            if token_id is None:
-                # 트랜잭션이 실제로 revert되었는지 확인
-                try:
-                    # 트랜잭션을 다시 call하여 확인
-                    print(f"   Verifying transaction actually succeeded...")
-                    call_result = mint_function.call({'from': account.address})
-                    if call_result is not None:
-                        token_id = call_result
-                        print(f"✅ Using call result after transaction: Token ID = {token_id}")
-                except Exception as e:
-                    print(f"   Call verification failed: {e}")
-            
-            # 여전히 토큰 ID를 찾지 못한 경우 에러
-            if token_id is None:
-                # 컨트랙트 코드 재확인
-                contract_code_issue = ""
-                try:
-                    code = self.w3.eth.get_code(contract_address)
-                    if code == b'' or code == '0x':
-                        contract_code_issue = f" CRITICAL: No contract code at {contract_address} - this is NOT a contract!"
-                except Exception:
-                    pass
-                
-                error_msg = (
-                    f"Failed to extract token ID. "
-                    f"Transaction hash: {receipt.transactionHash.hex()}, "
-                    f"Logs: {len(receipt.logs)}, "
-                    f"Status: {receipt.status}, "
-                    f"Gas used: {receipt.gasUsed}.{contract_code_issue} "
-                    f"Possible issues: 1) Contract address is incorrect ({contract_address}), "
-                    f"2) Contract is not deployed on Sepolia, "
-                    f"3) Contract does not emit Transfer events, "
-                    f"4) Transaction did not actually mint an NFT, "
-                    f"5) Contract ABI does not match deployed contract. "
-                    f"View transaction: https://sepolia.etherscan.io/tx/{receipt.transactionHash.hex()}"
-                )
-                print(f"❌ {error_msg}")
-                raise Exception(error_msg)
-            
-            print(f"🎉 NFT minted! Token ID: {token_id}")
-            return (token_id, receipt.transactionHash.hex())
-            
+                if found_tokens:
+                    # 가장 큰 토큰 ID가 최신일 가능성이 높음
+                    logger.debug("Using balanceOf method: Latest Token ID = %s", max(found_tokens))
+                    return max(found_tokens)
         except Exception as e:
-            error_msg = f"Mint NFT error: {str(e)}"
-            print(f"❌ {error_msg}")
-            import traceback
-            traceback.print_exc()
-            raise  # 예외를 다시 발생시켜서 상위에서 처리하도록
+            logger.debug("balanceOf method failed: %s", e, exc_info=True)
+        
+        # 모든 로그를 자세히 출력 (DEBUG일 때만 토픽을 hex로 변환)
+        if receipt.logs:
+            if logger.isEnabledFor(logging.DEBUG):
+                for i, log in enumerate(receipt.logs):
+                    logger.debug(
+                        "Log %s: address=%s topics=%s data=%s", i, log.address,
+                        [t.hex() if hasattr(t, 'hex') else str(t) for t in log.topics],
+                        log.data.hex() if hasattr(log.data, 'hex') else str(log.data),
+                    )
+        else:
+            logger.warning(
+                "No logs found in transaction receipt (contract may not emit Transfer events, "
+                "transaction may have reverted silently, or contract address/ABI mismatch)"
+            )
+        
+        contract_address = transaction['to']
+        error_msg = (
+            f"Failed to extract token ID. "
+            f"Transaction hash: {receipt.transactionHash.hex()}, "
+            f"Logs: {len(receipt.logs)}, "
+            f"Status: {receipt.status}, "
+            f"Gas used: {receipt.gasUsed}. "
+            f"Possible issues: 1) Contract address is incorrect ({contract_address}), "
+            f"2) Contract is not deployed on Sepolia, "
+            f"3) Contract does not emit Transfer events, "
+            f"4) Transaction did not actually mint an NFT, "
+            f"5) Contract ABI does not match deployed contract. "
+            f"View transaction: https://sepolia.etherscan.io/tx/{receipt.transactionHash.hex()}"
+        )
+        raise Exception(error_msg)
     
     def get_contract_address_from_transaction(self, tx_hash: str) -> Optional[str]:
         """
@@ -442,7 +452,7 @@ class Web3Service:
                 return Web3.to_checksum_address(tx['to'])
             return None
         except Exception as e:
-            print(f"Get contract address from transaction error: {e}")
+            logger.debug("Get contract address from transaction error: %s", e)
             return None
     
     def get_token_id_from_transaction(self, contract_address: str, tx_hash: str) -> Optional[int]:
@@ -457,96 +467,66 @@ class Web3Service:
             token_id 또는 None
         """
         if not self.is_connected():
-            print(f"Web3 not connected. Provider: {settings.WEB3_PROVIDER_URL}")
+            logger.debug("Web3 not connected. Provider: %s", settings.WEB3_PROVIDER_URL)
             return None
         
         try:
-            print(f"🔍 Fetching transaction receipt for: {tx_hash}")
+            logger.debug("Fetching transaction receipt for: %s", tx_hash)
             # 트랜잭션 영수증 가져오기
             receipt = self.w3.eth.get_transaction_receipt(tx_hash)
-            print(f"✅ Transaction receipt received. Block: {receipt.blockNumber}, Status: {receipt.status}, Logs: {len(receipt.logs)}")
+            logger.debug("Transaction receipt received. Block: %s, Status: %s, Logs: %s", receipt.blockNumber, receipt.status, len(receipt.logs))
             
             # 트랜잭션 상태 확인
             if receipt.status != 1:
-                print(f"❌ Transaction failed with status {receipt.status}")
+                logger.error("Transaction failed with status %s", receipt.status)
                 return None
             
             # 트랜잭션 정보 가져오기
             tx = self.w3.eth.get_transaction(tx_hash)
-            print(f"   Transaction from: {tx['from']}, to: {tx['to']}")
+            logger.debug("Transaction from: %s, to: %s", tx['from'], tx['to'])
             
             # ABI 로드
             abi = self.load_contract_abi()
             if not abi:
-                print("❌ Failed to load ABI")
+                logger.error("Failed to load ABI")
                 return None
             
             # 컨트랙트 인스턴스 생성
             contract_address = Web3.to_checksum_address(contract_address)
             contract = self.get_contract(contract_address, abi)
             if not contract:
-                print(f"❌ Failed to create contract instance for: {contract_address}")
+                logger.error("Failed to create contract instance for: %s", contract_address)
                 return None
             
             # 컨트랙트 코드 확인 (컨트랙트가 실제로 배포되었는지)
             try:
                 code = self.w3.eth.get_code(contract_address)
                 if code == b'' or code == '0x':
-                    print(f"⚠️  Warning: No contract code found at address {contract_address}")
-                    print(f"   This address might not be a contract or contract is not deployed")
+                    logger.warning("No contract code found at address %s", contract_address)
+                    logger.debug("This address might not be a contract or contract is not deployed")
             except Exception as e:
-                print(f"⚠️  Warning: Could not verify contract code: {e}")
+                logger.warning("Could not verify contract code: %s", e)
             
             # 방법 1: Transfer 이벤트에서 토큰 ID 추출
-            zero_address = Web3.to_checksum_address('0x0000000000000000000000000000000000000000')
-            transfer_event = contract.events.Transfer()
-            
-            print(f"🔍 Checking {len(receipt.logs)} logs for Transfer events...")
+            logger.debug("Checking %s logs for Transfer events...", len(receipt.logs))
             token_id = None
-            mint_to_address = None
-            
-            for i, log in enumerate(receipt.logs):
-                try:
-                    # 로그가 이 컨트랙트에서 발생한 것인지 확인
-                    if log.address.lower() != contract_address.lower():
-                        print(f"   Log {i}: Skipping (different contract: {log.address})")
-                        continue
-                    
-                    event = transfer_event.process_log(log)
-                    from_address = Web3.to_checksum_address(event['args']['from'])
-                    to_address = Web3.to_checksum_address(event['args']['to'])
-                    potential_token_id = event['args']['tokenId']
-                    
-                    print(f"   Log {i}: Transfer event - from: {from_address}, to: {to_address}, tokenId: {potential_token_id}")
-                    
-                    if from_address == zero_address:
-                        token_id = potential_token_id
-                        mint_to_address = to_address
-                        print(f"✅ Found mint Transfer event! Token ID: {token_id}, To: {mint_to_address}")
-                        break
-                except Exception as e:
-                    print(f"   Log {i}: Failed to parse Transfer event: {e}")
-                    continue
+            transfer = find_mint_transfer(receipt.logs, contract_address)
+            if transfer:
+                token_id = transfer.token_id
+                logger.debug("Found mint Transfer event! Token ID: %s, To: %s", token_id, transfer.to_address)
             
             # 방법 2: Transfer 이벤트가 없을 때 balanceOf 사용
             if token_id is None:
-                print(f"⚠️  No mint Transfer event found. Trying balanceOf method...")
+                logger.warning("No mint Transfer event found. Trying balanceOf method...")
                 
                 # 트랜잭션 입력 데이터에서 민팅 대상 주소 추출 시도
                 mint_to_address = None
                 try:
-                    # tx.input은 HexBytes이거나 문자열일 수 있음
-                    input_hex = tx.input.hex() if hasattr(tx.input, 'hex') else str(tx.input)
-                    
-                    # mintRecipe 함수 시그니처: 0x675f0173
-                    if input_hex.startswith('0x675f0173') and len(input_hex) >= 138:
-                        # mintRecipe(address to, string tokenURI)
-                        # 함수 시그니처(4 bytes) + to 주소(32 bytes, 패딩 포함)
-                        to_address_hex = input_hex[34:74]  # 0x prefix 제거 후 34-74 (20 bytes = 40 hex chars)
-                        mint_to_address = Web3.to_checksum_address('0x' + to_address_hex)
-                        print(f"   Extracted mint target from input data: {mint_to_address}")
+                    mint_to_address = decode_mint_recipient(tx.input)
+                    if mint_to_address:
+                        logger.debug("Extracted mint target from input data: %s", mint_to_address)
                 except Exception as e:
-                    print(f"   Failed to extract mint target from input: {e}")
+                    logger.debug("Failed to extract mint target from input: %s", e)
                 
                 # 입력 데이터에서 추출 실패 시 트랜잭션 정보 사용
                 if not mint_to_address:
@@ -554,11 +534,11 @@ class Web3Service:
                     if tx_to and tx_to.lower() == contract_address.lower():
                         # 컨트랙트에 직접 호출한 경우, 발신자가 민팅 대상일 가능성이 높음
                         mint_to_address = Web3.to_checksum_address(tx['from'])
-                        print(f"   Transaction to contract. Assuming mint to: {mint_to_address}")
+                        logger.debug("Transaction to contract. Assuming mint to: %s", mint_to_address)
                     else:
                         # 'to' 주소가 민팅 대상일 수 있음
                         mint_to_address = Web3.to_checksum_address(tx_to) if tx_to else None
-                        print(f"   Transaction to: {mint_to_address}")
+                        logger.debug("Transaction to: %s", mint_to_address)
                 
                 if mint_to_address:
                     try:
@@ -567,13 +547,14 @@ class Web3Service:
                         
                         # balanceOf로 소유한 토큰 찾기
                         balance = contract.functions.balanceOf(mint_to_address).call()
-                        print(f"   Balance of {mint_to_address}: {balance}")
+                        logger.debug("Balance of %s: %s", mint_to_address, balance)
                         
                         if balance > 0:
                             # 소유한 모든 토큰 찾기
                             max_search = 1000
                             found_tokens = []
                             
+                            TOKEN_ID_FALLBACKS.labels(method="ownerof_scan").inc()
                             for check_id in range(max_search):
                                 try:
                                     owner = contract.functions.ownerOf(check_id).call()
@@ -587,70 +568,62 @@ class Web3Service:
                             if found_tokens:
                                 # 가장 큰 토큰 ID가 최신일 가능성이 높음
                                 token_id = max(found_tokens)
-                                print(f"✅ Using balanceOf method: Token ID = {token_id}")
+                                logger.debug("Using balanceOf method: Token ID = %s", token_id)
                             else:
-                                print(f"   Could not find any tokens owned by {mint_to_address}")
+                                logger.debug("Could not find any tokens owned by %s", mint_to_address)
                         else:
-                            print(f"   Balance is 0, cannot determine token ID")
+                            logger.debug("Balance is 0, cannot determine token ID")
                     except Exception as e:
-                        print(f"   balanceOf method failed: {e}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.debug("balanceOf method failed: %s", e, exc_info=True)
             
             # 방법 3: 트랜잭션 입력 데이터 디코딩 시도
             if token_id is None:
-                print(f"⚠️  Trying to decode transaction input data...")
+                logger.debug("Trying to decode transaction input data...")
                 try:
                     # tx.input은 HexBytes이거나 문자열일 수 있음
                     input_hex = tx.input.hex() if hasattr(tx.input, 'hex') else str(tx.input)
                     
                     # mintRecipe 함수 시그니처: 0x675f0173
                     if input_hex.startswith('0x675f0173'):
-                        print(f"   Transaction is mintRecipe call")
+                        logger.debug("Transaction is mintRecipe call")
                         # to 주소는 input[4:68]에 있음 (32 bytes, 패딩 포함)
                         # 하지만 토큰 ID는 반환값이므로 입력에서 알 수 없음
-                        print(f"   Cannot extract token ID from input data (it's a return value)")
+                        logger.debug("Cannot extract token ID from input data (it's a return value)")
                 except Exception as e:
-                    print(f"   Input decoding failed: {e}")
+                    logger.debug("Input decoding failed: %s", e)
             
-            # 방법 4: 모든 로그 상세 출력
-            if token_id is None and receipt.logs:
-                print(f"⚠️  Detailed log analysis:")
+            # 방법 4: 모든 로그 상세 출력 (DEBUG일 때만 토픽을 hex로 변환)
+            if token_id is None and receipt.logs and logger.isEnabledFor(logging.DEBUG):
                 for i, log in enumerate(receipt.logs):
-                    print(f"   Log {i}:")
-                    print(f"      Address: {log.address}")
-                    print(f"      Topics: {[t.hex() if hasattr(t, 'hex') else str(t) for t in log.topics]}")
-                    print(f"      Data: {log.data.hex() if hasattr(log.data, 'hex') else str(log.data)}")
+                    logger.debug(
+                        "Log %s: address=%s topics=%s data=%s", i, log.address,
+                        [t.hex() if hasattr(t, 'hex') else str(t) for t in log.topics],
+                        log.data.hex() if hasattr(log.data, 'hex') else str(log.data),
+                    )
             
             if token_id is None:
-                print(f"❌ Could not extract token ID from transaction")
-                print(f"   Transaction: https://sepolia.etherscan.io/tx/{tx_hash}")
-                print(f"   Possible issues:")
-                print(f"   1. Contract address might be incorrect: {contract_address}")
-                print(f"   2. Contract might not be deployed on Sepolia")
-                print(f"   3. Contract might not emit Transfer events")
-                print(f"   4. Transaction might not have actually minted an NFT")
-                print(f"   5. Contract ABI might not match the deployed contract")
+                logger.error(
+                    "Could not extract token ID from transaction %s (contract %s). "
+                    "Check the contract address/network, Transfer events and ABI: https://sepolia.etherscan.io/tx/%s",
+                    tx_hash, contract_address, tx_hash,
+                )
                 
                 # 컨트랙트 코드 확인
                 try:
                     code = self.w3.eth.get_code(contract_address)
                     if code == b'' or code == '0x':
-                        print(f"   ⚠️  CRITICAL: No contract code found at {contract_address}")
-                        print(f"      This address is NOT a contract!")
+                        logger.error("No contract code found at %s; this address is NOT a contract", contract_address)
                     else:
-                        print(f"   ✅ Contract code found (length: {len(code)} bytes)")
+                        logger.debug("Contract code found (length: %s bytes)", len(code))
                 except Exception as e:
-                    print(f"   ⚠️  Could not verify contract code: {e}")
+                    logger.warning("Could not verify contract code: %s", e)
                 
                 return None
             
             return token_id
             
-        except Exception as e:
-            print(f"❌ Get token ID from transaction error: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Get token ID from transaction error")
             return None
     
     def get_token_id_from_etherscan(self, tx_hash: str, network: str = "sepolia") -> Optional[int]:
@@ -664,6 +637,7 @@ class Web3Service:
         Returns:
             token_id 또는 None
         """
+        TOKEN_ID_FALLBACKS.labels(method="etherscan").inc()
         try:
             import requests
             
@@ -691,29 +665,15 @@ class Web3Service:
             if data.get("status") != "1" or not data.get("result"):
                 return None
             
-            receipt = data["result"]
-            logs = receipt.get("logs", [])
-            
-            # Transfer 이벤트 찾기 (topic[0] == Transfer event signature)
-            # Transfer(address,address,uint256) = 0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef
-            transfer_event_signature = "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
-            zero_address = "0x0000000000000000000000000000000000000000"
-            
-            for log in logs:
-                topics = log.get("topics", [])
-                if len(topics) >= 4 and topics[0].lower() == transfer_event_signature.lower():
-                    # topics[1] = from, topics[2] = to, topics[3] = tokenId
-                    from_address = "0x" + topics[1][-40:]  # 마지막 40자리 (주소)
-                    token_id_hex = topics[3]
-                    
-                    if from_address.lower() == zero_address.lower():
-                        token_id = int(token_id_hex, 16)
-                        return token_id
+            # Transfer 이벤트 토픽에서 민팅된 토큰 ID 추출
+            transfer = find_mint_transfer(data["result"].get("logs", []))
+            if transfer:
+                return transfer.token_id
             
             return None
             
         except Exception as e:
-            print(f"Etherscan API error: {e}")
+            logger.debug("Etherscan API error: %s", e)
             return None
 
 web3_service = Web3Service()
@@ -0,0 +1,91 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator
+import logging
+from app.config import settings
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+    from opentelemetry.trace import Status, StatusCode
+except ImportError:  # 트레이싱을 쓰지 않으면 opentelemetry 없이도 동작
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+_enabled = False
+
+def _create_exporter():
+    """OTEL_EXPORTER 설정에 따른 스팬 내보내기 대상"""
+    if settings.OTEL_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return BatchSpanProcessor(OTLPSpanExporter(endpoint=settings.OTEL_EXPORTER_OTLP_ENDPOINT))
+    if settings.OTEL_EXPORTER == "file":
+        # 테스트용: 스팬을 한 줄에 하나씩 JSON으로 기록 (즉시 기록되도록 동기 처리)
+        out = open(settings.OTEL_TRACE_FILE, "a", encoding="utf-8")
+        exporter = ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+        return SimpleSpanProcessor(exporter)
+    if settings.OTEL_EXPORTER == "console":
+        return BatchSpanProcessor(ConsoleSpanExporter())
+    raise ValueError(f"Unknown OTEL_EXPORTER: {settings.OTEL_EXPORTER}")
+
+def setup_tracing(app, engine) -> bool:
+    """
+    OpenTelemetry 트레이싱 구성 (OTEL_ENABLED=true일 때만)
+
+    FastAPI 요청, SQLAlchemy 쿼리, requests 호출(Pinata, web3 HTTPProvider)을 자동 계측하고
+    민팅 단계/RPC 메서드 스팬은 mint_stage()와 rpc_tracing_middleware가 추가합니다.
+    """
+    global _enabled
+    if not settings.OTEL_ENABLED or _enabled:
+        return _enabled
+    if trace is None:
+        logger.warning("OTEL_ENABLED is set but opentelemetry packages are not installed")
+        return False
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.requests import RequestsInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(_create_exporter())
+    trace.set_tracer_provider(provider)
+
+    FastAPIInstrumentor.instrument_app(app, excluded_urls="metrics,health")
+    SQLAlchemyInstrumentor().instrument(engine=engine)
+    RequestsInstrumentor().instrument()
+    _enabled = True
+    logger.info("Tracing enabled (exporter=%s)", settings.OTEL_EXPORTER)
+    return True
+
+def shutdown_tracing() -> None:
+    """대기 중인 스팬을 내보내고 종료"""
+    if _enabled:
+        trace.get_tracer_provider().shutdown()
+
+@contextmanager
+def start_span(name: str, **attributes) -> Iterator[None]:
+    """현재 트레이스의 자식 스팬 (트레이싱이 꺼져 있으면 아무것도 하지 않음)"""
+    if not _enabled:
+        yield
+        return
+    tracer = trace.get_tracer("app")
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        try:
+            yield
+        except Exception as e:
+            span.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+
+def rpc_tracing_middleware(make_request: Callable, w3) -> Callable:
+    """JSON-RPC 메서드 이름으로 스팬을 만드는 web3 미들웨어 (HTTP 스팬의 부모)"""
+
+    def middleware(method, params):
+        with start_span(f"rpc {method}", **{"rpc.system": "jsonrpc", "rpc.method": method}):
+            response = make_request(method, params)
+            if _enabled and "error" in response:
+                trace.get_current_span().set_status(Status(StatusCode.ERROR, str(response["error"])))
+            return response
+
+    return middleware
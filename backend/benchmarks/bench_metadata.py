@@ -0,0 +1,33 @@
+"""NFT 메타데이터 생성/직렬화 마이크로벤치마크 (조리 단계 10 ~ 10,000개)"""
+import json
+import pytest
+from app.services.metadata import create_recipe_metadata
+from benchmarks.synthetic import make_recipe
+
+STEP_COUNTS = [10, 100, 1_000, 10_000]
+
+@pytest.mark.parametrize("steps", STEP_COUNTS)
+def bench_create_recipe_metadata(benchmark, alloc_profile, steps):
+    recipe = make_recipe(steps)
+    alloc_profile(create_recipe_metadata, recipe, image="ipfs://QmImage")
+    metadata = benchmark(create_recipe_metadata, recipe, image="ipfs://QmImage")
+    assert metadata["attributes"][1]["value"] == steps
+
+@pytest.mark.parametrize("steps", STEP_COUNTS)
+def bench_serialize_metadata(benchmark, alloc_profile, steps):
+    """IPFS/Pinata 업로드 직전의 JSON 직렬화"""
+    metadata = create_recipe_metadata(make_recipe(steps), image="ipfs://QmImage")
+    alloc_profile(json.dumps, metadata)
+    body = benchmark(json.dumps, metadata)
+    benchmark.extra_info["json_bytes"] = len(body)
+
+@pytest.mark.parametrize("steps", STEP_COUNTS)
+def bench_build_and_serialize_metadata(benchmark, alloc_profile, steps):
+    """민팅 경로 전체 (생성 + 직렬화)"""
+    recipe = make_recipe(steps)
+
+    def build():
+        return json.dumps(create_recipe_metadata(recipe, image="ipfs://QmImage"))
+
+    alloc_profile(build)
+    benchmark(build)
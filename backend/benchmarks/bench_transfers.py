@@ -0,0 +1,52 @@
+"""Transfer 로그/민팅 호출 데이터 디코딩 마이크로벤치마크 (로그 수백 개짜리 영수증)"""
+import json
+from pathlib import Path
+import pytest
+from web3 import Web3
+from app.services.transfers import decode_mint_recipient, find_mint_transfer
+from benchmarks.synthetic import CONTRACT_ADDRESS, RECIPIENT, make_mint_input, make_receipt_logs, to_etherscan_logs
+
+LOG_COUNTS = [1, 100, 500]
+ABI_PATH = Path(__file__).resolve().parents[1] / "app" / "contracts" / "RecipeNFT.abi.json"
+
+@pytest.mark.parametrize("count", LOG_COUNTS)
+def bench_find_mint_transfer(benchmark, alloc_profile, count):
+    """web3 영수증 (HexBytes 토픽), 민팅 로그가 맨 끝에 있는 최악의 경우"""
+    logs = make_receipt_logs(count)
+    alloc_profile(find_mint_transfer, logs, CONTRACT_ADDRESS)
+    transfer = benchmark(find_mint_transfer, logs, CONTRACT_ADDRESS)
+    assert transfer.token_id == 42 and transfer.to_address == RECIPIENT
+
+@pytest.mark.parametrize("count", LOG_COUNTS)
+def bench_find_mint_transfer_etherscan(benchmark, alloc_profile, count):
+    """Etherscan 프록시 응답 (16진 문자열 토픽)"""
+    logs = to_etherscan_logs(make_receipt_logs(count))
+    alloc_profile(find_mint_transfer, logs, CONTRACT_ADDRESS)
+    transfer = benchmark(find_mint_transfer, logs, CONTRACT_ADDRESS)
+    assert transfer.token_id == 42
+
+@pytest.mark.parametrize("count", LOG_COUNTS)
+def bench_process_log_reference(benchmark, count):
+    """비교 기준: 이전 구현처럼 contract.events.Transfer().process_log로 ABI 디코딩"""
+    abi = json.loads(ABI_PATH.read_text())
+    transfer_event = Web3().eth.contract(address=CONTRACT_ADDRESS, abi=abi).events.Transfer()
+    logs = make_receipt_logs(count)
+
+    def decode():
+        for log in logs:
+            if log.address.lower() != CONTRACT_ADDRESS.lower():
+                continue
+            try:
+                event = transfer_event.process_log(log)
+            except Exception:
+                continue
+            if int(event["args"]["from"], 16) == 0:
+                return event["args"]["tokenId"]
+        return None
+
+    assert benchmark(decode) == 42
+
+def bench_decode_mint_recipient(benchmark, alloc_profile):
+    data = make_mint_input()
+    alloc_profile(decode_mint_recipient, data)
+    assert benchmark(decode_mint_recipient, data) == RECIPIENT
@@ -0,0 +1,83 @@
+"""
+벤치마크용 로컬 체인 (hardhat node 또는 anvil) 실행 및 RecipeNFT 배포
+
+hardhat: onchain/ 에서 `npm install`이 되어 있어야 합니다.
+anvil: foundry의 anvil이 PATH에 있어야 하며, 바이트코드는 hardhat 컴파일 결과를 사용합니다.
+"""
+from pathlib import Path
+from typing import Optional, Tuple
+import json
+import subprocess
+import time
+import requests
+from web3 import Web3
+
+ONCHAIN_DIR = Path(__file__).resolve().parents[2] / "onchain"
+ARTIFACT_PATH = ONCHAIN_DIR / "artifacts" / "contracts" / "RecipeNFT.sol" / "RecipeNFT.json"
+
+# hardhat/anvil 공통 기본 계정 #0 (로컬 개발용으로 공개된 키)
+DEV_PRIVATE_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+class LocalChain:
+    def __init__(self, kind: str = "hardhat", port: int = 8545):
+        if kind not in ("hardhat", "anvil"):
+            raise ValueError(f"Unknown chain: {kind}")
+        self.kind = kind
+        self.port = port
+        self.url = f"http://127.0.0.1:{port}"
+        self._process: Optional[subprocess.Popen] = None
+
+    def start(self, timeout: float = 60) -> "LocalChain":
+        if self.kind == "hardhat":
+            command = ["npx", "hardhat", "node", "--port", str(self.port)]
+        else:
+            command = ["anvil", "--port", str(self.port), "--silent"]
+        self._process = subprocess.Popen(
+            command, cwd=ONCHAIN_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"{self.kind} exited with code {self._process.returncode}")
+            try:
+                response = requests.post(
+                    self.url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_chainId", "params": []}, timeout=1
+                )
+                if response.ok:
+                    return self
+            except requests.RequestException:
+                pass
+            time.sleep(0.5)
+        self.stop()
+        raise TimeoutError(f"{self.kind} did not start within {timeout}s")
+
+    def stop(self):
+        if self._process and self._process.poll() is None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        self._process = None
+
+def load_artifact(compile: bool = True) -> Tuple[list, str]:
+    """hardhat 컴파일 결과에서 (abi, bytecode) 로드"""
+    if compile or not ARTIFACT_PATH.exists():
+        subprocess.run(["npx", "hardhat", "compile", "--quiet"], cwd=ONCHAIN_DIR, check=True)
+    artifact = json.loads(ARTIFACT_PATH.read_text())
+    return artifact["abi"], artifact["bytecode"]
+
+def deploy_recipe_nft(rpc_url: str, private_key: str = DEV_PRIVATE_KEY) -> str:
+    """RecipeNFT 배포 후 컨트랙트 주소 반환"""
+    abi, bytecode = load_artifact()
+    w3 = Web3(Web3.HTTPProvider(rpc_url))
+    account = w3.eth.account.from_key(private_key)
+    contract = w3.eth.contract(abi=abi, bytecode=bytecode)
+    tx = contract.constructor().build_transaction({
+        "from": account.address,
+        "nonce": w3.eth.get_transaction_count(account.address),
+    })
+    signed = account.sign_transaction(tx)
+    tx_hash = w3.eth.send_raw_transaction(signed.rawTransaction)
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
+    return receipt.contractAddress
@@ -0,0 +1,103 @@
+"""
+벤치마크 결과를 기준선과 비교
+
+p95/p99 지연 시간 증가, 처리량 감소, 오류율 증가가 허용치를 넘으면 종료 코드 1을 반환합니다.
+기준선에 있는 워크로드/동시성이 현재 결과에 없으면(실행 중 전부 실패 등) 회귀로 봅니다.
+기준선에 없는 워크로드/동시성은 비교하지 않습니다.
+
+사용법: python -m benchmarks.compare benchmarks/baselines/sqlite.json result.json
+"""
+from dataclasses import dataclass
+from typing import List
+import argparse
+import json
+import sys
+
+@dataclass
+class Tolerances:
+    latency: float = 0.25  # p95/p99 허용 증가율
+    throughput: float = 0.20  # 처리량 허용 감소율
+    error_rate: float = 0.01  # 오류율 허용 증가폭 (절대값)
+    min_latency_ms: float = 2.0  # 이보다 작은 지연 시간 차이는 측정 잡음으로 보고 무시
+
+def compare_results(baseline: dict, current: dict, tolerances: Tolerances) -> List[str]:
+    """회귀 항목 설명 목록 (비어 있으면 통과)"""
+    regressions = []
+    for workload, levels in baseline["results"].items():
+        for concurrency, base in levels.items():
+            cur = current["results"].get(workload, {}).get(concurrency)
+            label = f"{workload}@{concurrency}"
+            if cur is None:
+                regressions.append(f"{label}: missing from current results")
+                continue
+            for metric in ("p95_ms", "p99_ms"):
+                limit = base[metric] * (1 + tolerances.latency)
+                if cur[metric] > limit and cur[metric] - base[metric] > tolerances.min_latency_ms:
+                    regressions.append(f"{label}: {metric} {base[metric]:.1f} -> {cur[metric]:.1f} (limit {limit:.1f})")
+            limit = base["throughput_rps"] * (1 - tolerances.throughput)
+            if cur["throughput_rps"] < limit:
+                regressions.append(
+                    f"{label}: throughput {base['throughput_rps']:.1f} -> {cur['throughput_rps']:.1f} rps (limit {limit:.1f})"
+                )
+            limit = base["error_rate"] + tolerances.error_rate
+            if cur["error_rate"] > limit:
+                regressions.append(f"{label}: error_rate {base['error_rate']:.4f} -> {cur['error_rate']:.4f}")
+    return regressions
+
+def format_table(baseline: dict, current: dict) -> str:
+    lines = [f"{'workload':<16}{'p95 base':>10}{'p95 now':>10}{'p99 base':>10}{'p99 now':>10}{'rps base':>10}{'rps now':>10}"]
+    for workload, levels in current["results"].items():
+        for concurrency, cur in levels.items():
+            base = baseline["results"].get(workload, {}).get(concurrency)
+            if base is None:
+                continue
+            lines.append(
+                f"{workload + '@' + concurrency:<16}"
+                f"{base['p95_ms']:>10.1f}{cur['p95_ms']:>10.1f}"
+                f"{base['p99_ms']:>10.1f}{cur['p99_ms']:>10.1f}"
+                f"{base['throughput_rps']:>10.1f}{cur['throughput_rps']:>10.1f}"
+            )
+    return "\n".join(lines)
+
+def add_tolerance_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = Tolerances()
+    parser.add_argument("--latency-tolerance", type=float, default=defaults.latency)
+    parser.add_argument("--throughput-tolerance", type=float, default=defaults.throughput)
+    parser.add_argument("--error-tolerance", type=float, default=defaults.error_rate)
+    parser.add_argument("--min-latency-ms", type=float, default=defaults.min_latency_ms)
+
+def tolerances_from_args(args: argparse.Namespace) -> Tolerances:
+    return Tolerances(
+        latency=args.latency_tolerance,
+        throughput=args.throughput_tolerance,
+        error_rate=args.error_tolerance,
+        min_latency_ms=args.min_latency_ms,
+    )
+
+def check(baseline: dict, current: dict, tolerances: Tolerances) -> int:
+    """비교 결과를 출력하고 종료 코드 반환"""
+    print(format_table(baseline, current))
+    regressions = compare_results(baseline, current, tolerances)
+    if regressions:
+        print("\nRegressions:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print("\nNo regressions")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results against a baseline")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    add_tolerance_arguments(parser)
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    sys.exit(check(baseline, current, tolerances_from_args(args)))
+
+if __name__ == "__main__":
+    main()
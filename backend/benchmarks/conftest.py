@@ -0,0 +1,43 @@
+"""
+마이크로벤치마크 공통 픽스처
+
+- 합성 레시피/영수증 생성기 (synthetic.py)
+- alloc_profile: tracemalloc으로 한 번 실행한 할당량을 benchmark.extra_info에 기록
+"""
+from typing import Callable
+import tracemalloc
+import pytest
+
+def pytest_addoption(parser):
+    parser.addoption("--alloc-top", type=int, default=0,
+                     help="실행 후 남아 있는 할당이 가장 큰 위치 N개를 출력")
+
+@pytest.fixture
+def alloc_profile(benchmark, request) -> Callable:
+    """
+    fn(*args)를 tracemalloc 아래에서 한 번 실행하고 최대/잔여 할당 바이트를 기록
+
+    시간 측정과 섞이지 않도록 benchmark 실행과 별도로 호출합니다.
+    """
+    top = request.config.getoption("--alloc-top")
+
+    def profile(fn: Callable, *args, **kwargs):
+        tracemalloc.start(25 if top else 1)
+        try:
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            result = fn(*args, **kwargs)
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot() if top else None
+        finally:
+            tracemalloc.stop()
+
+        benchmark.extra_info["alloc_peak_bytes"] = peak - before
+        benchmark.extra_info["alloc_retained_bytes"] = current - before
+        if snapshot:
+            print(f"\n[{request.node.name}] top {top} allocations:")
+            for stat in snapshot.statistics("lineno")[:top]:
+                print(f"  {stat}")
+        return result
+
+    return profile
@@ -0,0 +1,240 @@
+"""
+API 부하 테스트
+
+실행 중인 서버에 워크로드(list, detail, search, upload, mint)별로 지정한 동시성만큼
+요청을 보내고 p50/p95/p99 지연 시간과 처리량을 JSON으로 기록합니다.
+서버/체인/IPFS 준비까지 한 번에 하려면 benchmarks.run을 사용하세요.
+
+사용법: python -m benchmarks.load_test --base-url http://127.0.0.1:8000 --wallet 0x... --out result.json
+"""
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import io
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime, timezone
+import httpx
+
+WORKLOADS = ("list", "detail", "search", "upload", "mint")
+
+@dataclass
+class WorkloadContext:
+    client: httpx.AsyncClient
+    wallet: str
+    recipe_ids: List[int]
+    mint_queue: asyncio.Queue
+    image: bytes
+    rng: random.Random = field(default_factory=lambda: random.Random(0))
+
+# 워크로드별 요청 하나 (성공 여부를 상태 코드로 판단)
+async def _list(ctx: WorkloadContext) -> httpx.Response:
+    return await ctx.client.get("/api/recipes/", params={"skip": ctx.rng.randrange(0, 50), "limit": 20})
+
+async def _detail(ctx: WorkloadContext) -> httpx.Response:
+    return await ctx.client.get(f"/api/recipes/{ctx.rng.choice(ctx.recipe_ids)}")
+
+async def _search(ctx: WorkloadContext) -> httpx.Response:
+    # 전문 검색 엔드포인트가 없으므로 필터 조회(민팅 여부, 지갑별 레시피)로 대신함
+    if ctx.rng.random() < 0.5:
+        return await ctx.client.get("/api/recipes/", params={"is_minted": ctx.rng.random() < 0.5, "limit": 20})
+    return await ctx.client.get(f"/api/users/{ctx.wallet}/recipes")
+
+async def _upload(ctx: WorkloadContext) -> httpx.Response:
+    recipe_id = ctx.rng.choice(ctx.recipe_ids)
+    files = {"file": ("bench.jpg", ctx.image, "image/jpeg")}
+    return await ctx.client.post(f"/api/media/upload/{recipe_id}", params={"media_type": "photo"}, files=files)
+
+async def _mint(ctx: WorkloadContext) -> Optional[httpx.Response]:
+    try:
+        recipe_id = ctx.mint_queue.get_nowait()
+    except asyncio.QueueEmpty:
+        return None  # 민팅할 레시피 소진
+    return await ctx.client.post(f"/api/nft/mint/{recipe_id}", params={"wallet_address": ctx.wallet})
+
+HANDLERS: Dict[str, Callable[[WorkloadContext], Awaitable[Optional[httpx.Response]]]] = {
+    "list": _list,
+    "detail": _detail,
+    "search": _search,
+    "upload": _upload,
+    "mint": _mint,
+}
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (sorted_values는 오름차순)"""
+    if not sorted_values:
+        return 0.0
+    position = (len(sorted_values) - 1) * q
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """지연 시간(초) 목록을 ms 단위 통계로 요약"""
+    values = sorted(latencies)
+    total = len(values) + errors
+    ms = lambda seconds: round(seconds * 1000, 3)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p95_ms": ms(percentile(values, 0.95)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "mean_ms": ms(statistics.fmean(values)) if values else 0.0,
+        "max_ms": ms(values[-1]) if values else 0.0,
+    }
+
+async def run_workload(
+    ctx: WorkloadContext,
+    workload: str,
+    concurrency: int,
+    requests_per_level: int,
+    warmup: int = 0,
+) -> Dict[str, float]:
+    """한 워크로드를 동시성 concurrency로 requests_per_level번 실행"""
+    handler = HANDLERS[workload]
+    for _ in range(warmup):
+        await handler(ctx)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = requests_per_level
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await handler(ctx)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response is None:
+                remaining = 0
+                return
+            if response.is_success:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+def make_jpeg(size: int = 1024) -> bytes:
+    """업로드용 테스트 이미지 (Pillow로 생성)"""
+    from PIL import Image
+
+    rng = random.Random(size)
+    image = Image.new("RGB", (size, size))
+    image.putdata([(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(size * size)])
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=85)
+    return buffer.getvalue()
+
+async def run_load_test(
+    base_url: str,
+    wallet: str,
+    workloads: List[str],
+    concurrency_levels: List[int],
+    requests_per_level: int,
+    mint_concurrency: List[int],
+    warmup: int = 5,
+    image_size: int = 1024,
+    meta: Optional[dict] = None,
+) -> dict:
+    """모든 워크로드 x 동시성 조합을 실행하고 결과 문서를 반환"""
+    limits = httpx.Limits(max_connections=max(concurrency_levels + mint_concurrency) * 2)
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        response = await client.get(f"/api/users/{wallet}/recipes")
+        response.raise_for_status()
+        recipes = response.json()
+        recipe_ids = [recipe["id"] for recipe in recipes]
+        if not recipe_ids:
+            raise RuntimeError(f"No recipes found for {wallet}; seed the database first")
+
+        mint_queue: asyncio.Queue = asyncio.Queue()
+        for recipe in recipes:
+            if not recipe["is_minted"]:
+                mint_queue.put_nowait(recipe["id"])
+
+        ctx = WorkloadContext(
+            client=client,
+            wallet=wallet,
+            recipe_ids=recipe_ids,
+            mint_queue=mint_queue,
+            image=make_jpeg(image_size) if "upload" in workloads else b"",
+        )
+        results: Dict[str, Dict[str, dict]] = {}
+        for workload in workloads:
+            # 민팅은 서명 계정 하나의 nonce를 공유하므로 동시성을 따로 지정
+            levels = mint_concurrency if workload == "mint" else concurrency_levels
+            # 민팅은 레시피를 소모하므로 워밍업 없음
+            workload_warmup = 0 if workload == "mint" else warmup
+            results[workload] = {}
+            for concurrency in levels:
+                results[workload][str(concurrency)] = await run_workload(
+                    ctx, workload, concurrency, requests_per_level, workload_warmup
+                )
+
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests_per_level": requests_per_level,
+            **(meta or {}),
+        },
+        "results": results,
+    }
+
+def parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+def add_load_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--workloads", default=",".join(WORKLOADS), help="쉼표로 구분한 워크로드")
+    parser.add_argument("--concurrency", default="1,8,32", help="동시성 수준 (예: 1,8,32)")
+    parser.add_argument("--mint-concurrency", default="1", help="민팅 동시성 수준")
+    parser.add_argument("--requests", type=int, default=200, help="동시성 수준마다 보낼 요청 수")
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--image-size", type=int, default=1024, help="업로드 이미지 한 변 픽셀")
+
+def load_options(args: argparse.Namespace) -> dict:
+    workloads = [item.strip() for item in args.workloads.split(",") if item.strip()]
+    unknown = set(workloads) - set(WORKLOADS)
+    if unknown:
+        raise SystemExit(f"Unknown workloads: {', '.join(sorted(unknown))}")
+    return {
+        "workloads": workloads,
+        "concurrency_levels": parse_int_list(args.concurrency),
+        "mint_concurrency": parse_int_list(args.mint_concurrency),
+        "requests_per_level": args.requests,
+        "warmup": args.warmup,
+        "image_size": args.image_size,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test against a running backend")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--wallet", required=True, help="레시피를 소유한 지갑 주소")
+    parser.add_argument("--out", help="결과 JSON 파일 (없으면 stdout)")
+    add_load_arguments(parser)
+    args = parser.parse_args()
+
+    result = asyncio.run(run_load_test(args.base_url, args.wallet, **load_options(args)))
+    output = json.dumps(result, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+재현 가능한 벤치마크 실행기
+
+1. 임시 SQLite(기본) 또는 --database-url의 PostgreSQL에 테이블 생성
+2. 스텁 IPFS, 로컬 체인(hardhat/anvil) 실행 및 RecipeNFT 배포
+3. uvicorn으로 앱 실행 후 NDJSON 임포트로 레시피 시드
+4. 부하 테스트 결과를 JSON으로 저장하고, --compare가 있으면 기준선과 비교
+
+사용법 (backend/ 에서):
+    python -m benchmarks.run --chain hardhat --out benchmarks/results/latest.json
+    python -m benchmarks.run --chain none --concurrency 1,8 --save-baseline benchmarks/baselines/sqlite.json
+    python -m benchmarks.run --chain none --concurrency 1,8 --compare benchmarks/baselines/sqlite.json
+"""
+from contextlib import ExitStack
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import requests
+from benchmarks.compare import add_tolerance_arguments, check, tolerances_from_args
+from benchmarks.load_test import add_load_arguments, load_options, run_load_test
+from benchmarks.stub_ipfs import StubIPFSServer
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# 체인 없이 실행할 때 레시피 소유자 주소
+DEFAULT_WALLET = "0x" + "b" * 40
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def wait_for_health(base_url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/health", timeout=1).ok:
+                return
+        except requests.RequestException:
+            pass
+        time.sleep(0.25)
+    raise TimeoutError(f"Server did not become healthy within {timeout}s")
+
+def seed_recipes(base_url: str, wallet: str, count: int, steps: int) -> None:
+    """NDJSON 임포트로 레시피 count개 생성"""
+    lines = []
+    for i in range(count):
+        lines.append(json.dumps({
+            "recipe_name": f"Bench recipe {i}",
+            "ingredients": [f"ingredient {j}" for j in range(8)],
+            "cooking_tools": ["pan", "knife", "bowl"],
+            "cooking_steps": [f"step {j}: stir for {j} minutes" for j in range(steps)],
+            "machine_instructions": [{"action": "heat", "temperature": 180, "duration": 60}],
+            "wallet_address": wallet,
+        }))
+    response = requests.post(f"{base_url}/api/recipes/import", data="\n".join(lines).encode(), timeout=300)
+    response.raise_for_status()
+    result = response.json()
+    if result["failed"]:
+        raise RuntimeError(f"Seeding failed: {result['errors'][:3]}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend benchmark suite")
+    parser.add_argument("--database-url", help="PostgreSQL URL (기본: 임시 SQLite 파일)")
+    parser.add_argument("--chain", choices=("hardhat", "anvil", "none"), default="hardhat",
+                        help="none이면 모의 민팅 경로를 측정")
+    parser.add_argument("--chain-url", help="이미 실행 중인 노드 사용 (컨트랙트는 새로 배포)")
+    parser.add_argument("--seed", type=int, default=500, help="시드할 레시피 수")
+    parser.add_argument("--seed-steps", type=int, default=10, help="레시피당 조리 단계 수")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn 워커 프로세스 수")
+    parser.add_argument("--out", help="결과 JSON 파일")
+    parser.add_argument("--save-baseline", help="결과를 기준선 파일로 저장")
+    parser.add_argument("--compare", help="비교할 기준선 파일 (회귀 시 종료 코드 1)")
+    add_load_arguments(parser)
+    add_tolerance_arguments(parser)
+    args = parser.parse_args()
+    options = load_options(args)
+
+    with ExitStack() as stack:
+        workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="recipe-bench-")))
+        database_url = args.database_url or f"sqlite:///{workdir / 'bench.db'}"
+
+        ipfs = StubIPFSServer().start()
+        stack.callback(ipfs.stop)
+
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url,
+            "DEBUG": "false",
+            "LOG_LEVEL": "ERROR",  # 로그 출력이 측정값에 섞이지 않도록
+            "UPLOAD_DIR": str(workdir / "uploads"),
+            "STORAGE_BACKEND": "local",
+            "IPFS_HOST": "127.0.0.1",
+            "IPFS_PORT": str(ipfs.port),
+            "PINATA_API_KEY": "",
+            "PINATA_SECRET_KEY": "",
+            "OTEL_ENABLED": "false",
+        }
+
+        wallet = DEFAULT_WALLET
+        if args.chain == "none":
+            # 모의 민팅: 체인에 연결되지 않도록 컨트랙트 주소를 비움
+            env.update({"NFT_CONTRACT_ADDRESS": "", "PRIVATE_KEY": "", "WEB3_PROVIDER_URL": "http://127.0.0.1:1"})
+        else:
+            from benchmarks.chain import DEV_PRIVATE_KEY, LocalChain, deploy_recipe_nft
+            from web3 import Account
+
+            chain_url = args.chain_url
+            if not chain_url:
+                chain = LocalChain(args.chain, free_port()).start()
+                stack.callback(chain.stop)
+                chain_url = chain.url
+            contract_address = deploy_recipe_nft(chain_url)
+            wallet = Account.from_key(DEV_PRIVATE_KEY).address
+            env.update({
+                "WEB3_PROVIDER_URL": chain_url,
+                "NFT_CONTRACT_ADDRESS": contract_address,
+                "PRIVATE_KEY": DEV_PRIVATE_KEY,
+            })
+
+        subprocess.run([sys.executable, "init_db.py"], cwd=BACKEND_DIR, env=env, check=True,
+                       stdout=subprocess.DEVNULL)
+
+        port = free_port()
+        base_url = f"http://127.0.0.1:{port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+             "--workers", str(args.server_workers), "--no-access-log"],
+            cwd=BACKEND_DIR, env=env,
+        )
+        stack.callback(server.wait, 30)
+        stack.callback(server.terminate)
+        wait_for_health(base_url, server)
+
+        seed_recipes(base_url, wallet, args.seed, args.seed_steps)
+        result = asyncio.run(run_load_test(
+            base_url,
+            wallet,
+            meta={
+                "database": "postgresql" if args.database_url else "sqlite",
+                "chain": args.chain,
+                "seed": args.seed,
+                "seed_steps": args.seed_steps,
+                "server_workers": args.server_workers,
+            },
+            **options,
+        ))
+
+    output = json.dumps(result, indent=2) + "\n"
+    for path in filter(None, (args.out, args.save_baseline)):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(output)
+    if not args.out and not args.save_baseline:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        sys.exit(check(baseline, result, tolerances_from_args(args)))
+
+if __name__ == "__main__":
+    main()
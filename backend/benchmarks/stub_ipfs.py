@@ -0,0 +1,164 @@
+"""
+벤치마크용 IPFS HTTP API 스텁
+
+ipfshttpclient가 사용하는 /api/v0 엔드포인트(version, add, cat, pin/add, pin/rm, pin/ls)만
+메모리에서 흉내 냅니다. CID는 내용의 sha256 멀티해시를 base58로 인코딩한 CIDv0 형식입니다.
+(실제 IPFS의 청크/DAG 구조는 따르지 않으므로 값은 실제 노드와 다릅니다)
+
+단독 실행: python -m benchmarks.stub_ipfs --port 5001
+"""
+from email.parser import BytesParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Set
+from urllib.parse import parse_qs, urlparse
+import argparse
+import hashlib
+import json
+import threading
+
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+def base58_encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    encoded = ""
+    while number:
+        number, remainder = divmod(number, 58)
+        encoded = BASE58_ALPHABET[remainder] + encoded
+    leading_zeros = len(data) - len(data.lstrip(b"\0"))
+    return "1" * leading_zeros + encoded
+
+def content_cid(data: bytes) -> str:
+    """sha2-256 멀티해시(0x12 0x20 + digest)의 base58 = Qm..."""
+    return base58_encode(b"\x12\x20" + hashlib.sha256(data).digest())
+
+class StubIPFSStore:
+    def __init__(self):
+        self.blocks: Dict[str, bytes] = {}
+        self.pins: Set[str] = set()
+        self.lock = threading.Lock()
+
+    def add(self, data: bytes, pin: bool = True) -> str:
+        cid = content_cid(data)
+        with self.lock:
+            self.blocks[cid] = data
+            if pin:
+                self.pins.add(cid)
+        return cid
+
+class _Handler(BaseHTTPRequestHandler):
+    store: StubIPFSStore
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        # ipfshttpclient는 파일을 chunked 전송으로 보냄
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, payload, status: int = 200):
+        self._send(status, json.dumps(payload).encode() + b"\n")
+
+    def _error(self, message: str, status: int = 500):
+        self._json({"Message": message, "Code": 0, "Type": "error"}, status)
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        args = parse_qs(url.query).get("arg", [])
+        body = self._read_body()
+        store = self.store
+
+        if url.path == "/api/v0/version":
+            self._json({"Version": "0.8.0", "Commit": "stub", "Repo": "10", "System": "stub", "Golang": "stub"})
+        elif url.path == "/api/v0/add":
+            message = BytesParser().parsebytes(
+                b"Content-Type: " + self.headers["Content-Type"].encode() + b"\r\n\r\n" + body
+            )
+            lines = []
+            for part in message.get_payload():
+                data = part.get_payload(decode=True) or b""
+                cid = store.add(data)
+                lines.append(json.dumps({"Name": part.get_filename() or cid, "Hash": cid, "Size": str(len(data))}))
+            self._send(200, ("\n".join(lines) + "\n").encode())
+        elif url.path == "/api/v0/cat":
+            data: Optional[bytes] = store.blocks.get(args[0]) if args else None
+            if data is None:
+                self._error("block not found")
+            else:
+                self._send(200, data, "application/octet-stream")
+        elif url.path == "/api/v0/pin/add":
+            if not args or args[0] not in store.blocks:
+                self._error("block not found")
+                return
+            with store.lock:
+                store.pins.add(args[0])
+            self._json({"Pins": args})
+        elif url.path == "/api/v0/pin/rm":
+            with store.lock:
+                if not args or args[0] not in store.pins:
+                    self._error("not pinned or pinned indirectly")
+                    return
+                store.pins.discard(args[0])
+            self._json({"Pins": args})
+        elif url.path == "/api/v0/pin/ls":
+            with store.lock:
+                keys = {cid: {"Type": "recursive"} for cid in store.pins}
+            self._json({"Keys": keys})
+        else:
+            self._error(f"unknown endpoint {url.path}", 404)
+
+class StubIPFSServer:
+    """백그라운드 스레드에서 실행되는 스텁 IPFS 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.store = StubIPFSStore()
+        handler = type("StubIPFSHandler", (_Handler,), {"store": self.store})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self.httpd.server_address[1]
+
+    def start(self) -> "StubIPFSServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="stub-ipfs", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub IPFS HTTP API for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5001)
+    args = parser.parse_args()
+    server = StubIPFSServer(args.host, args.port)
+    print(f"Stub IPFS API listening on {args.host}:{server.port}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""마이크로벤치마크용 합성 데이터 (레시피, web3/Etherscan 영수증 로그)"""
+from typing import List
+import random
+from hexbytes import HexBytes
+from web3.datastructures import AttributeDict
+from app import models
+from app.services.transfers import MINT_RECIPE_SELECTOR, TRANSFER_EVENT_TOPIC
+
+CONTRACT_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+RECIPIENT = "0x70997970C51812dc3A010C7d01b50e0d17dc79C8"
+
+# ERC-1155 TransferSingle (토픽 4개지만 Transfer가 아닌 이벤트)
+TRANSFER_SINGLE_TOPIC = bytes.fromhex("c3d58168c5ae7397731d063d5bbf3d657854427343f4c083240f7aacaa2d0f62")
+
+def make_recipe(steps: int, seed: int = 0) -> models.Recipe:
+    """조리 단계 steps개를 가진 (DB에 저장하지 않은) 레시피"""
+    rng = random.Random(seed)
+    return models.Recipe(
+        id=seed + 1,
+        recipe_name=f"Synthetic recipe with {steps} steps",
+        ingredients=[f"ingredient {i} ({rng.randint(1, 500)}g)" for i in range(max(3, steps // 10))],
+        cooking_tools=["pan", "pot", "knife", "cutting board", "oven"],
+        cooking_steps=[
+            f"Step {i + 1}: stir the mixture for {rng.randint(1, 30)} minutes at {rng.randint(60, 220)}°C "
+            f"until it turns golden"
+            for i in range(steps)
+        ],
+        machine_instructions=[
+            {"step": i + 1, "action": rng.choice(["heat", "stir", "rest"]),
+             "temperature": rng.randint(60, 220), "duration": rng.randint(10, 600)}
+            for i in range(steps)
+        ],
+    )
+
+def _address_topic(address: str) -> bytes:
+    return bytes(12) + bytes.fromhex(address[2:])
+
+def _random_address(rng: random.Random) -> str:
+    return "0x" + rng.randbytes(20).hex()
+
+def make_receipt_logs(count: int, mint_position: float = 1.0, seed: int = 0) -> List[AttributeDict]:
+    """
+    web3 영수증 형식의 로그 count개
+
+    다른 컨트랙트의 ERC-20/ERC-721 Transfer, 같은 컨트랙트의 다른 이벤트 등을 섞고
+    전체의 mint_position 위치(0.0 = 처음, 1.0 = 마지막)에 민팅 Transfer 하나를 둡니다.
+    """
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count - 1):
+        kind = i % 4
+        if kind == 0:
+            # 다른 컨트랙트의 ERC-20 Transfer (tokenId 대신 data에 금액)
+            address = _random_address(rng)
+            topics = [TRANSFER_EVENT_TOPIC, _address_topic(_random_address(rng)), _address_topic(_random_address(rng))]
+            data = rng.randbytes(32)
+        elif kind == 1:
+            # 다른 컨트랙트의 ERC-721 민팅
+            address = _random_address(rng)
+            topics = [TRANSFER_EVENT_TOPIC, bytes(32), _address_topic(_random_address(rng)), rng.randbytes(32)]
+            data = b""
+        elif kind == 2:
+            # 같은 컨트랙트의 토큰 이전 (민팅 아님)
+            address = CONTRACT_ADDRESS
+            topics = [TRANSFER_EVENT_TOPIC, _address_topic(_random_address(rng)),
+                      _address_topic(_random_address(rng)), rng.randbytes(32)]
+            data = b""
+        else:
+            # 같은 컨트랙트의 다른 이벤트
+            address = CONTRACT_ADDRESS
+            topics = [TRANSFER_SINGLE_TOPIC, rng.randbytes(32), rng.randbytes(32), rng.randbytes(32)]
+            data = rng.randbytes(64)
+        logs.append(_log(address, topics, data, i))
+
+    mint = _log(
+        CONTRACT_ADDRESS,
+        [TRANSFER_EVENT_TOPIC, bytes(32), _address_topic(RECIPIENT), (42).to_bytes(32, "big")],
+        b"",
+        count - 1,
+    )
+    logs.insert(int((count - 1) * mint_position), mint)
+    for index, log in enumerate(logs):
+        logs[index] = AttributeDict({**log, "logIndex": index})
+    return logs
+
+def _log(address: str, topics: List[bytes], data: bytes, index: int) -> AttributeDict:
+    return AttributeDict({
+        "address": address,
+        "topics": [HexBytes(topic) for topic in topics],
+        "data": HexBytes(data),
+        "logIndex": index,
+        "blockNumber": 1,
+        "blockHash": HexBytes(bytes(32)),
+        "transactionHash": HexBytes(bytes(32)),
+        "transactionIndex": 0,
+    })
+
+def to_etherscan_logs(logs: List[AttributeDict]) -> List[dict]:
+    """Etherscan eth_getTransactionReceipt 응답 형식 (16진 문자열)"""
+    return [
+        {
+            "address": log["address"].lower(),
+            "topics": ["0x" + bytes(topic).hex() for topic in log["topics"]],
+            "data": "0x" + bytes(log["data"]).hex(),
+            "logIndex": hex(log["logIndex"]),
+        }
+        for log in logs
+    ]
+
+def make_mint_input(recipient: str = RECIPIENT, uri: str = "ipfs://QmSynthetic") -> HexBytes:
+    """mintRecipe(address,string) 호출 데이터"""
+    encoded_uri = uri.encode()
+    padded_uri = encoded_uri + bytes(-len(encoded_uri) % 32)
+    return HexBytes(
+        bytes.fromhex(MINT_RECIPE_SELECTOR)
+        + _address_topic(recipient)
+        + (64).to_bytes(32, "big")
+        + len(encoded_uri).to_bytes(32, "big")
+        + padded_uri
+    )
@@ -1,12 +1,57 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.config import settings
+from app.logging_config import setup_logging
+
+# 서비스 모듈이 import 시점에 남기는 로그도 같은 형식으로 출력되도록 가장 먼저 설정
+setup_logging()
+
+from app.database import engine, ping
+from app.metrics import PrometheusMiddleware, instrument_engine, metrics_endpoint
+from app.tracing import setup_tracing, shutdown_tracing
 from app.routers import recipes, users, media, nft
+from app.services.media_jobs import media_job_worker
+from app.services.renditions import rendition_service
+from app.services.pinning import pin_reconciler
+from app.services.receipts import receipt_watcher
+from app.services.mint_attempts import mint_recovery
+from app.services.holdings import holdings_indexer
+from app.services.ipfs import ipfs_service
+from app.services.readiness import readiness
+from app.services.web3 import web3_service
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 외부 서비스 연결을 동시에 시작하고 STARTUP_TIMEOUT초까지만 기다림 (GET /ready로 상태 확인)
+    await readiness.initialize(
+        {"database": ping, "ipfs": ipfs_service.connect, "web3": web3_service.connect},
+        timeout=settings.STARTUP_TIMEOUT,
+        required=("database",),
+    )
+    # 미디어 작업 워커 시작 (이전 프로세스에서 남은 작업도 이어서 처리)
+    media_job_worker.start()
+    # IPFS 핀 정합성 검사 (PIN_RECONCILE_INTERVAL > 0 일 때만)
+    pin_reconciler.start()
+    # 이전 프로세스에서 끝나지 않은 민팅 시도를 체인 상태와 맞춤 (이후 MINT_RECOVERY_INTERVAL 주기)
+    mint_recovery.start()
+    # Transfer 이벤트로 지갑별 보유 토큰 갱신 (HOLDINGS_INDEX_INTERVAL > 0 일 때만)
+    holdings_indexer.start()
+    yield
+    holdings_indexer.stop()
+    mint_recovery.stop()
+    pin_reconciler.stop()
+    receipt_watcher.stop()
+    media_job_worker.stop()
+    rendition_service.shutdown()
+    shutdown_tracing()
 
 app = FastAPI(
     title="Recipe NFT API",
     description="음식 레시피 NFT 플랫폼 API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -39,6 +84,14 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# 요청/쿼리 지표 수집 (/metrics)
+app.add_middleware(PrometheusMiddleware)
+instrument_engine(engine)
+app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
+# 분산 트레이싱 (OTEL_ENABLED=true일 때만, API → DB/IPFS/RPC)
+setup_tracing(app, engine)
+
 # 라우터 등록
 app.include_router(recipes.router, prefix="/api")
 app.include_router(users.router, prefix="/api")
@@ -53,6 +106,12 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """준비 상태 (DB가 연결되고 시작 초기화 대기가 끝났을 때만 200, 서비스별 상태와 초기화 시간 포함)"""
+    report = await readiness.check(timeout=settings.READY_CHECK_TIMEOUT)
+    return JSONResponse(report, status_code=200 if report["ready"] else 503)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -9,6 +9,28 @@ ALTER TABLE recipes ADD COLUMN IF NOT EXISTS transaction_hash VARCHAR(66);
 ALTER TABLE recipes ADD COLUMN IF NOT EXISTS is_minted BOOLEAN DEFAULT FALSE;
 ALTER TABLE recipes ADD COLUMN IF NOT EXISTS created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
 ALTER TABLE recipes ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS token_metadata JSON;
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS mint_state VARCHAR(20);
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS mint_claimed_at TIMESTAMP WITH TIME ZONE;
+ALTER TABLE recipes ADD COLUMN IF NOT EXISTS chain_id INTEGER;
+
+-- recipe_media 렌디션(변형 이미지) 컬럼
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS variant VARCHAR(20) NOT NULL DEFAULT 'original';
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS parent_id INTEGER REFERENCES recipe_media(id) ON DELETE CASCADE;
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS width INTEGER;
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS height INTEGER;
+ALTER TABLE recipe_media ADD COLUMN IF NOT EXISTS duration_seconds DOUBLE PRECISION;
+
+-- media_jobs 재시도 대기 시각 (테이블은 init_db.py로 생성)
+ALTER TABLE IF EXISTS media_jobs ADD COLUMN IF NOT EXISTS run_after TIMESTAMP WITH TIME ZONE;
+
+-- mint_attempts 지연 민팅 바우처 서명 (테이블은 init_db.py로 생성)
+ALTER TABLE IF EXISTS mint_attempts ADD COLUMN IF NOT EXISTS voucher_signature VARCHAR(132);
+ALTER TABLE IF EXISTS mint_attempts ADD COLUMN IF NOT EXISTS voucher_deadline BIGINT;
+
+-- mint_attempts 서명 계정 (민팅 서명자 풀, nonce는 계정별)
+ALTER TABLE IF EXISTS mint_attempts ADD COLUMN IF NOT EXISTS signer_address VARCHAR(42);
 
 -- Foreign key 추가 (users 테이블이 있는 경우)
 DO $$
@@ -25,6 +47,18 @@ CREATE INDEX IF NOT EXISTS idx_recipes_token_id ON recipes(token_id);
 CREATE INDEX IF NOT EXISTS idx_recipes_is_minted ON recipes(is_minted);
 CREATE INDEX IF NOT EXISTS idx_recipes_transaction_hash ON recipes(transaction_hash);
 
+-- 토큰 ID는 (체인, 컨트랙트)마다 유일 (컨트랙트 재배포 시 토큰 ID가 겹침)
+-- 기존 민팅 레시피의 체인 ID는 직접 채워야 함 (비어 있으면 조회 시 체인 무관으로 취급)
+-- UPDATE recipes SET chain_id = 11155111 WHERE token_id IS NOT NULL AND chain_id IS NULL;  -- 예: Sepolia
+-- 체인 ID가 비어 있는 행은 NULL끼리 겹쳐도 위 인덱스에 걸리지 않으므로, 기존 token_id 유일 제약을
+-- 지우기 전에 (컨트랙트, 토큰 ID) 부분 유일 인덱스를 먼저 만들어 무결성이 끊기지 않게 함
+CREATE UNIQUE INDEX IF NOT EXISTS uq_recipes_legacy_contract_token ON recipes(lower(contract_address), token_id)
+    WHERE chain_id IS NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_recipes_chain_contract_token ON recipes(chain_id, contract_address, token_id);
+DROP INDEX IF EXISTS ix_recipes_token_id;
+ALTER TABLE recipes DROP CONSTRAINT IF EXISTS recipes_token_id_key;
+CREATE INDEX IF NOT EXISTS ix_recipe_media_parent_id ON recipe_media(parent_id);
+
 -- 기존 데이터가 있다면 user_id를 NULL에서 기본값으로 설정 (필요시)
 -- UPDATE recipes SET user_id = 1 WHERE user_id IS NULL;  -- 주의: 실제 사용자 ID로 변경 필요
 
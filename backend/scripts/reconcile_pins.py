@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+IPFS 핀 정합성 검사 스크립트
+
+DB의 레시피/미디어 IPFS 해시를 검사하여 임시 해시와 고정되지 않은 CID를 다시 고정하고,
+PIN_UNPIN_ORPHANS=true이면 참조되지 않는 핀을 해제합니다. (cron 등으로 주기 실행)
+"""
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from app.logging_config import setup_logging
+setup_logging()
+
+from app.services.pinning import pin_reconciler
+
+def main():
+    try:
+        report = pin_reconciler.reconcile()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if report["recipes"]["repin_failed"] or report["media"]["repin_failed"]:
+        sys.exit(2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+백엔드 테스트 공통 설정
+
+app 모듈을 import하기 전에 임시 SQLite DB와 외부 서비스 없는 설정을 환경 변수로 지정합니다.
+"""
+import os
+import sys
+import tempfile
+
+_db_dir = tempfile.mkdtemp(prefix="recipe-nft-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ["STORAGE_BACKEND"] = "local"
+os.environ["UPLOAD_DIR"] = os.path.join(_db_dir, "uploads")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+"""CIDv0 ↔ bytes32 변환 (cid.py) 검사"""
+import json
+import os
+import pytest
+from app.services.cid import bytes32_to_cid, cid_to_bytes32
+
+# onchain/test/RecipeNFTCompact.js도 같은 목록으로 컨트랙트의 tokenURI를 검사
+FIXTURE = os.path.join(os.path.dirname(__file__), "..", "..", "onchain", "test", "fixtures", "cids.json")
+
+with open(FIXTURE) as f:
+    CASES = json.load(f)
+
+@pytest.mark.parametrize("case", CASES, ids=[case["cid"] for case in CASES])
+def test_matches_compact_contract_fixture(case):
+    digest = bytes.fromhex(case["digest"][2:])
+    assert bytes32_to_cid(digest) == case["cid"]
+    assert cid_to_bytes32(case["cid"]) == digest
+    assert cid_to_bytes32(f"ipfs://{case['cid']}") == digest
+
+def test_rejects_non_cidv0():
+    with pytest.raises(ValueError):
+        cid_to_bytes32("bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi")
+    with pytest.raises(ValueError):
+        bytes32_to_cid(b"\x00" * 31)
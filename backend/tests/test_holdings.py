@@ -0,0 +1,79 @@
+"""보유 토큰 인덱스 (holdings.py) 검사"""
+import pytest
+from web3 import Web3
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.services import mint_attempts
+from app.services.holdings import ZERO_ADDRESS, apply_transfers
+from app.services.transfers import TRANSFER_EVENT_TOPIC
+
+CHAIN_ID = 31337
+CONTRACT = Web3.to_checksum_address("0x5fbdb2315678afecb367f032d93f642f64180aa3")
+WALLET = Web3.to_checksum_address("0x" + "ab" * 20)
+
+def transfer_log(from_address: str, to_address: str, token_id: int, block_number: int, log_index: int = 0) -> dict:
+    return {
+        "address": CONTRACT,
+        "topics": [
+            TRANSFER_EVENT_TOPIC,
+            bytes(12) + bytes.fromhex(from_address[2:]),
+            bytes(12) + bytes.fromhex(to_address[2:]),
+            token_id.to_bytes(32, "big"),
+        ],
+        "blockNumber": block_number,
+        "logIndex": log_index,
+    }
+
+@pytest.fixture
+def db(monkeypatch):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(mint_attempts.web3_service, "chain_id", lambda: CHAIN_ID)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def test_finalize_after_indexer_links_recipe(db):
+    # 인덱서가 민팅 Transfer를 먼저 반영 (레시피가 아직 토큰과 연결되기 전이라 recipe_id 없음)
+    assert apply_transfers(db, CHAIN_ID, CONTRACT, [transfer_log(ZERO_ADDRESS, WALLET, 7, block_number=10)]) == 1
+    db.commit()
+    holding = db.query(models.TokenHolding).one()
+    assert holding.recipe_id is None
+
+    user = models.User(wallet_address=WALLET)
+    recipe = models.Recipe(owner=user, recipe_name="r", ingredients=["a"], cooking_tools=["b"], cooking_steps=["c"])
+    attempt = models.MintAttempt(
+        recipe=recipe, status="confirmed", to_address=WALLET, contract_address=CONTRACT, token_id=7, block_number=10,
+    )
+    db.add(attempt)
+    db.flush()
+
+    mint_attempts.finalize_attempt(attempt)
+    db.commit()
+
+    db.refresh(holding)
+    assert holding.recipe_id == recipe.id
+    assert holding.owner_address == WALLET
+    assert (holding.block_number, holding.log_index) == (10, 0)  # 인덱서가 기록한 위치는 그대로
+
+def test_finalize_keeps_newer_owner_from_indexer(db):
+    other = Web3.to_checksum_address("0x" + "cd" * 20)
+    apply_transfers(db, CHAIN_ID, CONTRACT, [
+        transfer_log(ZERO_ADDRESS, WALLET, 8, block_number=10),
+        transfer_log(WALLET, other, 8, block_number=12),
+    ])
+    db.commit()
+
+    user = models.User(wallet_address=WALLET)
+    recipe = models.Recipe(owner=user, recipe_name="r", ingredients=["a"], cooking_tools=["b"], cooking_steps=["c"])
+    attempt = models.MintAttempt(
+        recipe=recipe, status="confirmed", to_address=WALLET, contract_address=CONTRACT, token_id=8, block_number=10,
+    )
+    db.add(attempt)
+    db.flush()
+    mint_attempts.finalize_attempt(attempt)
+    db.commit()
+
+    holding = db.query(models.TokenHolding).one()
+    assert holding.owner_address == other
+    assert holding.recipe_id == recipe.id
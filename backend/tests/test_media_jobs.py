@@ -0,0 +1,68 @@
+"""미디어 작업 워커 (media_jobs.py) 임대 검사"""
+import time
+import pytest
+from app import models
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.services.media_jobs import MediaJobWorker
+
+@pytest.fixture
+def db():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+@pytest.fixture
+def job(db):
+    user = models.User(wallet_address="0x" + "12" * 20)
+    recipe = models.Recipe(owner=user, recipe_name="r", ingredients=["a"], cooking_tools=["b"], cooking_steps=["c"])
+    media = models.RecipeMedia(recipe=recipe, media_type="video", file_name="v.mp4", file_path="v.mp4")
+    job = models.MediaJob(media=media, kind="video_processing", status="pending", attempts=0)
+    db.add(job)
+    db.commit()
+    return job
+
+def lease_of(job_id: int):
+    session = SessionLocal()
+    try:
+        return session.get(models.MediaJob, job_id).locked_until
+    finally:
+        session.close()
+
+def test_lease_is_renewed_while_handler_runs(db, job, monkeypatch):
+    monkeypatch.setattr(settings, "MEDIA_JOB_LEASE_SECONDS", 3)  # 1초마다 연장
+    leases = []
+
+    def slow_handler(media_id):
+        for _ in range(3):
+            leases.append(lease_of(job.id))
+            time.sleep(1.1)
+
+    worker = MediaJobWorker()
+    worker.handlers["video_processing"] = slow_handler
+    assert worker.run_once()
+
+    assert leases[-1] > leases[0]
+    db.expire_all()
+    assert (job.status, job.locked_until) == ("done", None)
+
+def test_result_is_discarded_after_losing_the_lease(db, job):
+    def reclaimed_handler(media_id):
+        # 임대가 끝나 다른 워커가 같은 작업을 다시 가져감
+        session = SessionLocal()
+        try:
+            row = session.get(models.MediaJob, job.id)
+            row.attempts += 1
+            session.commit()
+        finally:
+            session.close()
+        raise RuntimeError("stale worker failed")
+
+    worker = MediaJobWorker()
+    worker.handlers["video_processing"] = reclaimed_handler
+    assert worker.run_once()
+
+    db.expire_all()
+    assert (job.status, job.attempts, job.error) == ("running", 2, None)
@@ -0,0 +1,46 @@
+"""핀 재고정 작업 (pinning.py) 검사"""
+from datetime import datetime, timedelta, timezone
+import pytest
+from app import models
+from app.config import settings
+from app.database import Base, SessionLocal, engine
+from app.services import pinning
+from app.services.ipfs import ipfs_service
+
+WALLET = "0x" + "ab" * 20
+CONTRACT = "0x" + "cd" * 20
+OLD = datetime.now(timezone.utc) - timedelta(days=3)
+
+def cid(name: str) -> str:
+    return "Qm" + name.ljust(44, "x")
+
+@pytest.fixture
+def db(monkeypatch):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(settings, "PIN_UNPIN_ORPHANS", True)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def test_keeps_metadata_of_unfinished_mint_attempts(db, monkeypatch):
+    pins = {cid(name): OLD for name in ("voucher", "signed", "orphaned", "failed", "stray")}
+    unpinned = []
+    monkeypatch.setattr(ipfs_service, "is_available", lambda: True)
+    monkeypatch.setattr(ipfs_service, "list_pins", lambda: dict(pins))
+    monkeypatch.setattr(ipfs_service, "unpin", lambda value: unpinned.append(value) or True)
+
+    user = models.User(wallet_address=WALLET)
+    for status in ("voucher_issued", "signed", "orphaned", "failed"):
+        recipe = models.Recipe(owner=user, recipe_name=status, ingredients=["a"], cooking_tools=["b"], cooking_steps=["c"])
+        db.add(models.MintAttempt(
+            recipe=recipe, status=status, to_address=WALLET, contract_address=CONTRACT,
+            ipfs_hash=cid(status.split("_")[0]),
+        ))
+    db.commit()
+
+    report = pinning.pin_reconciler.reconcile()
+
+    # 레시피에 반영되기 전인 바우처/진행 중/다른 토큰으로 민팅된 시도의 메타데이터는 남김
+    assert sorted(unpinned) == [cid("failed"), cid("stray")]
+    assert report["pins"]["orphans"] == 2
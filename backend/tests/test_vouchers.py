@@ -0,0 +1,57 @@
+"""지연 민팅 바우처 만료 (mint_attempts.py) 검사"""
+import time
+import pytest
+from app import models
+from app.database import Base, SessionLocal, engine
+from app.services import mint_attempts
+
+WALLET = "0x" + "ab" * 20
+CONTRACT = "0x" + "cd" * 20
+
+@pytest.fixture
+def db(monkeypatch):
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    monkeypatch.setattr(mint_attempts.web3_service, "_w3", object())
+    monkeypatch.setattr(mint_attempts.web3_service, "_connected", True)
+    session = SessionLocal()
+    yield session
+    session.close()
+
+def issue(db, name: str, deadline: int) -> models.MintAttempt:
+    owner = db.query(models.User).first() or models.User(wallet_address=WALLET)
+    recipe = models.Recipe(
+        owner=owner, recipe_name=name, ingredients=["a"], cooking_tools=["b"],
+        cooking_steps=["c"], mint_state="voucher",
+    )
+    attempt = models.MintAttempt(
+        recipe=recipe, status="voucher_issued", to_address=WALLET, contract_address=CONTRACT,
+        voucher_signature="0x" + "11" * 65, voucher_deadline=deadline,
+    )
+    db.add(attempt)
+    db.commit()
+    return attempt
+
+def test_recovery_releases_only_unredeemed_expired_vouchers(db, monkeypatch):
+    grace = mint_attempts.settings.MINT_RECOVERY_GRACE
+    now = int(time.time())
+    unused = issue(db, "unused", now - grace - 10)
+    redeemed = issue(db, "redeemed", now - grace - 10)
+    recent = issue(db, "recent", now - 10)  # 만료 직전에 보낸 redeem이 포함될 시간을 기다림
+    valid = issue(db, "valid", now + 3600)
+    checked = []
+
+    def is_voucher_redeemed(contract_address, recipe_id):
+        checked.append(recipe_id)
+        return recipe_id == redeemed.recipe_id
+
+    monkeypatch.setattr(mint_attempts.web3_service, "is_voucher_redeemed", is_voucher_redeemed)
+
+    report = mint_attempts.mint_recovery.sweep()
+
+    assert report["expired_vouchers"] == 1
+    assert sorted(checked) == sorted([unused.recipe_id, redeemed.recipe_id])
+    db.expire_all()
+    assert (unused.status, unused.recipe.mint_state) == ("expired", None)
+    for attempt in (redeemed, recent, valid):
+        assert (attempt.status, attempt.recipe.mint_state) == ("voucher_issued", "voucher")
@@ -3,20 +3,88 @@ pragma solidity ^0.8.24;
 
 import "@openzeppelin/contracts/token/ERC721/extensions/ERC721URIStorage.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/utils/cryptography/ECDSA.sol";
+import "@openzeppelin/contracts/utils/cryptography/EIP712.sol";
+
+contract RecipeNFT is ERC721URIStorage, Ownable, EIP712 {
+    // 서버가 서명하는 지연 민팅 바우처 (가스는 redeem을 호출하는 쪽이 부담, deadline 이후에는 사용 불가)
+    bytes32 private constant VOUCHER_TYPEHASH =
+        keccak256("RecipeVoucher(uint256 recipeId,string uri,address recipient,uint256 deadline)");
 
-contract RecipeNFT is ERC721URIStorage, Ownable {
     uint256 private _tokenIdCounter;
 
-    constructor() ERC721("RecipeNFT", "RECIPE") Ownable(msg.sender) {}
+    // mintRecipe를 호출할 수 있는 서버 서명자 (소유자는 항상 가능)
+    mapping(address => bool) public minters;
+    // 바우처 서명자 (기본값은 배포자)
+    address public voucherSigner;
+    // 레시피 ID별 바우처 사용 여부 (레시피당 한 번만 민팅)
+    mapping(uint256 => bool) public redeemed;
+
+    event MinterUpdated(address indexed account, bool allowed);
+    event VoucherSignerChanged(address indexed signer);
+    event RecipeRedeemed(uint256 indexed recipeId, uint256 indexed tokenId, address indexed recipient);
+
+    error NotMinter(address account);
+    error InvalidVoucherSignature();
+    error VoucherAlreadyRedeemed(uint256 recipeId);
+    error VoucherExpired(uint256 recipeId, uint256 deadline);
+
+    constructor() ERC721("RecipeNFT", "RECIPE") Ownable(msg.sender) EIP712("RecipeNFT", "1") {
+        voucherSigner = msg.sender;
+    }
+
+    modifier onlyMinter() {
+        if (!minters[msg.sender] && msg.sender != owner()) revert NotMinter(msg.sender);
+        _;
+    }
 
-    function mintRecipe(address to, string memory tokenURI) external onlyOwner returns (uint256) {
+    function mintRecipe(address to, string memory tokenURI) external onlyMinter returns (uint256) {
+        return _mintRecipe(to, tokenURI);
+    }
+
+    // 서명자 풀의 각 계정을 민터로 등록/해제 (계정마다 nonce가 따로라 병렬로 민팅 가능)
+    function setMinter(address account, bool allowed) external onlyOwner {
+        minters[account] = allowed;
+        emit MinterUpdated(account, allowed);
+    }
+
+    function setVoucherSigner(address signer) external onlyOwner {
+        voucherSigner = signer;
+        emit VoucherSignerChanged(signer);
+    }
+
+    // 서버가 서명한 바우처로 민팅 (누구나 호출 가능, 토큰은 항상 recipient에게 발행)
+    // 만료된 바우처는 거절하므로 서버는 deadline 이후 redeemed를 확인하고 레시피 점유를 풀 수 있음
+    function redeem(
+        uint256 recipeId,
+        string calldata uri,
+        address recipient,
+        uint256 deadline,
+        bytes calldata signature
+    ) external returns (uint256) {
+        if (redeemed[recipeId]) revert VoucherAlreadyRedeemed(recipeId);
+        if (block.timestamp > deadline) revert VoucherExpired(recipeId, deadline);
+
+        bytes32 structHash = keccak256(
+            abi.encode(VOUCHER_TYPEHASH, recipeId, keccak256(bytes(uri)), recipient, deadline)
+        );
+        if (ECDSA.recover(_hashTypedDataV4(structHash), signature) != voucherSigner) {
+            revert InvalidVoucherSignature();
+        }
+
+        redeemed[recipeId] = true;
+        uint256 tokenId = _mintRecipe(recipient, uri);
+        emit RecipeRedeemed(recipeId, tokenId, recipient);
+        return tokenId;
+    }
+
+    function _mintRecipe(address to, string memory uri) private returns (uint256) {
         uint256 tokenId = _tokenIdCounter;
         _tokenIdCounter += 1;
 
         _safeMint(to, tokenId);
-        _setTokenURI(tokenId, tokenURI);
+        _setTokenURI(tokenId, uri);
 
         return tokenId;
     }
 }
-
@@ -0,0 +1,106 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.24;
+
+import "@openzeppelin/contracts/token/ERC721/ERC721.sol";
+import "@openzeppelin/contracts/access/Ownable.sol";
+
+// 가스 절약형 RecipeNFT: 토큰 URI 문자열 대신 CIDv0 다이제스트(bytes32)만 저장하고
+// tokenURI는 읽을 때 "ipfs://Qm..."로 다시 만듭니다. 토큰 ID는 0부터 순서대로 발행합니다.
+contract RecipeNFTCompact is ERC721, Ownable {
+    bytes private constant BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz";
+    // CIDv0 멀티해시 접두사 (sha2-256, 32바이트)
+    bytes2 private constant SHA256_MULTIHASH_PREFIX = 0x1220;
+
+    uint256 private _nextTokenId;
+    mapping(uint256 => bytes32) private _cids;
+
+    // mintRecipe를 호출할 수 있는 서버 서명자 (소유자는 항상 가능)
+    mapping(address => bool) public minters;
+
+    event MinterUpdated(address indexed account, bool allowed);
+
+    error NotMinter(address account);
+    error LengthMismatch();
+
+    constructor() ERC721("RecipeNFT", "RECIPE") Ownable(msg.sender) {}
+
+    modifier onlyMinter() {
+        if (!minters[msg.sender] && msg.sender != owner()) revert NotMinter(msg.sender);
+        _;
+    }
+
+    function mintRecipe(address to, bytes32 cid) external onlyMinter returns (uint256 tokenId) {
+        tokenId = _nextTokenId;
+        _mintRecipe(to, tokenId, cid);
+        unchecked {
+            _nextTokenId = tokenId + 1;
+        }
+    }
+
+    // 여러 토큰을 연속된 ID로 한 번에 발행 (첫 토큰 ID 반환)
+    function mintRecipeBatch(address[] calldata to, bytes32[] calldata cids)
+        external
+        onlyMinter
+        returns (uint256 firstTokenId)
+    {
+        if (to.length != cids.length) revert LengthMismatch();
+        firstTokenId = _nextTokenId;
+        uint256 tokenId = firstTokenId;
+        for (uint256 i; i < to.length; ) {
+            _mintRecipe(to[i], tokenId, cids[i]);
+            unchecked {
+                ++tokenId;
+                ++i;
+            }
+        }
+        _nextTokenId = tokenId;
+    }
+
+    function setMinter(address account, bool allowed) external onlyOwner {
+        minters[account] = allowed;
+        emit MinterUpdated(account, allowed);
+    }
+
+    function totalMinted() external view returns (uint256) {
+        return _nextTokenId;
+    }
+
+    function tokenCid(uint256 tokenId) external view returns (bytes32) {
+        _requireOwned(tokenId);
+        return _cids[tokenId];
+    }
+
+    function tokenURI(uint256 tokenId) public view override returns (string memory) {
+        _requireOwned(tokenId);
+        return string.concat("ipfs://", _toBase58(abi.encodePacked(SHA256_MULTIHASH_PREFIX, _cids[tokenId])));
+    }
+
+    // 받는 쪽 onERC721Received 확인을 생략하는 _mint 사용 (서버가 지정한 지갑으로만 발행)
+    function _mintRecipe(address to, uint256 tokenId, bytes32 cid) private {
+        _cids[tokenId] = cid;
+        _mint(to, tokenId);
+    }
+
+    // 34바이트 멀티해시(0x1220 + 다이제스트)의 base58 인코딩 (항상 46자)
+    function _toBase58(bytes memory source) private pure returns (string memory) {
+        uint8[] memory digits = new uint8[](46);
+        uint256 length = 1;
+        for (uint256 i; i < source.length; ++i) {
+            uint256 carry = uint8(source[i]);
+            for (uint256 j; j < length; ++j) {
+                carry += uint256(digits[j]) << 8;
+                digits[j] = uint8(carry % 58);
+                carry /= 58;
+            }
+            while (carry > 0) {
+                digits[length++] = uint8(carry % 58);
+                carry /= 58;
+            }
+        }
+        bytes memory result = new bytes(length);
+        for (uint256 i; i < length; ++i) {
+            result[i] = BASE58_ALPHABET[digits[length - 1 - i]];
+        }
+        return string(result);
+    }
+}
@@ -1,7 +1,7 @@
 require("@nomicfoundation/hardhat-toolbox");
 require("dotenv").config({ path: "../backend/.env" });
 
-const { WEB3_PROVIDER_URL, PRIVATE_KEY } = process.env;
+const { WEB3_PROVIDER_URL, PRIVATE_KEY, REPORT_GAS, GAS_REPORT_FILE } = process.env;
 
 /** @type import('hardhat/config').HardhatUserConfig */
 module.exports = {
@@ -21,6 +21,12 @@ module.exports = {
       accounts: PRIVATE_KEY ? [PRIVATE_KEY] : [],
     },
   },
+  // REPORT_GAS=true면 테스트 중 호출된 메서드별 가스를 컨트랙트별로 출력 (RecipeNFT vs RecipeNFTCompact)
+  gasReporter: {
+    enabled: REPORT_GAS === "true",
+    outputFile: GAS_REPORT_FILE,
+    noColors: Boolean(GAS_REPORT_FILE),
+  },
   paths: {
     sources: "./contracts",
     scripts: "./scripts",
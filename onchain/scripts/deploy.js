@@ -4,11 +4,24 @@ async function main() {
   const [deployer] = await hre.ethers.getSigners();
   console.log("Deploying contracts with account:", deployer.address);
   
-  const RecipeNFT = await hre.ethers.getContractFactory("RecipeNFT");
+  // 백엔드 NFT_CONTRACT_VARIANT와 같은 컨트랙트를 배포 (compact: 가스 절약형)
+  const contractName = process.env.NFT_CONTRACT_VARIANT === "compact" ? "RecipeNFTCompact" : "RecipeNFT";
+  const RecipeNFT = await hre.ethers.getContractFactory(contractName);
   const recipeNft = await RecipeNFT.deploy();
   await recipeNft.waitForDeployment();
 
-  console.log("RecipeNFT deployed to:", await recipeNft.getAddress());
+  console.log(`${contractName} deployed to:`, await recipeNft.getAddress());
+
+  // 백엔드 서명자 풀(MINTER_PRIVATE_KEYS) 계정을 민터로 등록
+  const minterKeys = (process.env.MINTER_PRIVATE_KEYS || "")
+    .split(",")
+    .map((key) => key.trim())
+    .filter(Boolean);
+  for (const key of minterKeys) {
+    const { address } = new hre.ethers.Wallet(key);
+    await (await recipeNft.setMinter(address, true)).wait();
+    console.log("Authorized minter:", address);
+  }
 }
 
 main().catch((error) => {
@@ -0,0 +1,28 @@
+const fs = require("fs");
+const path = require("path");
+const hre = require("hardhat");
+
+// 백엔드가 NFT_CONTRACT_VARIANT별로 읽는 ABI 파일 (backend/app/services/web3.py CONTRACT_ABI_FILES)
+const BACKEND_ABI_DIR = path.join(__dirname, "..", "..", "backend", "app", "contracts");
+const CONTRACTS = ["RecipeNFT", "RecipeNFTCompact"];
+
+// 컴파일 산출물(artifacts)의 ABI를 그대로 백엔드에 복사 (손으로 고치지 않음, test/abi.js가 일치 여부를 검사)
+async function main() {
+  await hre.run("compile");
+  for (const name of CONTRACTS) {
+    const { abi } = await hre.artifacts.readArtifact(name);
+    const file = path.join(BACKEND_ABI_DIR, `${name}.abi.json`);
+    fs.writeFileSync(file, JSON.stringify(abi, null, 2));
+    console.log(`Exported ${name} ABI (${abi.length} entries) to ${path.relative(process.cwd(), file)}`);
+  }
+}
+
+// test/abi.js는 같은 목록으로 일치 여부만 검사 (import 시에는 실행하지 않음)
+if (require.main === module) {
+  main().catch((error) => {
+    console.error(error);
+    process.exitCode = 1;
+  });
+}
+
+module.exports = { BACKEND_ABI_DIR, CONTRACTS };
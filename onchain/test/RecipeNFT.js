@@ -0,0 +1,120 @@
+const { expect } = require("chai");
+const { ethers } = require("hardhat");
+const { time } = require("@nomicfoundation/hardhat-network-helpers");
+
+async function signVoucher(signer, contract, voucher) {
+  const { chainId } = await ethers.provider.getNetwork();
+  const domain = {
+    name: "RecipeNFT",
+    version: "1",
+    chainId,
+    verifyingContract: await contract.getAddress(),
+  };
+  const types = {
+    RecipeVoucher: [
+      { name: "recipeId", type: "uint256" },
+      { name: "uri", type: "string" },
+      { name: "recipient", type: "address" },
+      { name: "deadline", type: "uint256" },
+    ],
+  };
+  return signer.signTypedData(domain, types, voucher);
+}
+
+async function voucherFor(recipeId, recipient, ttl = 3600) {
+  return { recipeId, uri: "ipfs://recipe", recipient, deadline: BigInt((await time.latest()) + ttl) };
+}
+
+function redeem(nft, voucher, signature) {
+  return nft.redeem(voucher.recipeId, voucher.uri, voucher.recipient, voucher.deadline, signature);
+}
+
+describe("RecipeNFT", function () {
+  let owner, alice, relayer, nft;
+
+  beforeEach(async function () {
+    [owner, alice, relayer] = await ethers.getSigners();
+    nft = await ethers.deployContract("RecipeNFT");
+  });
+
+  it("mints with mintRecipe for the owner and authorized minters", async function () {
+    await expect(nft.mintRecipe(alice.address, "ipfs://a"))
+      .to.emit(nft, "Transfer")
+      .withArgs(ethers.ZeroAddress, alice.address, 0n);
+    await expect(nft.connect(relayer).mintRecipe(alice.address, "ipfs://b"))
+      .to.be.revertedWithCustomError(nft, "NotMinter")
+      .withArgs(relayer.address);
+
+    await expect(nft.setMinter(relayer.address, true))
+      .to.emit(nft, "MinterUpdated")
+      .withArgs(relayer.address, true);
+    await expect(nft.connect(relayer).mintRecipe(alice.address, "ipfs://b"))
+      .to.emit(nft, "Transfer")
+      .withArgs(ethers.ZeroAddress, alice.address, 1n);
+
+    await nft.setMinter(relayer.address, false);
+    await expect(nft.connect(relayer).mintRecipe(alice.address, "ipfs://c"))
+      .to.be.revertedWithCustomError(nft, "NotMinter");
+    await expect(nft.connect(alice).setMinter(alice.address, true))
+      .to.be.revertedWithCustomError(nft, "OwnableUnauthorizedAccount");
+  });
+
+  it("redeems a voucher signed by the voucher signer", async function () {
+    const voucher = await voucherFor(42n, alice.address);
+    const signature = await signVoucher(owner, nft, voucher);
+
+    // 가스는 누구나 낼 수 있지만 토큰은 recipient에게 발행
+    await expect(redeem(nft.connect(relayer), voucher, signature))
+      .to.emit(nft, "RecipeRedeemed")
+      .withArgs(42n, 0n, alice.address);
+    expect(await nft.ownerOf(0n)).to.equal(alice.address);
+    expect(await nft.tokenURI(0n)).to.equal("ipfs://recipe");
+    expect(await nft.redeemed(42n)).to.equal(true);
+  });
+
+  it("rejects a second redemption of the same recipe", async function () {
+    const voucher = await voucherFor(1n, alice.address);
+    const signature = await signVoucher(owner, nft, voucher);
+    await redeem(nft, voucher, signature);
+
+    await expect(redeem(nft, voucher, signature))
+      .to.be.revertedWithCustomError(nft, "VoucherAlreadyRedeemed")
+      .withArgs(1n);
+  });
+
+  it("rejects tampered vouchers and other signers", async function () {
+    const voucher = await voucherFor(1n, alice.address);
+    const signature = await signVoucher(owner, nft, voucher);
+
+    await expect(redeem(nft, { ...voucher, recipient: relayer.address }, signature))
+      .to.be.revertedWithCustomError(nft, "InvalidVoucherSignature");
+    // 만료 시각을 늘린 바우처도 서명이 맞지 않음
+    await expect(redeem(nft, { ...voucher, deadline: voucher.deadline + 3600n }, signature))
+      .to.be.revertedWithCustomError(nft, "InvalidVoucherSignature");
+
+    const forged = await signVoucher(alice, nft, voucher);
+    await expect(redeem(nft, voucher, forged))
+      .to.be.revertedWithCustomError(nft, "InvalidVoucherSignature");
+
+    await nft.setVoucherSigner(alice.address);
+    await expect(redeem(nft, voucher, forged))
+      .to.emit(nft, "RecipeRedeemed");
+  });
+
+  it("rejects expired vouchers and leaves the recipe unredeemed", async function () {
+    const voucher = await voucherFor(7n, alice.address, 60);
+    const signature = await signVoucher(owner, nft, voucher);
+
+    await time.increaseTo(voucher.deadline + 1n);
+    await expect(redeem(nft, voucher, signature))
+      .to.be.revertedWithCustomError(nft, "VoucherExpired")
+      .withArgs(7n, voucher.deadline);
+    // 서버는 redeemed가 false인 것을 확인하고 레시피 점유를 해제한 뒤 새 바우처를 발급
+    expect(await nft.redeemed(7n)).to.equal(false);
+
+    const renewed = await voucherFor(7n, alice.address);
+    await expect(redeem(nft, renewed, await signVoucher(owner, nft, renewed)))
+      .to.emit(nft, "RecipeRedeemed")
+      .withArgs(7n, 0n, alice.address);
+  });
+});
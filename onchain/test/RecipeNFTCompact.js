@@ -0,0 +1,95 @@
+const { expect } = require("chai");
+const { ethers } = require("hardhat");
+// backend/tests/test_cid.py가 같은 목록으로 cid.py(bytes32_to_cid)를 검사
+const CID_FIXTURE = require("./fixtures/cids.json");
+
+const CIDS = [
+  "QmYwAPJzv5CZsnA625s3Xf2nemtYgPpHdWEz79ojWnPbdG",
+  "QmT78zSuBmuS4z925WZfrqQ1qHaJ56DQaTfyMUF7F8ff5o",
+  "QmUNLLsPACCz1vLxQVkXqqLX5R1X345qqfHbsf67hvA3Nn",
+];
+
+// CIDv0("Qm...")의 sha2-256 다이제스트 (멀티해시 접두사 0x1220 제외)
+function cidDigest(cid) {
+  return "0x" + ethers.toBeHex(ethers.decodeBase58(cid), 34).slice(6);
+}
+
+async function gasUsed(txPromise) {
+  const receipt = await (await txPromise).wait();
+  return receipt.gasUsed;
+}
+
+describe("RecipeNFTCompact", function () {
+  let owner, alice, bob, relayer, nft;
+
+  beforeEach(async function () {
+    [owner, alice, bob, relayer] = await ethers.getSigners();
+    nft = await ethers.deployContract("RecipeNFTCompact");
+  });
+
+  it("rebuilds the ipfs:// token URI from the stored digest", async function () {
+    for (const [i, cid] of CIDS.entries()) {
+      await expect(nft.mintRecipe(alice.address, cidDigest(cid)))
+        .to.emit(nft, "Transfer")
+        .withArgs(ethers.ZeroAddress, alice.address, BigInt(i));
+      expect(await nft.tokenURI(i)).to.equal(`ipfs://${cid}`);
+      expect(await nft.tokenCid(i)).to.equal(cidDigest(cid));
+    }
+    await expect(nft.tokenURI(CIDS.length))
+      .to.be.revertedWithCustomError(nft, "ERC721NonexistentToken");
+  });
+
+  it("matches the backend bytes32_to_cid for the shared CID fixture", async function () {
+    // 앞자리 0 바이트, 전부 0/0xff인 다이제스트 포함 (_toBase58이 항상 46자 CIDv0를 만드는지)
+    await nft.mintRecipeBatch(CID_FIXTURE.map(() => alice.address), CID_FIXTURE.map(({ digest }) => digest));
+    for (const [i, { cid, digest }] of CID_FIXTURE.entries()) {
+      expect(cidDigest(cid)).to.equal(digest);
+      expect(await nft.tokenCid(i)).to.equal(digest);
+      expect(await nft.tokenURI(i)).to.equal(`ipfs://${cid}`);
+    }
+  });
+
+  it("mints a batch with sequential token IDs", async function () {
+    const recipients = [alice.address, bob.address, alice.address];
+    await nft.mintRecipe(bob.address, cidDigest(CIDS[0]));
+
+    await expect(nft.mintRecipeBatch(recipients, CIDS.map(cidDigest)))
+      .to.emit(nft, "Transfer")
+      .withArgs(ethers.ZeroAddress, bob.address, 2n);
+    expect(await nft.totalMinted()).to.equal(4n);
+    expect(await nft.ownerOf(3n)).to.equal(alice.address);
+    expect(await nft.tokenURI(3n)).to.equal(`ipfs://${CIDS[2]}`);
+    expect(await nft.balanceOf(alice.address)).to.equal(2n);
+
+    await expect(nft.mintRecipeBatch(recipients, []))
+      .to.be.revertedWithCustomError(nft, "LengthMismatch");
+  });
+
+  it("only lets the owner and authorized minters mint", async function () {
+    await expect(nft.connect(relayer).mintRecipe(alice.address, cidDigest(CIDS[0])))
+      .to.be.revertedWithCustomError(nft, "NotMinter")
+      .withArgs(relayer.address);
+    await expect(nft.setMinter(relayer.address, true))
+      .to.emit(nft, "MinterUpdated")
+      .withArgs(relayer.address, true);
+    await nft.connect(relayer).mintRecipeBatch([alice.address], [cidDigest(CIDS[0])]);
+    await expect(nft.connect(alice).setMinter(alice.address, true))
+      .to.be.revertedWithCustomError(nft, "OwnableUnauthorizedAccount");
+  });
+
+  // REPORT_GAS=true npm test 로 실행하면 hardhat-gas-reporter가 두 컨트랙트의 메서드별 가스를 비교 표로 출력
+  it("uses less gas per mint than RecipeNFT", async function () {
+    const standard = await ethers.deployContract("RecipeNFT");
+    const uri = `ipfs://${CIDS[0]}`;
+
+    // 첫 민팅은 잔액/카운터 슬롯을 새로 쓰므로 두 번째 민팅끼리 비교
+    await standard.mintRecipe(alice.address, uri);
+    await nft.mintRecipe(alice.address, cidDigest(CIDS[0]));
+    const standardGas = await gasUsed(standard.mintRecipe(alice.address, uri));
+    const compactGas = await gasUsed(nft.mintRecipe(alice.address, cidDigest(CIDS[0])));
+    expect(compactGas).to.be.lessThan(standardGas);
+
+    const batchGas = await gasUsed(nft.mintRecipeBatch(Array(10).fill(alice.address), Array(10).fill(cidDigest(CIDS[1]))));
+    expect(batchGas / 10n).to.be.lessThan(compactGas);
+  });
+});
@@ -0,0 +1,16 @@
+const fs = require("fs");
+const path = require("path");
+const { expect } = require("chai");
+const { artifacts } = require("hardhat");
+const { BACKEND_ABI_DIR, CONTRACTS } = require("../scripts/export-abi");
+
+// 백엔드 ABI가 컴파일 산출물과 다르면 npm run export-abi로 다시 내보내야 함
+describe("Backend ABI", function () {
+  for (const name of CONTRACTS) {
+    it(`matches the compiled ${name} artifact`, async function () {
+      const { abi } = await artifacts.readArtifact(name);
+      const exported = JSON.parse(fs.readFileSync(path.join(BACKEND_ABI_DIR, `${name}.abi.json`), "utf8"));
+      expect(exported).to.deep.equal(abi);
+    });
+  }
+});